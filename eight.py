@@ -1,894 +1,5076 @@
-import random
-import math
-import argparse
-import time
-import sys
-import gc
-
-
-# Class that abstracts the notion of the board
-class Board:
-   def __init__(self):
-      self.tiles = [[], [], []]
-      self.emptyTile = -1                 # Position of the empty tile
-      self.possibleMoves = 0              # All possible moves, given the 
-                                          #  position of the empty tile
-      self.parent = None                  # The parent board from which this
-                                          #  board was derived through a single
-                                          #  move.
-      self.depth = 0                      # Depth of this board from the root
-      self.signature = ""                 # Signature for the board, unique to
-                                          #  a particular configuration of 
-                                          #  tiles.
-      self.move = -1                      # The move through which this board 
-                                          #  is related to it's parent.
-   # Returns true if the boards are equal (with the same comfiguration)   
-   def __eq__(self, other):
-      for k in range(9):                  # Board size = 3
-         i = k / 3
-         j = k % 3
-         if self.tiles[i][j] != other.tiles[i][j]:
-           return False
-      return True
-   
-   # Returns a hash value for the board (unique to configirations)
-   def __hash__(self):
-      return hash(self.signature)
-   
-   # Returns a printable format of the board
-   def __str__(self):
-      string = ""
-      for k in range(9):                  # Board size = 3
-         i = k / 3
-         j = k % 3
-         string += str(self.tiles[i][j]) + " "
-         if (k + 1) % 3 == 0:
-            string += "\n"
-      return string
-   
-   # Compute the signature of the board, unique to its configuration
-   def computeSignature(self):
-      self.signature = ""
-      for row in self.tiles:
-         for tile in row:
-            self.signature += `tile`
-   
-   # Return the signature of the board
-   def getSignature(self):
-      return self.signature
-   
-   # Move a the emtpy tile in the direction indicated by moveCode
-   # moveCode = 1 --> Move the empty tile UP
-   # moveCode = 2 --> Move the empty tile RIGHT
-   # moveCode = 4 --> Move the empty tile DOWN
-   # moveCode = 8 --> Move the empty tile LEFT
-   def moveTile(self, moveCode):
-      
-      i = self.emptyTile / 3 # Board size = 3
-      j = self.emptyTile % 3 # Board size = 3
-      #print str(i) + " " + str(j) + " " + str(moveCode) + " " + str(self.possibleMoves)
-      if moveCode == 1:                # Move the empty tile UP
-         self.tiles[i][j] = self.tiles[i-1][j]
-         self.tiles[i-1][j] = 0
-         self.emptyTile -= 3           # Board size = 3
-         self.possibleMoves |= 4
-         if i - 1 == 0:                # If the empty tile is now at the 
-                                       #  topmost row
-            self.possibleMoves &= (~1)
-      
-      elif moveCode == 2:              # Move the empty tile RIGHT
-         self.tiles[i][j] = self.tiles[i][j+1]
-         self.tiles[i][j+1] = 0
-         self.emptyTile += 1
-         self.possibleMoves |= 8
-         if j + 1 == 3 - 1:            # Board size = 3   
-                                       # If the empty tile is now at the 
-                                       #  rightmost column
-            self.possibleMoves &= (~2)
-      
-      elif moveCode == 4:              # Move the empty tile DOWN
-         self.tiles[i][j] = self.tiles[i+1][j]
-         self.tiles[i+1][j] = 0
-         self.emptyTile += 3           # Board size = 3
-         self.possibleMoves |= 1
-         if i + 1 == 3 - 1:            # Board size = 3; i + 2 == 3
-                                       # If the empty tile is now at the 
-                                       #  bottommost row
-            self.possibleMoves &= (~4)
-      
-      elif moveCode == 8:              # Move the empty tile LEFT
-         self.tiles[i][j] = self.tiles[i][j-1]
-         self.tiles[i][j-1] = 0
-         self.emptyTile -= 1
-         self.possibleMoves |= 2
-         if j - 1 == 0:                # Board size = 3; i + 2 == 3
-                                       # If the empty tile is now at the 
-                                       #  leftmost column
-            self.possibleMoves &= (~8)
-   
-   # Scramble the board configuration for 'count' times, by making random movements
-   # Used for generating random starting board configuration
-   def scrambleBoard(self, count):
-      while count:
-         numMoves = 4
-         if self.possibleMoves != 8|4|2|1:
-            numMoves -= 1
-            if     self.possibleMoves != 8|4|2 and self.possibleMoves != 8|4|1 and self.possibleMoves != 8|2|1 and self.possibleMoves != 4|2|1:
-               numMoves -= 1
-         rand = random.randint(1, numMoves)
-         move = 1
-         while rand:
-            if self.possibleMoves & move:
-               rand -= 1
-            move <<= 1
-         move >>= 1
-         self.moveTile(move)
-         count -= 1
-
-   # Generate a board with a default configuration and then scramble it
-   # by making 'scrambleCount' random moves
-   # The default configuration would be:
-   # 0 1 2
-   # 3 4 5
-   # 6 7 8
-   def generateBoard(self, scrambleCount):
-      for k in range(9):                  # Board size = 3
-         i = k / 3
-         j = k % 3
-         self.tiles[i].append(3*i + j)
-      self.emptyTile = 0
-      self.possibleMoves = 2|4            # Can move right or down from the
-                                          #  top-left corner of the board
-      if scrambleCount:
-         self.scrambleBoard(scrambleCount)
-
-   # Construct a board from the 'model' configuration
-   def constructBoard(self, model):
-      for k in range(9):                  # Board size = 3
-         i = k / 3
-         j = k % 3
-         self.tiles[i].append(model[k])
-         #print "<" + str(self.tiles[i][j]) + ", " + str(model[i][j]) + ">"
-         if model[k] == 0:
-            self.emptyTile = k            # Board size = 3
-            self.possibleMoves = 0
-            if i != 0:
-               self.possibleMoves |= 1
-            if j != 2:                    # Board size = 3;
-               self.possibleMoves |= 2
-            if i != 2:                    # Board size = 3
-               self.possibleMoves |= 4
-            if j != 0:
-               self.possibleMoves |= 8
-
-   # Make a copy of this board, with depth set to 0
-   def copyBoard(self):
-      copy = Board()
-      for k in range(9):                  # Board size = 3
-         i = k / 3
-         j = k % 3
-         copy.tiles[i].append(self.tiles[i][j])
-      copy.emptyTile = self.emptyTile
-      copy.possibleMoves = self.possibleMoves
-      copy.parent = None
-      copy.depth = self.depth
-      copy.signature = self.signature
-      copy.move = -1
-      #print
-      #print self.tiles
-      #print copy.tiles
-      return copy
-
-   # Create a child of this board by making a valid move
-   # moveCode should be a valid move in self.possibleMoves
-   def spawnChild(self, moveCode):
-      child = self.copyBoard()
-      child.moveTile(moveCode)
-      child.parent = self
-      child.depth += 1
-      child.move = moveCode
-      return child
-
-   # Print the path of derivation from the root board to this board
-   def printPath(self, verbose):
-      pathLength = 0
-      stack = []
-      moves = {1: "UP", 2: "RIGHT", 4: "DOWN", 8: "LEFT"}
-      
-      while self: # TODO: Check for error
-         stack.append(self)
-         stack.append(moves.get(self.move, ""))
-         self = self.parent
-         pathLength += 1
-      
-      print "=============================="
-      print "Path is given below:"
-      while stack:
-         self = stack.pop()
-         if verbose:
-            print self
-         else:
-            if self and type(self) is str:
-               print self,
-      print "\n------------------------------"
-      return pathLength - 1 # TODO: Check if correct
-
-# Class that abstracts the notion of the 8Puzzle
-class EightPuzzle:
-   def __init__(self, root, goal, verbose, timer):
-      self.root = root              # Root board
-      self.goal = goal              # Goal board
-      self.timeTaken = 0.0          # Time taken for the search
-      self.numTestDone = 0          # Number of tests against the goal board 
-                                    #  done.
-      self.maxQueueLength = 0       # Max. queue length
-      self.numDuplicatesFound = 0   # Number of duplicates detected and 
-                                    #  eliminated
-      self.maxDepthSearched = 0     # Max depth searched
-      self.pathLength = 0           # Length of the path from root to goal 
-                                    #  board
-      self.goalFounded = False      # Whether the search for the goal was 
-                                    #  successful or not
-      self.goalDepth = -1           # Depth at which the goal was found
-      self.reverseIndex = {}        # Dictionary (Reverse index) of where each
-                                    #  number in the goal state is located.
-      self.verbose = verbose        # Whether to print the output verbosely
-      self.hardDepthLimit = 50      # Hard depth limit for algorithms that 
-                                    #  has a tendency to search at large depths
-                                    #  unless stopped.
-      self.algorithm = ""           # Algorithm used
-      self.heuristic = None         # Heuristic used
-      self.timer = timer
-      for k in range(9):
-         i = k / 3
-         j = k % 3
-         self.reverseIndex[self.goal.tiles[i][j]] = k
-
-   # Print the stats for the search run
-   def printStats(self):
-      print "Algorithm               = "  + str(self.algorithm)
-      if self.heuristic == True:
-         print "Heuristic               = No. of states out of place"
-      elif self.heuristic == False:
-         print "Heuristic               = Manhatten distance"
-      else:
-         print "Heuristic               = None"
-      print "Time taken              = "  + str(self.timeTaken)
-      print "No. of tests done       = "  + str(self.numTestDone)
-      print "Max. queue length       = "  + str(self.maxQueueLength)
-      print "No. of duplicates found = "  + str(self.numDuplicatesFound)
-      print "Max. depth searched     = "  + str(self.maxDepthSearched)
-      #print "Path length             = "  + str(self.pathLength)
-      print "Goal found              = "  + str(self.goalFounded)
-      print "Goal depth/Path length  = "  + str(self.goalDepth)
-      if self.algorithm == "ida*":
-         print "Max. recursion depth    = "  + str(self.maxRecursionDepth)
-      print "=============================="
-
-   # Breadth First Search
-   def bfs(self):
-      self.algorithm = "bfs"
-      queue = [self.root]
-      self.numTestDone = 0
-      self.maxQueueLength = 0
-      self.numDuplicatesFound = 0
-      self.maxDepthSearched = 0
-      self.pathLength = 0
-      
-      # Keeps track of the boards that have been visited
-      visitedBoards = set()
-      
-      # While there are candidate boards in the queue
-      while queue:
-         if self.timer.getTime() > 300.0:
-            print "Time expired"
-            return False
-         
-         # Keep track of the max queue length
-         if len(queue) > self.maxQueueLength:
-            self.maxQueueLength = len(queue)
-            
-         # Retrieve the next candidate, mark it was visited, increment count 
-         #  of tests
-         candidate = queue.pop(0)
-         self.numTestDone += 1
-         visitedBoards.add(candidate)
-         if self.maxDepthSearched < candidate.depth:
-            self.maxDepthSearched = candidate.depth
-         
-         # Test if this is the goal
-         if candidate == self.goal:
-            #print "Goal found at a depth of " + str(candidate.depth)
-            self.goalFounded = True
-            self.pathLength = candidate.printPath(self.verbose)
-            self.goalDepth = candidate.depth
-            return True
-         
-         # Detect duplicates among children, increment count, add only 
-         #  non-duplicates to queue
-         moves = candidate.possibleMoves
-         mask = 1
-         while mask != 16:
-            if moves & mask:
-               child = candidate.spawnChild(mask)
-               if child in visitedBoards:
-                  self.numDuplicatesFound += 1
-               else:
-                  queue.append(child)
-            mask <<= 1;
-      return False
-
-   # Depth First Search
-   def dfs(self):
-      self.algorithm = "dfs"
-      stack = [self.root]
-      self.numTestDone = 0
-      self.maxQueueLength = 0
-      self.numDuplicatesFound = 0
-      self.maxDepthSearched = 0
-      self.pathLength = 0
-      
-      # Keeps track of the boards that have been visited
-      visitedBoards = set()
-      
-      # While there are candidate boards in the stack
-      while stack:
-         if self.timer.getTime() > 300.0:
-            print "Time expired"
-            return False
-         
-         # Keep track of the max stack length
-         if len(stack) > self.maxQueueLength:
-            self.maxQueueLength = len(stack)
-         
-         # Retrieve the next candidate, mark it was visited, increment count 
-         #  of tests
-         candidate = stack.pop()
-         self.numTestDone += 1
-         visitedBoards.add(candidate)
-         if self.maxDepthSearched < candidate.depth:
-            self.maxDepthSearched = candidate.depth
-         
-         # Test if this is the goal
-         if candidate == self.goal:
-            #print "Goal found at a depth of " + str(candidate.depth)
-            self.pathLength = candidate.printPath(self.verbose)
-            self.goalFounded = True
-            self.goalDepth = candidate.depth
-            return True
-         
-         # Detect duplicates among children, increment count, add only 
-         #  non-duplicates to queue
-         moves = candidate.possibleMoves
-         mask = 1
-         while mask != 16:
-            if moves & mask:
-               child = candidate.spawnChild(mask)
-               if child in visitedBoards:
-                  self.numDuplicatesFound += 1
-               else:
-                  if child.depth <= self.hardDepthLimit:
-                     stack.append(child)
-            mask <<= 1;
-      return False
-
-   def dls(self, depthLimit):
-      self.algorithm = "dls"
-      stack = [self.root]
-      self.numTestDone = 0
-      self.maxQueueLength = 0
-      self.numDuplicatesFound = 0
-      self.maxDepthSearched = 0
-      self.pathLength = 0
-      
-      # Keeps track of the boards that have been visited
-      visitedBoards = set()
-      
-      # While there are candidate boards in the stack
-      while stack:
-         if self.timer.getTime() > 300.0:
-            print "Time expired"
-            return False
-         
-         # Keep track of the max stack length
-         if len(stack) > self.maxQueueLength:
-            self.maxQueueLength = len(stack)
-         
-         # Retrieve the next candidate, mark it was visited, increment count 
-         #  of tests
-         candidate = stack.pop()
-         #print candidate, str(candidate.depth)
-         self.numTestDone += 1
-         visitedBoards.add(candidate)
-         if self.maxDepthSearched < candidate.depth:
-            self.maxDepthSearched = candidate.depth
-         
-         # Test if this is the goal
-         if candidate == self.goal:
-            #print "Goal found at a depth of " + str(candidate.depth)
-            self.pathLength = candidate.printPath(self.verbose)
-            self.goalFounded = True
-            self.goalDepth = candidate.depth
-            return True
-         
-         # Detect duplicates among children, increment count, add only 
-         #  non-duplicates to queue
-         moves = candidate.possibleMoves
-         mask = 1
-         while mask != 16:
-            if moves & mask:
-               child = candidate.spawnChild(mask)
-               if child in visitedBoards:
-                  self.numDuplicatesFound += 1
-               else:
-                  if child.depth <= depthLimit:
-                     stack.append(child)
-            mask <<= 1;
-      return False
-
-   def ids(self):
-      # TODO: Check if the stats you are keeping are correct
-      self.algorithm = "ids"
-      self.numTestDone = 0
-      self.maxQueueLength = 0
-      self.numDuplicatesFound = 0
-      self.maxDepthSearched = 0
-      self.pathLength = 0
-      
-      # Keeps track of the boards that have been visited
-      visitedBoards = set()
-      
-      depthLimit = 0
-      while depthLimit < self.hardDepthLimit:
-         depthLimit += 1
-         stack = [self.root]
-         # While there are candidate boards in the stack
-         while stack:
-            if self.timer.getTime() > 300.0:
-               print "Time expired"
-               return False
-            
-            # Keep track of the max stack length
-            if len(stack) > self.maxQueueLength:
-               self.maxQueueLength = len(stack)
-            
-            # Retrieve the next candidate, mark it was visited, increment count 
-            #  of tests
-            candidate = stack.pop()
-            self.numTestDone += 1
-            visitedBoards.add(candidate)
-            if self.maxDepthSearched < candidate.depth:
-               self.maxDepthSearched = candidate.depth
-            
-            # Test if this is the goal
-            if candidate == self.goal:
-               #print "Goal found at a depth of " + str(candidate.depth)
-               self.pathLength = candidate.printPath(self.verbose)
-               self.goalFounded = True
-               self.goalDepth = candidate.depth
-               return True
-            
-            # Detect duplicates among children, increment count, add only 
-            #  non-duplicates to queue
-            moves = candidate.possibleMoves
-            mask = 1
-            while mask != 16:
-               if moves & mask:
-                  child = candidate.spawnChild(mask)
-                  if child in visitedBoards:
-                     self.numDuplicatesFound += 1
-                  else:
-                     if child.depth <= depthLimit:
-                        stack.append(child)
-               mask <<= 1;
-      return False   
-
-   def h1(self, candidateBoard):
-      difference = 0
-      for k in range(9):
-         i = k / 3
-         j = k % 3
-         if self.goal.tiles[i][j] != candidateBoard.tiles[i][j]:
-            difference += 1
-      return difference
-   
-   def h2(self, candidateBoard):
-      manhattenDistance = 0
-      for k in range(9):
-         i = k / 3
-         j = k % 3
-         goalPosition = self.reverseIndex[candidateBoard.tiles[i][j]]
-         l = goalPosition / 3
-         m = goalPosition % 3
-         manhattenDistance += math.fabs(i-l) + math.fabs(j-m)
-      return manhattenDistance
-   
-   def estimatedCostH1(self, candidateBoard):
-      return candidateBoard.depth + self.h1(candidateBoard)
-
-   def estimatedCostH2(self, candidateBoard):
-      return candidateBoard.depth + self.h2(candidateBoard)
-
-   def greedy(self, heuristicFunctionFlag):
-      self.algorithm = "greedy"
-      self.heuristic = heuristicFunctionFlag
-      queue = [self.root]
-      self.numTestDone = 0
-      self.maxQueueLength = 0
-      self.numDuplicatesFound = 0
-      self.maxDepthSearched = 0
-      self.pathLength = 0
-      
-      # Keeps track of the boards that have been visited
-      visitedBoards = set()
-      
-      while queue:
-         if self.timer.getTime() > 300.0:
-            print "Time expired"
-            return False
-         
-         # Keep track of the max queue length
-         if len(queue) > self.maxQueueLength:
-            self.maxQueueLength = len(queue)
-         
-         # Retrieve the next candidate, mark it was visited, increment count 
-         #  of tests
-         if heuristicFunctionFlag:
-            queue = sorted(queue, key = self.h1)
-         else:
-            queue = sorted(queue, key = self.h2)
-         candidate = queue.pop(0)
-         self.numTestDone += 1
-         visitedBoards.add(candidate)
-         if self.maxDepthSearched < candidate.depth:
-            self.maxDepthSearched = candidate.depth
-         
-         # Test if this is the goal
-         if candidate == self.goal:
-            #print "Goal found at a depth of " + str(candidate.depth)
-            self.pathLength = candidate.printPath(self.verbose)
-            self.goalFounded = True
-            self.goalDepth = candidate.depth
-            return True
-         
-         # Detect duplicates among children, increment count, add only 
-         #  non-duplicates to queue
-         moves = candidate.possibleMoves
-         mask = 1
-         while mask != 16:
-            if moves & mask:
-               child = candidate.spawnChild(mask)
-               if child in visitedBoards:
-                  self.numDuplicatesFound += 1
-               else:
-                  if child.depth <= self.hardDepthLimit:
-                     queue.append(child)
-            mask <<= 1;
-      return False
-
-   def astar(self, heuristicFunctionFlag):
-      self.algorithm = "a*"
-      self.heuristic = heuristicFunctionFlag
-      queue = [self.root]
-      self.numTestDone = 0
-      self.maxQueueLength = 0
-      self.numDuplicatesFound = 0
-      self.maxDepthSearched = 0
-      self.pathLength = 0
-      
-      # Keeps track of the boards that have been visited
-      visitedBoards = set()
-      
-      while queue:
-         if self.timer.getTime() > 300.0:
-            print "Time expired"
-            return False
-         
-         # Keep track of the max queue length
-         if len(queue) > self.maxQueueLength:
-            self.maxQueueLength = len(queue)
-         
-         # Retrieve the next candidate, mark it was visited, increment count 
-         #  of tests
-         if heuristicFunctionFlag:
-            queue = sorted(queue, key = self.estimatedCostH1)
-         else:
-            queue = sorted(queue, key = self.estimatedCostH2)
-         candidate = queue.pop(0)
-         self.numTestDone += 1
-         visitedBoards.add(candidate)
-         if self.maxDepthSearched < candidate.depth:
-            self.maxDepthSearched = candidate.depth
-         
-         # Test if this is the goal
-         if candidate == self.goal:
-            #print "Goal found at a depth of " + str(candidate.depth)
-            self.pathLength = candidate.printPath(self.verbose)
-            self.goalFounded = True
-            self.goalDepth = candidate.depth
-            return True
-         
-         # Detect duplicates among children, increment count, add only 
-         #  non-duplicates to queue
-         moves = candidate.possibleMoves
-         mask = 1
-         while mask != 16:
-            if moves & mask:
-               child = candidate.spawnChild(mask)
-               if child in visitedBoards:
-                  self.numDuplicatesFound += 1
-               else:
-                  if child.depth <= self.hardDepthLimit:
-                     queue.append(child)
-            mask <<= 1;
-      return False
-
-   def DFSContour3(self, candidateBoard, fLimit, heuristicFunctionFlag, recursionDepth):
-      recursionDepth += 1
-      self.numTestDone += 1
-      self.visitedBoards.add(candidateBoard)
-      if self.maxDepthSearched < candidateBoard.depth:
-         self.maxDepthSearched = candidateBoard.depth
-      if self.maxRecursionDepth < recursionDepth:
-         self.maxRecursionDepth = recursionDepth
-      
-      if self.timer.getTime() > 10.0:
-         #print "Time expired"
-         return 2000000.0
-
-      fCost = self.estimatedCostH1(candidateBoard)
-      
-      if fCost > fLimit:
-         self.solution = None
-         return fCost
-      
-      if candidateBoard == self.goal:
-         self.solution = candidateBoard
-         return fCost
-      
-      # Detect duplicates among children, increment count, add only 
-      #  non-duplicates to queue
-      minimum = 2000000.0
-      moves = candidateBoard.possibleMoves
-      mask = 1
-      while mask != 16:
-         if moves & mask:
-            child = candidateBoard.spawnChild(mask)
-            if child in self.visitedBoards:
-               self.numDuplicatesFound += 1
-            else:
-               newF = self.DFSContour3(child, fLimit, heuristicFunctionFlag, recursionDepth)     # Append to the queue iff it is
-               if self.solution:
-                  return fLimit
-               if newF < minimum:
-                  minimum = newF
-         mask <<= 1;
-      return minimum
-      
-   def idastar3(self, heuristicFunctionFlag):
-      self.algorithm = "ida*"
-      self.heuristic = heuristicFunctionFlag
-      self.numTestDone = 0
-      self.maxQueueLength = 0
-      self.numDuplicatesFound = 0
-      self.maxDepthSearched = 0
-      self.pathLength = 0
-      self.maxRecursionDepth = 0
-      self.solution = None
-      
-      # Keeps track of the boards that have been visited
-      self.visitedBoards = set()
-      
-      if heuristicFunctionFlag:
-         fLimit = self.estimatedCostH1(self.root)
-      else:
-         fLimit = self.estimatedCostH2(self.root)
-      
-      while True:
-         fLimit = self.DFSContour3(self.root, fLimit, heuristicFunctionFlag, 0)
-         if self.solution:
-            self.pathLength   = self.solution.printPath(self.verbose)
-            self.goalFounded  = True
-            self.goalDepth    = self.solution.depth
-            return True
-         if fLimit > 1999999.0:
-            return False
-
-# Class to time each search operation
-class Timer:
-   """Class to time function calls - Counts the CPU time used"""
-   # Start the timer
-   def __init__(self, string, limit = 100, numBars = 100):
-      self.string = string
-      self.beginning = time.clock()
-      self.time  = 0.0
-      self.numBars = numBars
-      self.oneBar = 0
-      self.numBarsWritten = 0
-      self.limit = limit
-      self.progress = 0
-      if self.numBars:
-         #print self.string
-         self.oneBar = int(math.ceil(limit/numBars))
-         sys.stdout.write("[%s]" % (" " * numBars))
-         sys.stdout.flush()
-         sys.stdout.write("\b" * (numBars + 1))
-   
-   def start(self, string, limit = 100, numBars = 100):
-      self.__init__(string, limit, numBars)
-      
-   def getTime(self):
-      if self.beginning:
-         return time.clock() - self.beginning + self.time
-      else:
-         return self.time
-
-   def stop(self):
-      """"Print the CPU secs used"""
-      #if self.progress <= self.limit:
-      #   sys.stdout.write('\x1b[2K')
-      #   sys.stdout.write("\b" * (self.numBarsWritten + 2))
-      #   self.progress = self.limit
-      if self.beginning:
-         timetaken = time.clock() - self.beginning + self.time
-      else:
-         timetaken = self.time
-      #print "\033[92mTime taken for (%s) = %f\033[0m" % (self.string, time)
-      self.string = None
-      self.beginning = None
-      self.time = None
-      self.limit = 0
-      self.progress = 0
-      self.numBars = 0
-      self.oneBar = 0
-      return timetaken
-      
-   def tick(self):
-      if self.beginning and self.progress < self.limit:
-         self.progress += 1
-         if self.oneBar and self.progress % self.oneBar == 0:
-            if self.numBarsWritten < self.numBars:
-               if (self.numBarsWritten + 1) % 10 == 0:
-                  sys.stdout.write("|")
-               else:
-                  sys.stdout.write("-")
-               sys.stdout.flush()
-               self.numBarsWritten += 1
-            else:
-               self.progress = self.limit
-               self.numBarsWritten = self.numBars
-         #if self.progress == self.limit:
-         #   sys.stdout.write('\x1b[2K')
-         #   sys.stdout.write("\b" * (self.numBars + 2))
-   
-   def pause(self):
-      if self.beginning:
-         self.time += time.clock() - self.beginning
-         self.beginning = None
-   def unpause(self):
-      if not self.beginning:
-         self.beginning = time.clock()
-
-class Main:
-   def parseCommandLine(self):
-      parser = argparse.ArgumentParser(prog = "python tile.py", description='8-Puzzle Program', formatter_class=argparse.ArgumentDefaultsHelpFormatter)
-      parser.add_argument('--version', action='version', version='8-Puzzle 1.0')
-      parser.add_argument('-a', metavar='<algorithm>', type = str, nargs = 1, required = True,
-                         choices = ["bfs", "dfs", "dls", "ids", "greedy", "a*", "ida*", "all"], default = "all",
-                         help = 'Search algorithm to be used, could be one of "bfs", "dfs", "dls", "ids", "greedy", "a*" or "ida*"')
-      parser.add_argument('-r', metavar='<tile>', type = str, nargs = '+', required = True, 
-                         help = 'Root board to be used. Do not use commas or quotes Eg. "0 1 2 3 4 5 6 7 8 9"')
-      parser.add_argument('-g', metavar='<tile>', type = str, nargs = '+', required = False, 
-                         default=['1', '2', '3', '8', '0', '4', '7', '6', '5'], 
-                         help = 'Goal board to be used. Do not use commas or quotes Eg. "0 1 2 3 4 5 6 7 8 9"')
-      parser.add_argument('-d', metavar='<depth limit>', type = int, nargs = 1, required = False, 
-                         default=25, 
-                         help='Depth upto which to be searched. Required for dls, ida*. If not provided, default value of 25 would be used')
-      parser.add_argument('-f', metavar='<heuristic function>', type = str, nargs = 1, required = False,
-                         choices = ["h1", "h2"],
-                         help='Heuristic function to be used. Should be within quotes. Eg. "h1" or "h2"')
-      parser.add_argument('-v', action='store_true', help='Prints verbose output')
-
-      args = parser.parse_args(sys.argv[1:])
-      self.algorithm = args.a[0]
-      
-      self.rootModel = []
-      for string in args.r:
-         self.rootModel.append(int(string))
-      
-      if args.g:
-         self.goalModel = []
-         for string in args.g:
-            self.goalModel.append(int(string))         
-      else:
-         self.goalModel = None
-      
-      if self.algorithm == "dls":
-         if args.d:
-            self.depthLimit = args.d[0]
-         else:
-            print "Depth limit is required if algorithm is dls"
-            return False
-      else:
-         self.depthLimit = None
-      if self.algorithm == "greedy" or self.algorithm == "a*" or self.algorithm == "ida*":
-         if args.f:
-            if args.f[0] == "h1":
-               self.heuristicFunctionFlag = True
-            else:
-               self.heuristicFunctionFlag = False
-         else:
-            print "Heuristic function required if using one of the informed search algorithms (greedy, a*, ida*)"
-            return False
-      else:
-         self.heuristicFunctionFlag = None
-      if args.v:
-         self.verbose = True
-      else:
-         self.verbose = False
-      return True
-
-   def doSearch(self):
-      root = Board()
-      root.constructBoard(self.rootModel)
-      goal = Board()
-      goal.constructBoard(self.goalModel)
-      
-      if self.verbose:
-         print "Root"
-         print root
-         print "Goal"
-         print goal
-         print "------------------------------"
-      timerSearch = Timer("Search algorithm", 0, 0)
-      puzzle = EightPuzzle(root, goal, self.verbose, timerSearch)
-      
-      if self.algorithm == "bfs":
-         puzzle.bfs()
-      elif self.algorithm == "dfs":
-         puzzle.dfs()
-      elif self.algorithm == "dls":
-         puzzle.dls(self.depthLimit)
-      elif self.algorithm == "ids":
-         puzzle.ids()
-      elif self.algorithm == "greedy":
-         puzzle.greedy(self.heuristicFunctionFlag)
-      elif self.algorithm == "a*":
-         puzzle.astar(self.heuristicFunctionFlag)
-      elif self.algorithm == "ida*":
-         puzzle.idastar3(self.heuristicFunctionFlag)
-      puzzle.timeTaken = timerSearch.stop()
-      puzzle.printStats()
-      
-   def main(self):
-      gc.enable()
-      if not self.parseCommandLine():
-         return
-      
-      if not self.goalModel:
-         self.goalModel = [1, 2, 3, 8, 0, 4, 7, 6, 5]
-      if self.algorithm != "all":
-         self.doSearch()
-      else:
-         rootModels = [[1, 3, 4, 8, 6, 2, 7, 0, 5], [2, 8, 1, 0, 4, 3, 7, 6, 5], [5, 6, 7, 4, 0, 8, 3, 2, 1]]
-         #rootModels = [[1, 3, 4, 8, 6, 2, 7, 0, 5], [2, 8, 1, 0, 4, 3, 7, 6, 5]]
-         #rootModels = [[5, 6, 7, 4, 0, 8, 3, 2, 1]]
-         algorithms = ["bfs", "dfs", "dls", "ids", "greedy", "a*", "ida*"]
-         heuristicFunctionFlags = [True, False]
-         self.goalModel = [1, 2, 3, 8, 0, 4, 7, 6, 5]
-         self.depthLimit = 25
-         self.verbose = False
-         for rootModel in rootModels:
-            self.rootModel = rootModel
-            print "Goal: " + str(rootModel)
-            for algorithm in algorithms:
-               self.algorithm = algorithm
-               if self.algorithm == "greedy" or self.algorithm == "a*" or self.algorithm == "ida*":
-                  for heuristic in heuristicFunctionFlags:
-                     self.heuristicFunctionFlag = heuristic
-                     self.doSearch()
-               else:
-                  self.doSearch()
-          
-run = Main()
-run.main()
+import random
+import math
+import argparse
+import time
+import sys
+import gc
+import collections
+import heapq
+import mmap
+import os
+import json
+import itertools
+import multiprocessing
+import timeit
+import cProfile
+import pstats
+import shelve
+import Queue
+import struct
+try:
+   import resource
+except ImportError:
+   resource = None
+try:
+   import numpy
+except ImportError:
+   numpy = None
+
+
+# Move codes for the empty tile
+# 1 --> UP, 2 --> RIGHT, 4 --> DOWN, 8 --> LEFT
+MOVE_CODES = (1, 2, 4, 8)
+# Names of the moves
+MOVE_NAMES = {1: "UP", 2: "RIGHT", 4: "DOWN", 8: "LEFT"}
+# Move that undoes each move
+OPPOSITE_MOVE = {1: 4, 2: 8, 4: 1, 8: 2}
+# Default time limit for a search, in CPU secs
+DEFAULT_TIME_LIMIT = 300.0
+# Default no. of tests between two samples of the clocks, see Budget
+DEFAULT_CHECK_INTERVAL = 1024
+# Fewest boards Heuristic.evaluateStates looks up with NumPy: below that, 
+#  building the arrays costs more than evaluating the boards one at a time
+MIN_NUMPY_BATCH = 64
+if resource is not None:
+   PAGE_SIZE = resource.getpagesize()
+else:
+   PAGE_SIZE = 4096
+
+# Tables for a board of a given size, shared by all the boards of that size
+# Use BoardGeometry.get(size) rather than building new ones.
+# Every cell takes 'bits' bits of the packed state: 4 bits hold the tiles of 
+#  boards of up to 4x4, 5 bits are needed for the 5x5 board. For every 
+#  position p of the empty tile:
+#  possibleMoves[p]       - Bit mask of the moves allowed from p
+#  moveTable[p][moveCode] - (q, shift, weightDelta, possibleMoves[q]) where q
+#                           is the position the empty tile lands on, 'shift'
+#                           the bit offset of q, and weightDelta the change in
+#                           the packed state per unit of the tile value that
+#                           slides from q into p. The move codes are used 
+#                           directly as indices, hence the lists of length 9.
+#  manhattanDistance[k][l]
+#                         - Manhattan distance between positions k and l
+#  symmetries             - The 8 symmetries of the square, as pairs 
+#                           (cellMap, moveMap): cell p goes to cellMap[p], and
+#                           a move of the empty tile to moveMap[moveCode]
+class BoardGeometry(object):
+   geometries = {}
+
+   def __init__(self, size):
+      self.size = size
+      self.numCells = size * size
+      if self.numCells <= 16:
+         self.bits = 4
+      else:
+         self.bits = 5
+      self.mask = (1 << self.bits) - 1
+      self.possibleMoves = []
+      self.moveTable = []
+      for p in range(self.numCells):
+         i = p / size
+         j = p % size
+         moves = 0
+         if i != 0:
+            moves |= 1
+         if j != size - 1:
+            moves |= 2
+         if i != size - 1:
+            moves |= 4
+         if j != 0:
+            moves |= 8
+         self.possibleMoves.append(moves)
+         self.moveTable.append([None] * 9)
+      for p in range(self.numCells):
+         for moveCode in MOVE_CODES:
+            q = self.neighbour(p, moveCode)
+            if q >= 0:
+               self.moveTable[p][moveCode] = (q, q * self.bits, 
+                  (1 << (p * self.bits)) - (1 << (q * self.bits)), 
+                  self.possibleMoves[q])
+      self.manhattanDistance = [[abs(k / size - l / size) + 
+                                 abs(k % size - l % size) 
+                                 for l in range(self.numCells)] 
+                                for k in range(self.numCells)]
+      directions = {1: (-1, 0), 2: (0, 1), 4: (1, 0), 8: (0, -1)}
+      moveCodes = dict((direction, moveCode) 
+                       for moveCode, direction in directions.items())
+      self.symmetries = []
+      for transpose in [False, True]:
+         for flipRows in [False, True]:
+            for flipColumns in [False, True]:
+               cellMap = []
+               for p in range(self.numCells):
+                  i = p / size
+                  j = p % size
+                  if transpose:
+                     i, j = j, i
+                  if flipRows:
+                     i = size - 1 - i
+                  if flipColumns:
+                     j = size - 1 - j
+                  cellMap.append(i * size + j)
+               moveMap = [0] * 9
+               for moveCode, (di, dj) in directions.items():
+                  if transpose:
+                     di, dj = dj, di
+                  if flipRows:
+                     di = -di
+                  if flipColumns:
+                     dj = -dj
+                  moveMap[moveCode] = moveCodes[(di, dj)]
+               self.symmetries.append((cellMap, moveMap))
+      # Hard depth limit for algorithms that has a tendency to search at 
+      #  large depths unless stopped.
+      if size == 3:
+         self.hardDepthLimit = 50
+      else:
+         self.hardDepthLimit = 10 * self.numCells
+   
+   # Return the tables for boards of the given size
+   @staticmethod
+   def get(size):
+      if size not in BoardGeometry.geometries:
+         BoardGeometry.geometries[size] = BoardGeometry(size)
+      return BoardGeometry.geometries[size]
+   
+   # Return the tables for boards with numCells cells
+   @staticmethod
+   def forCells(numCells):
+      size = int(round(math.sqrt(numCells)))
+      if size * size != numCells or size < 2 or numCells > 32:
+         raise ValueError("A board must have 4, 9, 16 or 25 tiles, not " + 
+                          str(numCells))
+      return BoardGeometry.get(size)
+   
+   # Position the empty tile lands on when moving from p, -1 if not allowed
+   def neighbour(self, p, moveCode):
+      if not self.possibleMoves[p] & moveCode:
+         return -1
+      if moveCode == 1:
+         return p - self.size
+      elif moveCode == 2:
+         return p + 1
+      elif moveCode == 4:
+         return p + self.size
+      return p - 1
+   
+   # Default goal board, the one used for the 8-puzzle and tiles in order 
+   #  with the empty tile last for the larger boards
+   def defaultGoalModel(self):
+      if self.size == 3:
+         return [1, 2, 3, 8, 0, 4, 7, 6, 5]
+      return range(1, self.numCells) + [0]
+
+BOARD_3 = BoardGeometry.get(3)
+
+# Class that abstracts the notion of the board
+# The whole configuration is packed into a single integer, 'bits' bits per 
+#  cell (see BoardGeometry). The tile at position k (row k / size, column 
+#  k % size) occupies the bits from k * bits.
+class Board(object):
+   # keys - The keys of the heuristic carried with h (see Heuristic.update),
+   #  only set by the searches that use them
+   __slots__ = ("state", "emptyTile", "possibleMoves", "parent", "depth",
+                "move", "h", "keys", "geometry")
+
+   def __init__(self, state = 0, emptyTile = -1, possibleMoves = 0,
+                parent = None, depth = 0, move = -1, h = 0, geometry = None):
+      self.state = state                  # Packed configuration of the tiles
+      self.emptyTile = emptyTile          # Position of the empty tile
+      self.possibleMoves = possibleMoves  # All possible moves, given the 
+                                          #  position of the empty tile
+      self.parent = parent                # The parent board from which this
+                                          #  board was derived through a single
+                                          #  move.
+      self.depth = depth                  # Depth of this board from the root
+      self.move = move                    # The move through which this board 
+                                          #  is related to it's parent.
+      self.h = h                          # Heuristic estimate carried from 
+                                          #  the parent, see Heuristic
+      self.geometry = geometry or BOARD_3 # Tables for the size of the board
+
+   # Returns true if the boards are equal (with the same comfiguration)   
+   def __eq__(self, other):
+      return self.state == other.state
+   
+   def __ne__(self, other):
+      return self.state != other.state
+   
+   # Returns a hash value for the board (unique to configirations)
+   def __hash__(self):
+      return self.state
+   
+   # Returns a printable format of the board
+   def __str__(self):
+      string = ""
+      width = len(str(self.geometry.numCells - 1))
+      for k, tile in enumerate(self.getModel()):
+         string += str(tile).rjust(width) + " "
+         if (k + 1) % self.geometry.size == 0:
+            string += "\n"
+      return string
+   
+   # Return the signature of the board, unique to its configuration
+   def getSignature(self):
+      return self.state
+   
+   # Return the tile at position k
+   def getTile(self, k):
+      geometry = self.geometry
+      return (self.state >> (k * geometry.bits)) & geometry.mask
+   
+   # Return the configuration of the board as a flat list of tiles
+   def getModel(self):
+      model = []
+      state = self.state
+      bits = self.geometry.bits
+      mask = self.geometry.mask
+      for k in range(self.geometry.numCells):
+         model.append(state & mask)
+         state >>= bits
+      return model
+   
+   # Parity of the board, the same for all the boards reachable from it
+   # It is the parity of the number of inversions among the tiles, in 
+   #  reading order, plus for boards of even size the row of the empty tile.
+   def parity(self):
+      tiles = [tile for tile in self.getModel() if tile]
+      inversions = 0
+      for i in range(len(tiles)):
+         for j in range(i + 1, len(tiles)):
+            if tiles[i] > tiles[j]:
+               inversions += 1
+      if self.geometry.size % 2 == 0:
+         inversions += self.emptyTile / self.geometry.size
+      return inversions % 2
+   
+   # Move a the emtpy tile in the direction indicated by moveCode
+   # moveCode = 1 --> Move the empty tile UP
+   # moveCode = 2 --> Move the empty tile RIGHT
+   # moveCode = 4 --> Move the empty tile DOWN
+   # moveCode = 8 --> Move the empty tile LEFT
+   def moveTile(self, moveCode):
+      q, shift, weightDelta, possibleMoves = \
+         self.geometry.moveTable[self.emptyTile][moveCode]
+      # The tile at q slides into the empty cell
+      self.state += ((self.state >> shift) & self.geometry.mask) * weightDelta
+      self.emptyTile = q
+      self.possibleMoves = possibleMoves
+   
+   # Scramble the board configuration for 'count' times, by making random movements
+   # Used for generating random starting board configuration
+   def scrambleBoard(self, count):
+      while count:
+         moves = [moveCode for moveCode in MOVE_CODES 
+                  if self.possibleMoves & moveCode]
+         self.moveTile(random.choice(moves))
+         count -= 1
+
+   # Generate a board with a default configuration and then scramble it
+   # by making 'scrambleCount' random moves
+   # The default configuration would be (for a board of size 3):
+   # 0 1 2
+   # 3 4 5
+   # 6 7 8
+   def generateBoard(self, scrambleCount):
+      self.constructBoard(range(self.geometry.numCells))
+      if scrambleCount:
+         self.scrambleBoard(scrambleCount)
+
+   # Construct a board from the 'model' configuration
+   # The size of the board is given by the number of tiles in the model
+   def constructBoard(self, model):
+      self.geometry = BoardGeometry.forCells(len(model))
+      bits = self.geometry.bits
+      self.state = 0
+      for k in range(len(model)):
+         self.state |= model[k] << (k * bits)
+         if model[k] == 0:
+            self.emptyTile = k
+            self.possibleMoves = self.geometry.possibleMoves[k]
+
+   # Make a copy of this board, with depth set to 0
+   def copyBoard(self):
+      return Board(self.state, self.emptyTile, self.possibleMoves, None, 
+                   self.depth, -1, self.h, self.geometry)
+
+   # Create a child of this board by making a valid move
+   # moveCode should be a valid move in self.possibleMoves
+   # If hDelta (see Heuristic) is given, the child's h is derived from this
+   #  board's h, as only the tile that slides changes its position.
+   def spawnChild(self, moveCode, hDelta = None):
+      geometry = self.geometry
+      q, shift, weightDelta, possibleMoves = \
+         geometry.moveTable[self.emptyTile][moveCode]
+      state = self.state
+      tile = (state >> shift) & geometry.mask
+      state += tile * weightDelta
+      if hDelta:
+         return Board(state, q, possibleMoves, self, self.depth + 1, moveCode,
+                      self.h + hDelta[tile][q][self.emptyTile], geometry)
+      return Board(state, q, possibleMoves, self, self.depth + 1, moveCode, 0,
+                   geometry)
+
+   # Print the path of derivation from the root board to this board
+   def printPath(self, verbose):
+      pathLength = 0
+      stack = []
+      
+      while self: # TODO: Check for error
+         stack.append(self)
+         stack.append(MOVE_NAMES.get(self.move, ""))
+         self = self.parent
+         pathLength += 1
+      
+      print "=============================="
+      print "Path is given below:"
+      while stack:
+         self = stack.pop()
+         if verbose:
+            print self
+         else:
+            if self and type(self) is str:
+               print self,
+      print "\n------------------------------"
+      return pathLength - 1 # TODO: Check if correct
+
+   # Return the names of the moves from the root board to this board
+   def getMoves(self):
+      return [MOVE_NAMES[moveCode] for moveCode in self.getMoveCodes()]
+   
+   # Codes of the moves of the empty tile from the root to this board
+   def getMoveCodes(self):
+      moveCodes = []
+      board = self
+      while board.parent:
+         moveCodes.append(board.move)
+         board = board.parent
+      moveCodes.reverse()
+      return moveCodes
+
+# Base class for the heuristic functions
+# A heuristic is built for a particular goal board. Besides evaluating a board
+#  from scratch, it provides the table delta[tile][fromPosition][toPosition],
+#  the change in the estimate when 'tile' slides from one position to the 
+#  other, so that Board.spawnChild can carry the estimate in O(1).
+# The empty tile is not counted, which keeps the estimates admissible.
+class Heuristic(object):
+   name = ""
+   description = ""
+   # update(h, keys, state, childState, fromPosition, toPosition) - 
+   #  (estimate, keys) of the packed state childState, derived from the 
+   #  estimate h and the keys of its parent's, the tile at fromPosition 
+   #  having moved to toPosition, for the heuristics without a delta table
+   #  that can do better than evaluating it from scratch. None for the 
+   #  others. The keys are whatever else the heuristic carries from a board
+   #  to its children, as given by keys(state) for the root.
+   update = None
+
+   def __init__(self, goal):
+      self.geometry = goal.geometry
+      numCells = self.geometry.numCells
+      self.goalPosition = [0] * numCells     # Position of each tile in goal
+      for k in range(numCells):
+         self.goalPosition[goal.getTile(k)] = k
+      # costs[tile][k] - Cost of 'tile' being at position k
+      self.costs = [[self.cost(tile, k) for k in range(numCells)] 
+                    for tile in range(numCells)]
+      self.costs[0] = [0] * numCells
+      self.delta = [[[costs[l] - costs[k] for l in range(numCells)] 
+                     for k in range(numCells)] for costs in self.costs]
+   
+   # Cost of 'tile' being at position k
+   def cost(self, tile, k):
+      raise NotImplementedError
+   
+   # Estimates for many boards at once, given as a sequence of packed 
+   #  states. With NumPy, and at least MIN_NUMPY_BATCH boards, the costs of
+   #  each cell are looked up for all the boards together, and an array is 
+   #  returned.
+   def evaluateStates(self, states):
+      geometry = self.geometry
+      if numpy is None or geometry.numCells * geometry.bits > 64 or \
+         len(states) < MIN_NUMPY_BATCH:
+         return self.evaluateEach(states)
+      if not hasattr(self, "cellCosts"):
+         # cellCosts[k][tile] - Cost of 'tile' being at position k
+         self.cellCosts = numpy.array(self.costs, dtype = numpy.int32).T
+      states = numpy.asarray(states, dtype = numpy.uint64)
+      mask = numpy.uint64(geometry.mask)
+      estimates = numpy.zeros(len(states), dtype = numpy.int32)
+      for k in range(geometry.numCells):
+         tiles = (states >> numpy.uint64(k * geometry.bits)) & mask
+         estimates += self.cellCosts[k][tiles.astype(numpy.intp)]
+      return estimates
+   
+   # What the heuristic carries besides the estimate of the packed state, 
+   #  see update
+   def keys(self, state):
+      return None
+
+   # Estimates for many boards, given as packed states, one at a time
+   def evaluateEach(self, states):
+      board = Board(0, 0, 0, None, 0, -1, 0, self.geometry)
+      estimates = []
+      for state in states:
+         board.state = state
+         estimates.append(self.evaluate(board))
+      return estimates
+   
+   # Evaluate the estimate for the board from scratch
+   def evaluate(self, board):
+      estimate = 0
+      state = board.state
+      bits = self.geometry.bits
+      mask = self.geometry.mask
+      costs = self.costs
+      for k in range(self.geometry.numCells):
+         estimate += costs[state & mask][k]
+         state >>= bits
+      return estimate
+
+# No. of tiles out of place
+class MisplacedTiles(Heuristic):
+   name = "h1"
+   description = "No. of states out of place"
+
+   def cost(self, tile, k):
+      if self.goalPosition[tile] != k:
+         return 1
+      return 0
+
+# Sum of the Manhatten distances of the tiles from their goal positions
+class ManhattanDistance(Heuristic):
+   name = "h2"
+   description = "Manhatten distance"
+
+   def cost(self, tile, k):
+      return self.geometry.manhattanDistance[k][self.goalPosition[tile]]
+
+# Manhattan distance plus two moves for every tile that has to leave its 
+#  row or column to let another tile of the same goal line go past 
+#  (Hansson, Mayer and Yung). The no. of tiles to take out of a line is the 
+#  no. of its tiles whose goal is in that line, less the longest run of 
+#  them already in goal order; it is precomputed for every sequence of goal 
+#  positions. After a move only the two lines the tile left and entered 
+#  are counted again (see update).
+class LinearConflict(ManhattanDistance):
+   name = "lc"
+   description = "Manhatten distance with linear conflicts"
+
+   def __init__(self, goal):
+      ManhattanDistance.__init__(self, goal)
+      self.manhattanDelta = self.delta
+      self.delta = None
+      size = self.geometry.size
+      bits = self.geometry.bits
+      # Cells of each line, the rows then the columns
+      lines = [[i * size + j for j in range(size)] for i in range(size)] + \
+              [[i * size + j for i in range(size)] for j in range(size)]
+      self.lineShifts = [[cell * bits for cell in line] for line in lines]
+      # goalIndex[line][tile] - Position of the tile along the line if the 
+      #  line holds it in the goal, -1 otherwise
+      self.goalIndex = []
+      for line in lines:
+         goalIndex = [-1] * self.geometry.numCells
+         for i in range(size):
+            goalIndex[goal.getTile(line[i])] = i
+         goalIndex[0] = -1
+         self.goalIndex.append(goalIndex)
+      self.conflicts = {}
+      for length in range(size + 1):
+         for sequence in itertools.permutations(range(size), length):
+            self.conflicts[sequence] = \
+               length - LinearConflict.longestIncreasing(sequence)
+   
+   # Length of the longest increasing subsequence
+   @staticmethod
+   def longestIncreasing(sequence):
+      lengths = []
+      for i in range(len(sequence)):
+         lengths.append(1 + max([lengths[j] for j in range(i) 
+                                 if sequence[j] < sequence[i]] + [0]))
+      return max(lengths + [0])
+   
+   # No. of tiles to take out of the line for the packed state
+   def lineConflicts(self, state, line):
+      mask = self.geometry.mask
+      goalIndex = self.goalIndex[line]
+      sequence = []
+      for shift in self.lineShifts[line]:
+         i = goalIndex[(state >> shift) & mask]
+         if i >= 0:
+            sequence.append(i)
+      return self.conflicts[tuple(sequence)]
+   
+   def evaluate(self, board):
+      estimate = ManhattanDistance.evaluate(self, board)
+      for line in range(len(self.lineShifts)):
+         estimate += 2 * self.lineConflicts(board.state, line)
+      return estimate
+   
+   def evaluateStates(self, states):
+      return self.evaluateEach(states)
+   
+   # See Heuristic.update. A vertical move leaves the order of the tiles
+   #  of the rows unchanged, and a horizontal one of the columns.
+   def update(self, h, keys, state, childState, fromPosition, toPosition):
+      tile = (state >> (fromPosition * self.geometry.bits)) & \
+             self.geometry.mask
+      h += self.manhattanDelta[tile][fromPosition][toPosition]
+      size = self.geometry.size
+      if fromPosition / size == toPosition / size:
+         lines = [size + fromPosition % size, size + toPosition % size]
+      else:
+         lines = [fromPosition / size, toPosition / size]
+      for line in lines:
+         h += 2 * (self.lineConflicts(childState, line) - 
+                   self.lineConflicts(state, line))
+      return h, None
+
+# Walking distance (Takahashi): the no. of moves needed to bring every tile
+#  to its goal row, if the tiles of a row could be swapped at will with the
+#  empty tile of the next row, plus the same for the columns. The rows are 
+#  abstracted as a table of how many tiles of each goal row they hold, and 
+#  the distance of every such table, keyed by packing its counts and the
+#  row of the empty tile into an integer, is precomputed by a breadth first 
+#  search from the goal's. The columns are the rows of the transposed 
+#  board. Boards of up to 4x4 only, the tables of the 5x5 board being too 
+#  large to build.
+class WalkingDistance(Heuristic):
+   name = "wd"
+   description = "Walking distance"
+   # Tables by board size and goal row of the empty tile
+   tables = {}
+
+   def __init__(self, goal):
+      geometry = goal.geometry
+      if geometry.numCells > 16:
+         raise ValueError("The walking distance is only available for boards"
+                          " of up to 4x4")
+      self.geometry = geometry
+      self.delta = None
+      size = geometry.size
+      blankShift = 3 * size * size
+      goalCell = [0] * geometry.numCells
+      for k in range(geometry.numCells):
+         goalCell[goal.getTile(k)] = k
+      # weights[tile][k] - Part of the key of the tile being at position k,
+      #  for the rows then for the columns
+      self.weights = []
+      self.distances = []
+      for line, blankLine in [(lambda k: k / size, goal.emptyTile / size),
+                              (lambda k: k % size, goal.emptyTile % size)]:
+         weights = [[line(k) << blankShift 
+                     for k in range(geometry.numCells)]]
+         for tile in range(1, geometry.numCells):
+            weights.append([1 << 3 * (line(k) * size + line(goalCell[tile]))
+                            for k in range(geometry.numCells)])
+         self.weights.append(weights)
+         if (size, blankLine) not in WalkingDistance.tables:
+            WalkingDistance.tables[(size, blankLine)] = \
+               WalkingDistance.buildTable(size, blankLine)
+         self.distances.append(WalkingDistance.tables[(size, blankLine)])
+   
+   # Distance of every table of counts reachable from the goal's, by key
+   @staticmethod
+   def buildTable(size, blankLine):
+      blankShift = 3 * size * size
+      goalKey = blankLine << blankShift
+      for i in range(size):
+         goalKey += (size - (i == blankLine)) << 3 * (i * size + i)
+      distances = {goalKey: 0}
+      layer = [goalKey]
+      distance = 0
+      while layer:
+         distance += 1
+         nextLayer = []
+         for key in layer:
+            blank = key >> blankShift
+            for i in [blank - 1, blank + 1]:
+               if i < 0 or i >= size:
+                  continue
+               # A tile of goal row j moves from row i to the empty tile's
+               for j in range(size):
+                  shift = 3 * (i * size + j)
+                  if (key >> shift) & 7:
+                     child = key - (1 << shift) + \
+                             (1 << 3 * (blank * size + j)) + \
+                             ((i - blank) << blankShift)
+                     if child not in distances:
+                        distances[child] = distance
+                        nextLayer.append(child)
+         layer = nextLayer
+      return distances
+   
+   # Keys of the packed state for the rows and the columns
+   def keys(self, state):
+      bits = self.geometry.bits
+      mask = self.geometry.mask
+      rowWeights, columnWeights = self.weights
+      rowKey = 0
+      columnKey = 0
+      for k in range(self.geometry.numCells):
+         tile = state & mask
+         rowKey += rowWeights[tile][k]
+         columnKey += columnWeights[tile][k]
+         state >>= bits
+      return rowKey, columnKey
+   
+   def evaluate(self, board):
+      rowKey, columnKey = self.keys(board.state)
+      return self.distances[0][rowKey] + self.distances[1][columnKey]
+   
+   def evaluateStates(self, states):
+      return self.evaluateEach(states)
+   
+   # See Heuristic.update. The keys of the rows and the columns are carried
+   #  from the parent: only the key of the rows changes with a vertical 
+   #  move, and of the columns with a horizontal one, by the weights of the
+   #  tile and the empty tile swapping places.
+   def update(self, h, keys, state, childState, fromPosition, toPosition):
+      tile = (state >> (fromPosition * self.geometry.bits)) & \
+             self.geometry.mask
+      rowKey, columnKey = keys
+      if fromPosition / self.geometry.size == toPosition / self.geometry.size:
+         weights = self.weights[1]
+         distances = self.distances[1]
+         childKey = columnKey + weights[tile][toPosition] - \
+                    weights[tile][fromPosition] + weights[0][fromPosition] - \
+                    weights[0][toPosition]
+         return h - distances[columnKey] + distances[childKey], \
+                (rowKey, childKey)
+      weights = self.weights[0]
+      distances = self.distances[0]
+      childKey = rowKey + weights[tile][toPosition] - \
+                 weights[tile][fromPosition] + weights[0][fromPosition] - \
+                 weights[0][toPosition]
+      return h - distances[rowKey] + distances[childKey], (childKey, columnKey)
+
+# Max. of several admissible heuristics, itself admissible, named 
+#  "max:<name>,<name>..." (see heuristicComponents)
+# When every component has a delta table or update, the estimate and the 
+#  keys of each component are carried from board to board as the keys of 
+#  the max. (see update), rather than evaluated from scratch.
+class MaxHeuristic(Heuristic):
+   def __init__(self, goal, components):
+      self.geometry = goal.geometry
+      self.delta = None
+      self.components = components
+      self.name = "max:" + ",".join([component.name 
+                                     for component in components])
+      self.description = "Max. of " + ", ".join(
+         [component.description for component in components])
+      if not all([component.delta or component.update 
+                  for component in components]):
+         self.update = None
+   
+   def evaluate(self, board):
+      return max([component.evaluate(board) 
+                  for component in self.components])
+   
+   def evaluateStates(self, states):
+      if len(states) < MIN_NUMPY_BATCH:
+         return self.evaluateEach(states)
+      return [max(estimates) for estimates in 
+              zip(*[component.evaluateStates(states) 
+                    for component in self.components])]
+   
+   # (estimate, keys) of each component for the packed state, None if not 
+   #  carried (see update)
+   def keys(self, state):
+      if self.update is None:
+         return None
+      board = Board(state, 0, 0, None, 0, -1, 0, self.geometry)
+      return tuple([(component.evaluate(board), component.keys(state)) 
+                    for component in self.components])
+   
+   # See Heuristic.update. Each component is updated by its delta table or
+   #  its own update, and the max. taken.
+   def update(self, h, keys, state, childState, fromPosition, toPosition):
+      tile = (state >> (fromPosition * self.geometry.bits)) & \
+             self.geometry.mask
+      childKeys = []
+      for component, (componentH, componentKeys) in \
+          zip(self.components, keys):
+         if component.delta:
+            childKeys.append(
+               (componentH + component.delta[tile][fromPosition][toPosition],
+                None))
+         else:
+            childKeys.append(component.update(componentH, componentKeys, 
+                                              state, childState, 
+                                              fromPosition, toPosition))
+      return max([componentH for componentH, componentKeys in childKeys]), \
+             tuple(childKeys)
+
+# Perfect ranking of the positions of k distinct tiles among numCells cells,
+#  into 0 .. numCells! / (numCells - k)! - 1
+def rankPattern(positions, numCells):
+   rank = 0
+   used = 0
+   for i in range(len(positions)):
+      p = positions[i]
+      smaller = bin(used & ((1 << p) - 1)).count("1")
+      rank = rank * (numCells - i) + p - smaller
+      used |= 1 << p
+   return rank
+
+# Inverse of rankPattern
+def unrankPattern(rank, k, numCells):
+   digits = [0] * k
+   for i in range(k - 1, -1, -1):
+      digits[i] = rank % (numCells - i)
+      rank /= numCells - i
+   positions = []
+   free = range(numCells)
+   for digit in digits:
+      positions.append(free.pop(digit))
+   return positions
+
+# Additive pattern database heuristic
+# The tiles are split into disjoint groups. For each group, the table holds 
+#  the number of moves of the group's own tiles needed to bring them to their
+#  goal positions, indexed by rankPattern of their positions and by the 
+#  position of the empty tile. Moves of other tiles are free, so the values 
+#  of the groups can be added up. Keeping the empty tile in the index makes 
+#  the sum consistent: a move changes the entry of the moved tile's group by
+#  at most 1 and leaves the entries of the other groups unchanged.
+# The tables are built by a retrograde breadth first search from the goal 
+#  and saved to a file, which is memory mapped when loaded, so that several
+#  solver processes share a single copy.
+# File layout: "EPDB", board size, the goal tiles, the number of groups, then 
+#  for each group its size and tiles, followed by the tables, one byte per 
+#  entry.
+class PatternDatabase(Heuristic):
+   name = "pdb"
+   description = "Additive pattern database"
+   magic = "EPDB"
+
+   def __init__(self, goal, fileName = None, groups = None):
+      self.geometry = goal.geometry
+      self.goalModel = goal.getModel()
+      if not fileName:
+         fileName = PatternDatabase.defaultFileName(self.goalModel)
+      self.fileName = fileName
+      self.delta = None                   # Not incremental, see evaluate
+      if not os.path.exists(fileName):
+         if not groups:
+            groups = PatternDatabase.defaultGroups(self.geometry)
+         PatternDatabase.build(self.goalModel, groups, fileName)
+      self.load()
+   
+   # Default name of the file holding the tables for a goal
+   @staticmethod
+   def defaultFileName(goalModel):
+      digits = "0123456789abcdefghijklmnopqrstuv"
+      return "eight-" + "".join([digits[tile] for tile in goalModel]) + ".pdb"
+   
+   # Default partition of the tiles into groups, of 4 tiles for the 3x3 
+   #  board, 5 for the 4x4 board and 3 for the 5x5 board, to keep the tables
+   #  and the time to build them reasonable
+   @staticmethod
+   def defaultGroups(geometry):
+      groupSize = {3: 4, 4: 5}.get(geometry.size, 3)
+      tiles = range(1, geometry.numCells)
+      return [tiles[i:i + groupSize] 
+              for i in range(0, len(tiles), groupSize)]
+   
+   # Number of entries in the table of a group of k tiles
+   @staticmethod
+   def tableSize(geometry, k):
+      size = geometry.numCells
+      for i in range(k):
+         size *= geometry.numCells - i
+      return size
+   
+   # Build the table for a group of tiles by a 0-1 breadth first search over
+   #  the positions of the group's tiles and the empty tile
+   @staticmethod
+   def buildTable(goalModel, group):
+      geometry = BoardGeometry.forCells(len(goalModel))
+      numCells = geometry.numCells
+      moveTable = geometry.moveTable
+      k = len(group)
+      goalPosition = [0] * numCells
+      for p in range(numCells):
+         goalPosition[goalModel[p]] = p
+      
+      # Abstract state index = rank * numCells + position of the empty tile
+      distance = bytearray("\xff") * PatternDatabase.tableSize(geometry, k)
+      start = rankPattern([goalPosition[tile] for tile in group], 
+                          numCells) * numCells + goalPosition[0]
+      distance[start] = 0
+      queue = collections.deque([start])
+      while queue:
+         index = queue.popleft()
+         rank, blank = divmod(index, numCells)
+         d = distance[index]
+         positions = unrankPattern(rank, k, numCells)
+         for moveCode in MOVE_CODES:
+            if geometry.possibleMoves[blank] & moveCode:
+               q = moveTable[blank][moveCode][0]
+               if q in positions:
+                  moved = positions[:]
+                  moved[positions.index(q)] = blank
+                  newIndex = rankPattern(moved, numCells) * numCells + q
+                  if distance[newIndex] > d + 1:
+                     distance[newIndex] = d + 1
+                     queue.append(newIndex)
+               else:
+                  newIndex = rank * numCells + q
+                  if distance[newIndex] > d:
+                     distance[newIndex] = d
+                     queue.appendleft(newIndex)
+      
+      # Entries where the empty tile sits on a tile of the group are never
+      #  reached and are left as 255
+      return distance
+   
+   # Build the tables for all the groups and save them to fileName
+   @staticmethod
+   def build(goalModel, groups, fileName):
+      header = bytearray(PatternDatabase.magic)
+      header.append(BoardGeometry.forCells(len(goalModel)).size)
+      header.extend(goalModel)
+      header.append(len(groups))
+      for group in groups:
+         header.append(len(group))
+         header.extend(group)
+      output = open(fileName, "wb")
+      try:
+         output.write(header)
+         for group in groups:
+            output.write(PatternDatabase.buildTable(goalModel, group))
+      finally:
+         output.close()
+   
+   # Memory map the tables from self.fileName
+   def load(self):
+      tableFile = open(self.fileName, "rb")
+      try:
+         self.table = mmap.mmap(tableFile.fileno(), 0, 
+                                access = mmap.ACCESS_READ)
+      finally:
+         tableFile.close()
+      table = self.table
+      numCells = self.geometry.numCells
+      if table[:4] != PatternDatabase.magic or \
+         ord(table[4]) != self.geometry.size:
+         raise ValueError(self.fileName + " is not a pattern database for "
+                          "this board size")
+      offset = 5
+      goalModel = [ord(tile) for tile in table[offset:offset + numCells]]
+      if goalModel != self.goalModel:
+         raise ValueError(self.fileName + " was built for a different goal")
+      offset += numCells
+      numGroups = ord(table[offset])
+      offset += 1
+      self.groups = []
+      for i in range(numGroups):
+         k = ord(table[offset])
+         self.groups.append([ord(tile) for tile in 
+                             table[offset + 1:offset + 1 + k]])
+         offset += 1 + k
+      
+      # Start of the table of each group
+      self.offsets = []
+      for group in self.groups:
+         self.offsets.append(offset)
+         offset += PatternDatabase.tableSize(self.geometry, len(group))
+      if offset != len(table):
+         raise ValueError(self.fileName + " is truncated")
+   
+   # The lookups do not vectorize, the boards are estimated one at a time
+   def evaluateStates(self, states):
+      return self.evaluateEach(states)
+   
+   def evaluate(self, board):
+      numCells = self.geometry.numCells
+      bits = self.geometry.bits
+      mask = self.geometry.mask
+      positions = [0] * numCells
+      state = board.state
+      for k in range(numCells):
+         positions[state & mask] = k
+         state >>= bits
+      estimate = 0
+      table = self.table
+      blank = positions[0]
+      for i in range(len(self.groups)):
+         rank = rankPattern([positions[tile] for tile in self.groups[i]], 
+                            numCells)
+         estimate += ord(table[self.offsets[i] + rank * numCells + blank])
+      return estimate
+   
+   # Check the heuristic on the states reachable from the goal, visited in 
+   #  breadth first order (at most maxStates of them, if given).
+   # The estimate must be 0 at the goal, never exceed the true distance 
+   #  (admissible) and never drop by more than 1 along a move (consistent).
+   # Returns the number of states checked and a list of the violations found
+   # Beyond the 3x3 board the reachable states do not fit in memory, so 
+   #  --check-pdb checks the defaultCheckStates nearest the goal by default.
+   defaultCheckStates = 1000000
+   def check(self, maxStates = None):
+      violations = []
+      goal = Board()
+      goal.constructBoard(self.goalModel)
+      if self.evaluate(goal) != 0:
+         violations.append("Estimate for the goal is not 0")
+      distance = {goal.state: 0}
+      queue = collections.deque([goal])
+      numChecked = 0
+      while queue and (maxStates is None or numChecked < maxStates):
+         board = queue.popleft()
+         numChecked += 1
+         h = self.evaluate(board)
+         if h > distance[board.state]:
+            violations.append("Inadmissible estimate %d (distance %d) for %s"
+                              % (h, distance[board.state], 
+                                 board.getModel()))
+         for moveCode in MOVE_CODES:
+            if board.possibleMoves & moveCode:
+               child = board.spawnChild(moveCode)
+               if h > self.evaluate(child) + 1:
+                  violations.append("Inconsistent estimates %d and %d "
+                                    "across a move from %s" % 
+                                    (h, self.evaluate(child), 
+                                     board.getModel()))
+               if child.state not in distance:
+                  distance[child.state] = distance[board.state] + 1
+                  queue.append(child)
+      return numChecked, violations
+
+# Registered heuristics, by name, as accepted by -f
+HEURISTICS = {}
+
+# Register a heuristic class under its name. The heuristics must be 
+#  admissible, as the optimal searches, and the cache of their paths, rely
+#  on it.
+def registerHeuristic(heuristicClass):
+   HEURISTICS[heuristicClass.name] = heuristicClass
+   return heuristicClass
+
+for heuristicClass in [MisplacedTiles, ManhattanDistance, PatternDatabase, 
+                       LinearConflict, WalkingDistance]:
+   registerHeuristic(heuristicClass)
+
+# Names of the registered heuristics the name stands for: the name itself,
+#  or a, b, ... for "max:a,b,...", the max. of those. None if the name is 
+#  not valid.
+def heuristicComponents(name):
+   if not isinstance(name, basestring):
+      return None
+   if name.startswith("max:"):
+      names = name[len("max:"):].split(",")
+   else:
+      names = [name]
+   for component in names:
+      if component not in HEURISTICS:
+         return None
+   return names
+
+# Description of the heuristic of the name, see heuristicComponents
+def heuristicDescription(name):
+   if name.startswith("max:"):
+      return "Max. of " + ", ".join([HEURISTICS[component].description 
+                                     for component in 
+                                     heuristicComponents(name)])
+   return HEURISTICS[name].description
+
+# Exact distance to the goal for every state of the 3x3 board
+# A single breadth first search from the goal fills a table of one byte per 
+#  reachable state, 255 marking the states that can not reach the goal. The
+#  states are ranked by the positions of all the tiles but the last two: 
+#  those fill the two remaining cells, in the one order with the right 
+#  parity, so the ranks of the reachable states run over 0 .. 9! / 2 - 1.
+# The table is saved to a file, which is memory mapped when loaded, so that 
+#  several solver processes share a single copy.
+# File layout: "EORC", board size, the goal tiles, then the table.
+class DistanceOracle(object):
+   magic = "EORC"
+
+   def __init__(self, goal, fileName = None):
+      self.geometry = goal.geometry
+      self.goalModel = goal.getModel()
+      self.goalParity = goal.parity()
+      if self.geometry.numCells > 9:
+         raise ValueError("The distance oracle is only available for boards "
+                          "of up to 3x3")
+      if not fileName:
+         fileName = DistanceOracle.defaultFileName(self.goalModel)
+      self.fileName = fileName
+      if not os.path.exists(fileName):
+         DistanceOracle.build(self.goalModel, fileName)
+      self.load()
+   
+   # Default name of the file holding the table for a goal
+   @staticmethod
+   def defaultFileName(goalModel):
+      return "eight-" + "".join(map(str, goalModel)) + ".oracle"
+   
+   # Rank of the board among the states of its size that share its parity
+   @staticmethod
+   def rank(board):
+      geometry = board.geometry
+      numCells = geometry.numCells
+      bits = geometry.bits
+      mask = geometry.mask
+      positions = [0] * numCells
+      state = board.state
+      for k in range(numCells):
+         positions[state & mask] = k
+         state >>= bits
+      return rankPattern(positions[:numCells - 2], numCells)
+   
+   # Build the table by a breadth first search from the goal and save it to
+   #  fileName
+   @staticmethod
+   def build(goalModel, fileName):
+      goal = Board()
+      goal.constructBoard(goalModel)
+      numCells = goal.geometry.numCells
+      size = 1
+      for i in range(numCells - 2):
+         size *= numCells - i
+      distance = bytearray("\xff") * size
+      distance[DistanceOracle.rank(goal)] = 0
+      queue = collections.deque([goal])
+      while queue:
+         board = queue.popleft()
+         d = distance[DistanceOracle.rank(board)] + 1
+         moves = board.possibleMoves
+         mask = 1
+         while mask != 16:
+            if moves & mask:
+               child = board.spawnChild(mask)
+               rank = DistanceOracle.rank(child)
+               if distance[rank] == 255:
+                  distance[rank] = d
+                  child.parent = None
+                  queue.append(child)
+            mask <<= 1;
+      
+      header = bytearray(DistanceOracle.magic)
+      header.append(goal.geometry.size)
+      header.extend(goalModel)
+      output = open(fileName, "wb")
+      try:
+         output.write(header)
+         output.write(distance)
+      finally:
+         output.close()
+   
+   # Memory map the table from self.fileName
+   def load(self):
+      tableFile = open(self.fileName, "rb")
+      try:
+         self.table = mmap.mmap(tableFile.fileno(), 0, 
+                                access = mmap.ACCESS_READ)
+      finally:
+         tableFile.close()
+      table = self.table
+      numCells = self.geometry.numCells
+      if table[:4] != DistanceOracle.magic or \
+         ord(table[4]) != self.geometry.size:
+         raise ValueError(self.fileName + " is not a distance oracle for "
+                          "this board size")
+      goalModel = [ord(tile) for tile in table[5:5 + numCells]]
+      if goalModel != self.goalModel:
+         raise ValueError(self.fileName + " was built for a different goal")
+      self.offset = 5 + numCells
+      size = 1
+      for i in range(numCells - 2):
+         size *= numCells - i
+      if self.offset + size != len(table):
+         raise ValueError(self.fileName + " is truncated")
+   
+   # Exact number of moves from the board to the goal, None if the goal can
+   #  not be reached
+   def distance(self, board):
+      if board.parity() != self.goalParity:
+         return None
+      return self.lookup(board)
+   
+   # Distance of a board of the goal's parity, None if not reachable
+   def lookup(self, board):
+      d = ord(self.table[self.offset + DistanceOracle.rank(board)])
+      if d == 255:
+         return None
+      return d
+   
+   # Walk from the root to the goal, always moving to a board one move 
+   #  closer. Returns the goal board, whose path leads back to the root, and
+   #  the number of boards looked up, or None if the goal can not be reached.
+   #  Raises ValueError if no move leads closer, the table being wrong.
+   def solve(self, root):
+      board = root.copyBoard()
+      board.depth = 0
+      d = self.distance(board)
+      numLookups = 1
+      if d is None:
+         return None, numLookups
+      while d:
+         moves = board.possibleMoves
+         mask = 1
+         while mask != 16:
+            if moves & mask:
+               child = board.spawnChild(mask)
+               numLookups += 1
+               if self.lookup(child) == d - 1:
+                  board = child
+                  d -= 1
+                  break
+            mask <<= 1
+         else:
+            raise ValueError(self.fileName + " is corrupt, or not built " + 
+                             "for the goal: no move leads closer to it")
+      return board, numLookups
+
+# Effective branching factor b of a search that did numNodes tests to reach
+#  the given depth, that is the solution of 
+#  numNodes = 1 + b + b^2 + ... + b^depth
+def effectiveBranchingFactor(numNodes, depth):
+   if depth <= 0 or numNodes <= depth + 1:
+      return 1.0
+   low = 1.0
+   high = float(numNodes)
+   for i in range(100):
+      b = (low + high) / 2
+      total = 0.0
+      power = 1.0
+      for d in range(depth + 1):
+         total += power
+         power *= b
+      if total < numNodes:
+         low = b
+      else:
+         high = b
+   return (low + high) / 2
+
+# Fixed capacity table of the states reached by a depth first search, 
+#  keyed by the packed state
+# Each entry holds the least depth g the state was reached at and the bound 
+#  of the iteration (f bound for ida*, depth limit for dls and ids) it was 
+#  stored in. A state can be pruned when it was reached before at a smaller 
+#  depth, or at the same depth in the same iteration: the other visit 
+#  searches below it with at least as much of the bound left.
+# When the slot of a new state is taken by another, the policy decides which
+#  one is kept:
+#  "depth"    - Keep the entry with the most of its bound left, that is the 
+#               largest subtree below it. Entries of earlier iterations are 
+#               always replaced.
+#  "always"   - Always store the new state
+#  "two-tier" - Two slots per bucket, the first replaced as for "depth" and 
+#               the second always, for the states the first one turns down
+class TranspositionTable(object):
+   policies = ["depth", "always", "two-tier"]
+   entryBytes = 64                  # Approximate memory taken by an entry
+
+   def __init__(self, capacity, policy = "two-tier"):
+      if policy not in TranspositionTable.policies:
+         raise ValueError("Unknown replacement policy " + str(policy))
+      if capacity < 2 or (policy == "two-tier" and capacity < 4):
+         raise ValueError("A transposition table needs at least 2 entries, "
+                          "4 with the two-tier policy")
+      self.policy = policy
+      if policy == "two-tier":
+         self.numBuckets = capacity / 2
+      else:
+         self.numBuckets = capacity
+      # The states are hashed to their remainder by the no. of buckets, which
+      #  is made a prime so that every tile counts, not just the low bits
+      while not TranspositionTable.isPrime(self.numBuckets):
+         self.numBuckets -= 1
+      self.capacity = capacity
+      self.clear()
+   
+   @staticmethod
+   def isPrime(n):
+      if n < 4:
+         return n > 1
+      if n % 2 == 0:
+         return False
+      k = 3
+      while k * k <= n:
+         if n % k == 0:
+            return False
+         k += 2
+      return True
+   
+   # Table of as many entries as fit in the given no. of megabytes
+   @staticmethod
+   def forMemory(megabytes, policy = "two-tier"):
+      return TranspositionTable(
+         int(megabytes * 1024 * 1024 / TranspositionTable.entryBytes), policy)
+   
+   # Remove every entry and reset the counters
+   def clear(self):
+      self.keys = [None] * self.capacity
+      self.depths = [0] * self.capacity
+      self.bounds = [0] * self.capacity
+      self.numHits = 0              # States found in the table
+      self.numMisses = 0            # States not found in the table
+      self.numReplacements = 0      # Entries overwritten by another state
+      self.numCutoffs = 0           # States pruned
+   
+   # Look the state reached at depth g up, in the iteration of the given 
+   #  bound. Returns True if it can be pruned, otherwise records it and 
+   #  returns False.
+   def probe(self, state, g, bound):
+      keys = self.keys
+      depths = self.depths
+      bounds = self.bounds
+      if self.policy == "two-tier":
+         slot = 2 * (state % self.numBuckets)
+         slots = (slot, slot + 1)
+      else:
+         slot = state % self.numBuckets
+         slots = (slot,)
+      
+      for slot in slots:
+         if keys[slot] == state:
+            self.numHits += 1
+            storedG = depths[slot]
+            if storedG < g or (storedG == g and bounds[slot] == bound):
+               self.numCutoffs += 1
+               return True
+            depths[slot] = g
+            bounds[slot] = bound
+            return False
+      
+      self.numMisses += 1
+      slot = slots[0]
+      if self.policy != "always" and keys[slot] is not None and \
+         bounds[slot] == bound and depths[slot] < g:
+         # The entry in the first slot has more of the bound left
+         if self.policy == "depth":
+            return False
+         slot = slots[1]
+      if keys[slot] is not None:
+         self.numReplacements += 1
+      keys[slot] = state
+      depths[slot] = g
+      bounds[slot] = bound
+      return False
+
+# Closed set of the boards of up to 3x3, indexed by the rank of the 
+#  permutation of the tiles (0 .. numCells! - 1) rather than hashed
+# One bit per rank marks the boards closed, and 2 bits per rank keep the 
+#  last move of the path to the board, which is enough to rebuild the path 
+#  from the root by undoing moves, so the boards in the queue need not keep
+#  their parents. If withDepths, a byte per rank also keeps the depth the 
+#  board was reached at (255 if not reached), as a* needs. For the 3x3 
+#  board that is 45 KB of bits and 90 KB of moves, and 354 KB of depths.
+# A board is recorded with the move that led to it when first closed, and 
+#  never changed afterwards, so the moves lead back to the root along the 
+#  boards closed before it.
+class RankedClosedSet(object):
+   moveIndices = {1: 0, 2: 1, 4: 2, 8: 3}
+
+   def __init__(self, root, withDepths = False):
+      geometry = root.geometry
+      if geometry.numCells > 9:
+         raise ValueError("The ranked closed set is only available for boards"
+                          " of up to 3x3")
+      self.root = root
+      self.geometry = geometry
+      self.size = math.factorial(geometry.numCells)
+      self.closed = bytearray((self.size + 7) / 8)
+      self.numClosed = 0
+      self.moves = bytearray((self.size + 3) / 4)
+      self.depths = None
+      if withDepths:
+         self.depths = bytearray("\xff") * self.size
+      self.positions = [0] * geometry.numCells
+      self.popCount = [bin(used).count("1") 
+                       for used in range(1 << geometry.numCells)]
+   
+   # Memory taken by the tables, in bytes
+   def numBytes(self):
+      numBytes = len(self.closed) + len(self.moves)
+      if self.depths is not None:
+         numBytes += len(self.depths)
+      return numBytes
+   
+   # Rank of the packed state among the permutations of the tiles
+   def rank(self, state):
+      numCells = self.geometry.numCells
+      bits = self.geometry.bits
+      mask = self.geometry.mask
+      positions = self.positions
+      popCount = self.popCount
+      for k in range(numCells):
+         positions[state & mask] = k
+         state >>= bits
+      rank = 0
+      used = 0
+      for i in range(numCells - 1):
+         p = positions[i]
+         rank = rank * (numCells - i) + p - popCount[used & ((1 << p) - 1)]
+         used |= 1 << p
+      return rank
+   
+   def isClosed(self, rank):
+      return self.closed[rank >> 3] & (1 << (rank & 7))
+   
+   def close(self, rank):
+      self.closed[rank >> 3] |= 1 << (rank & 7)
+      self.numClosed += 1
+   
+   def __len__(self):
+      return self.numClosed
+   
+   # Record moveCode as the last move of the path to the board of the rank
+   def setMove(self, rank, moveCode):
+      if moveCode in RankedClosedSet.moveIndices:
+         shift = (rank & 3) << 1
+         self.moves[rank >> 2] = (self.moves[rank >> 2] & ~(3 << shift)) | \
+                                 (RankedClosedSet.moveIndices[moveCode] << shift)
+   
+   def getMove(self, rank):
+      return MOVE_CODES[(self.moves[rank >> 2] >> ((rank & 3) << 1)) & 3]
+   
+   # Rebuild the path from the root to the board from the recorded moves, 
+   #  and return the board at its end, whose parents lead back to the root
+   def rebuild(self, board):
+      moveTable = self.geometry.moveTable
+      mask = self.geometry.mask
+      state = board.state
+      blank = board.emptyTile
+      moveCodes = []
+      while state != self.root.state:
+         moveCode = self.getMove(self.rank(state))
+         moveCodes.append(moveCode)
+         q, shift, weightDelta, possibleMoves = \
+            moveTable[blank][OPPOSITE_MOVE[moveCode]]
+         state += ((state >> shift) & mask) * weightDelta
+         blank = q
+      moveCodes.reverse()
+      path = self.root
+      for moveCode in moveCodes:
+         path = path.spawnChild(moveCode)
+      return path
+
+# Layers of an external memory breadth first search, kept in a directory as
+#  files of sorted packed states, 8 bytes each, so boards of up to 4x4 only
+# The states are read and written through buffers of bufferSize states, so
+#  the memory used does not grow with the size of the layers. The no. of 
+#  bytes read and written is kept in bytesRead and bytesWritten. 
+#  progress.json records the last complete layer and the counters of the 
+#  search, to resume it.
+class ExternalLayers(object):
+   stateFormat = "<%dQ"
+   stateBytes = 8
+
+   def __init__(self, directory, bufferSize = 1 << 18):
+      self.directory = directory
+      self.bufferSize = bufferSize
+      self.bytesRead = 0
+      self.bytesWritten = 0
+      self.numRuns = 0
+      if not os.path.isdir(directory):
+         os.makedirs(directory)
+   
+   # Default directory for the search from the root to the goal
+   @staticmethod
+   def defaultDirectory(rootModel, goalModel):
+      digits = "0123456789abcdefghijklmnopqrstuv"
+      return "eight-" + "".join([digits[tile] for tile in goalModel]) + \
+             "-" + "".join([digits[tile] for tile in rootModel]) + ".layers"
+   
+   def layerFile(self, depth):
+      return os.path.join(self.directory, "layer-%03d.bin" % depth)
+   
+   def progressFile(self):
+      return os.path.join(self.directory, "progress.json")
+   
+   # Remove the files of a previous search, or the runs of an unfinished 
+   #  layer only if keepLayers
+   def clear(self, keepLayers = False):
+      for fileName in os.listdir(self.directory):
+         if fileName.startswith("run-") or fileName.endswith(".tmp") or \
+            not keepLayers and \
+            (fileName.startswith("layer-") or fileName == "progress.json"):
+            os.remove(os.path.join(self.directory, fileName))
+   
+   # Remove the files of the search and the directory
+   def remove(self):
+      self.clear()
+      if not os.listdir(self.directory):
+         os.rmdir(self.directory)
+   
+   def loadProgress(self):
+      if not os.path.exists(self.progressFile()):
+         return None
+      with open(self.progressFile()) as inputFile:
+         return json.load(inputFile)
+   
+   def saveProgress(self, progress):
+      temporaryFile = self.progressFile() + ".tmp"
+      with open(temporaryFile, "w") as outputFile:
+         json.dump(progress, outputFile, sort_keys = True)
+      os.rename(temporaryFile, self.progressFile())
+   
+   # Iterate over the states of the file, reading bufferSize states at a time
+   def readStates(self, fileName, bufferSize = None):
+      numBytes = (bufferSize or self.bufferSize) * ExternalLayers.stateBytes
+      with open(fileName, "rb") as inputFile:
+         while True:
+            data = inputFile.read(numBytes)
+            if not data:
+               return
+            self.bytesRead += len(data)
+            count = len(data) / ExternalLayers.stateBytes
+            for state in struct.unpack(ExternalLayers.stateFormat % count, 
+                                       data):
+               yield state
+   
+   # Write the states to the file, through a temporary file renamed once 
+   #  complete. Returns the no. of states written.
+   def writeStates(self, fileName, states):
+      temporaryFile = fileName + ".tmp"
+      numStates = 0
+      with open(temporaryFile, "wb") as outputFile:
+         buffer = []
+         for state in states:
+            buffer.append(state)
+            if len(buffer) == self.bufferSize:
+               numStates += self.writeBuffer(outputFile, buffer)
+               buffer = []
+         numStates += self.writeBuffer(outputFile, buffer)
+      os.rename(temporaryFile, fileName)
+      return numStates
+   
+   def writeBuffer(self, outputFile, buffer):
+      data = struct.pack(ExternalLayers.stateFormat % len(buffer), *buffer)
+      outputFile.write(data)
+      self.bytesWritten += len(data)
+      return len(buffer)
+   
+   # Sort the states, drop the duplicates and write them as a new run file
+   def writeRun(self, states):
+      fileName = os.path.join(self.directory, "run-%06d.bin" % self.numRuns)
+      self.numRuns += 1
+      self.writeStates(fileName, sorted(set(states)))
+      return fileName
+   
+   # Merge the sorted runs into the next layer, dropping the duplicates and 
+   #  the states of the excluded layers, then remove the runs. Returns the 
+   #  no. of states of the layer.
+   def mergeRuns(self, runs, fileName, excludedLayers):
+      # Every open file gets an equal share of the buffer
+      bufferSize = max(1, self.bufferSize / (len(runs) + 
+                                             len(excludedLayers) + 1))
+      states = heapq.merge(*[self.readStates(run, bufferSize) 
+                             for run in runs])
+      excluded = heapq.merge(*[self.readStates(layer, bufferSize)
+                               for layer in excludedLayers])
+      numStates = self.writeStates(fileName, 
+                                   ExternalLayers.difference(states, excluded))
+      for run in runs:
+         os.remove(run)
+      return numStates
+   
+   # The sorted states without duplicates that are not in the sorted 
+   #  excluded states
+   @staticmethod
+   def difference(states, excluded):
+      nextExcluded = next(excluded, None)
+      last = None
+      for state in states:
+         if state == last:
+            continue
+         last = state
+         while nextExcluded is not None and nextExcluded < state:
+            nextExcluded = next(excluded, None)
+         if state != nextExcluded:
+            yield state
+   
+   # Whether the layer holds the state, by binary search in its file
+   def contains(self, depth, state):
+      with open(self.layerFile(depth), "rb") as inputFile:
+         low = 0
+         high = os.path.getsize(self.layerFile(depth)) / \
+                ExternalLayers.stateBytes
+         while low < high:
+            middle = (low + high) / 2
+            inputFile.seek(middle * ExternalLayers.stateBytes)
+            data = inputFile.read(ExternalLayers.stateBytes)
+            self.bytesRead += len(data)
+            value = struct.unpack(ExternalLayers.stateFormat % 1, data)[0]
+            if value == state:
+               return True
+            if value < state:
+               low = middle + 1
+            else:
+               high = middle
+      return False
+
+# Limits on the resources a search may use
+# timeLimit is in CPU secs and wallTimeLimit in elapsed secs, memoryLimit in
+#  megabytes of resident memory of the process and nodeLimit in no. of 
+#  tests; None for no limit. The node limit is checked on every call of 
+#  expired, but the clocks and the memory are only sampled every 
+#  checkInterval calls, as reading them costs a system call. cancel() may 
+#  be called from another thread to stop the search at its next sample.
+class Budget(object):
+   # Message for each reason a search is stopped for
+   messages = {"time": "Time expired", "wallTime": "Wall time expired",
+               "nodes": "Node limit reached", 
+               "memory": "Memory limit reached",
+               "cancelled": "Search cancelled"}
+
+   def __init__(self, timeLimit = DEFAULT_TIME_LIMIT, wallTimeLimit = None,
+                nodeLimit = None, memoryLimit = None, 
+                checkInterval = DEFAULT_CHECK_INTERVAL):
+      if checkInterval < 1:
+         raise ValueError("The check interval must be at least 1")
+      self.timeLimit = timeLimit
+      self.wallTimeLimit = wallTimeLimit
+      self.nodeLimit = nodeLimit
+      self.memoryLimit = memoryLimit
+      self.checkInterval = checkInterval
+      self.cancelled = False
+      self.onSample = None          # Called after every sample, if set
+      self.start()
+   
+   # Budget with the limits given in a dictionary, with the keys 
+   #  "timeLimit", "wallTimeLimit", "nodeLimit", "memoryLimit" and 
+   #  "checkInterval", each optional
+   @staticmethod
+   def fromLimits(limits):
+      return Budget(limits.get("timeLimit", DEFAULT_TIME_LIMIT), 
+                    limits.get("wallTimeLimit"), limits.get("nodeLimit"),
+                    limits.get("memoryLimit"), 
+                    limits.get("checkInterval", DEFAULT_CHECK_INTERVAL))
+   
+   # Start counting the time from now
+   def start(self):
+      self.cpuStart = time.clock()
+      self.wallStart = time.time()
+      self.countdown = self.checkInterval
+      self.stopReason = None        # Why the budget expired, None if not
+   
+   # Ask the search to stop, from any thread
+   def cancel(self):
+      self.cancelled = True
+   
+   # Returns True once the budget has been used up, numTestDone being the 
+   #  no. of tests done so far
+   def expired(self, numTestDone):
+      if self.stopReason:
+         return True
+      if self.nodeLimit is not None and numTestDone >= self.nodeLimit:
+         self.stopReason = "nodes"
+         return True
+      self.countdown -= 1
+      if self.countdown > 0:
+         return False
+      self.countdown = self.checkInterval
+      return self.sample()
+   
+   # Secs left before the first of the time limits runs out, the CPU secs 
+   #  left being counted as elapsed secs, or None if there is no time limit
+   def timeLeft(self):
+      timeLeft = None
+      if self.timeLimit is not None:
+         timeLeft = self.timeLimit - (time.clock() - self.cpuStart)
+      if self.wallTimeLimit is not None:
+         wallTimeLeft = self.wallTimeLimit - (time.time() - self.wallStart)
+         if timeLeft is None or wallTimeLeft < timeLeft:
+            timeLeft = wallTimeLeft
+      return timeLeft
+   
+   # Read the clocks and the memory used, and check them against the limits
+   def sample(self):
+      if self.cancelled:
+         self.stopReason = "cancelled"
+      elif self.timeLimit is not None and \
+           time.clock() - self.cpuStart > self.timeLimit:
+         self.stopReason = "time"
+      elif self.wallTimeLimit is not None and \
+           time.time() - self.wallStart > self.wallTimeLimit:
+         self.stopReason = "wallTime"
+      elif self.memoryLimit is not None and \
+           Budget.memoryUsed() > self.memoryLimit * 1024 * 1024:
+         self.stopReason = "memory"
+      if self.onSample is not None:
+         self.onSample()
+      return self.stopReason is not None
+   
+   # Resident memory of the process, in bytes, 0 if it can not be read
+   @staticmethod
+   def memoryUsed():
+      try:
+         statm = open("/proc/self/statm")
+         try:
+            return int(statm.read().split()[1]) * PAGE_SIZE
+         finally:
+            statm.close()
+      except (IOError, OSError):
+         pass
+      if resource is None:
+         return 0
+      # Peak rather than current, in kilobytes on Linux but bytes on OS X
+      maxRss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+      if sys.platform == "darwin":
+         return maxRss
+      return maxRss * 1024
+
+# Class that abstracts the notion of the 8Puzzle
+class EightPuzzle:
+   closedSets = ["set", "ranked"]
+
+   def __init__(self, root, goal, verbose, timer):
+      self.root = root              # Root board
+      self.goal = goal              # Goal board
+      self.timeTaken = 0.0          # Time taken for the search
+      self.numTestDone = 0          # Number of tests against the goal board 
+                                    #  done.
+      self.maxQueueLength = 0       # Max. queue length
+      self.numDuplicatesFound = 0   # Number of duplicates detected and 
+                                    #  eliminated
+      self.maxDepthSearched = 0     # Max depth searched
+      self.pathLength = 0           # Length of the path from root to goal 
+                                    #  board
+      self.goalFounded = False      # Whether the search for the goal was 
+                                    #  successful or not
+      self.goalDepth = -1           # Depth at which the goal was found
+      self.reverseIndex = {}        # Dictionary (Reverse index) of where each
+                                    #  number in the goal state is located.
+      self.verbose = verbose        # Whether to print the output verbosely
+      self.quiet = False            # Whether to print nothing during the 
+                                    #  search, not even the path found
+      self.hardDepthLimit = goal.geometry.hardDepthLimit
+                                    # Hard depth limit for algorithms that 
+                                    #  has a tendency to search at large depths
+                                    #  unless stopped.
+      self.algorithm = ""           # Algorithm used
+      self.heuristic = None         # Heuristic used
+      self.timer = timer
+      self.budget = Budget()        # Limits on the resources of a search
+      self.stopReason = None        # Why the search was stopped before 
+                                    #  finishing, None if it was not
+      self.solution = None          # Goal board found by the search
+      self.heuristics = {}          # Heuristics built for the goal, by name
+      self.patternDatabaseFile = None
+                                    # File holding the pattern database, 
+                                    #  default if None
+      self.oracleFile = None        # File holding the distance oracle, 
+                                    #  default if None
+      self.transpositionTable = None
+                                    # Transposition table used by ida*, dls
+                                    #  and ids, None for none
+      self.phaseTimes = None        # Secs spent in each phase of the search,
+                                    #  by phase, if timed (see timePhases)
+      self.snapshotInterval = None  # Secs between two progress snapshots, 
+                                    #  None for none
+      self.snapshots = []           # Progress snapshots taken, as 
+                                    #  dictionaries
+      self.progressFile = None      # File the snapshots are also written to
+                                    #  as lines of JSON, if any
+      self.maxClosedSize = 0        # Peak no. of states in the closed set
+      self.closedSet = "set"        # Closed set of bfs, dfs, dls, greedy 
+                                    #  and a*: "set" for a set of the states,
+                                    #  "ranked" for a RankedClosedSet
+      self.closedSetBytes = None    # Memory taken by the ranked closed set
+      self.externalDirectory = None # Directory of the layers of bfs-external,
+                                    #  default if None
+      self.externalBufferSize = 1 << 18
+                                    # No. of states bfs-external keeps in 
+                                    #  memory per file
+      self.externalResume = False   # Whether bfs-external resumes the search
+                                    #  recorded in its directory, if any
+      self.externalLayers = None    # ExternalLayers of the last bfs-external
+      self.numWorkers = multiprocessing.cpu_count()
+                                    # No. of worker processes of hda* and 
+                                    #  pida*
+      self.hdaBatchSize = 64        # No. of boards a worker of hda* expands
+                                    #  between two batches of messages
+      self.splitDepth = 6           # Depth of the roots of the subtrees 
+                                    #  pida* hands out to its workers
+      self.workerStats = []         # Stats of each worker of hda* and pida*
+      self.weight = 2.0             # Weight of h in wa*, and first weight of
+                                    #  ara*
+      self.weightStep = 0.5         # Amount ara* lowers its weight by after
+                                    #  each search
+      self.solutions = []           # Solutions found by wa* and ara*, with
+                                    #  their bounds, see recordSolution
+      self.solutionFile = None      # File the solutions are also written to
+                                    #  as lines of JSON, if any
+      self.moveMap = None           # Move of the original problem for each
+                                    #  move searched, if canonicalized, for 
+                                    #  the moves written to solutionFile
+      self.peakMemory = 0           # Peak resident memory seen, in bytes
+      self.maxRecursionDepth = 0    # Stats of particular algorithms, see 
+      self.layerSizes = []          #  printStats
+      self.iterationSizes = []
+      self.resetDirectionStats()
+      for k in range(goal.geometry.numCells):
+         self.reverseIndex[self.goal.getTile(k)] = k
+
+   # Print the stats for the search run
+   def printStats(self):
+      print "Algorithm               = "  + str(self.algorithm)
+      if self.heuristic is None:
+         print "Heuristic               = None"
+      else:
+         print "Heuristic               = "  + \
+               heuristicDescription(EightPuzzle.heuristicName(self.heuristic))
+      print "Time taken              = "  + str(self.timeTaken)
+      print "No. of tests done       = "  + str(self.numTestDone)
+      if self.timeTaken > 0:
+         print "Tests per sec           = "  + "%.0f" % \
+               (self.numTestDone / self.timeTaken)
+      print "Max. queue length       = "  + str(self.maxQueueLength)
+      print "No. of duplicates found = "  + str(self.numDuplicatesFound)
+      print "Max. depth searched     = "  + str(self.maxDepthSearched)
+      #print "Path length             = "  + str(self.pathLength)
+      print "Goal found              = "  + str(self.goalFounded)
+      print "Goal depth/Path length  = "  + str(self.goalDepth)
+      if self.algorithm == "ida*":
+         print "Max. recursion depth    = "  + str(self.maxRecursionDepth)
+      if self.algorithm in ["bfs-layered", "bfs-external", "bfs-numpy"]:
+         print "Layer sizes             = "  + " ".join(map(str, self.layerSizes))
+      if self.algorithm == "bfs-external":
+         print "Bytes read              = "  + \
+               str(self.externalLayers.bytesRead)
+         print "Bytes written           = "  + \
+               str(self.externalLayers.bytesWritten)
+      if self.algorithm == "ids":
+         print "Iteration sizes         = "  + " ".join(map(str, self.iterationSizes))
+         print "Eff. branching factor   = "  + "%.4f" % \
+               effectiveBranchingFactor(self.numTestDone, 
+                                        len(self.iterationSizes) - 1)
+      if self.algorithm == "bibfs" or self.algorithm == "mm":
+         for direction in ["forward", "backward"]:
+            stats = self.directionStats[direction]
+            print "------------------------------"
+            print "Direction               = "  + direction
+            print "No. of tests done       = "  + str(stats["numTestDone"])
+            print "Max. queue length       = "  + str(stats["maxQueueLength"])
+            print "No. of duplicates found = "  + str(stats["numDuplicatesFound"])
+            print "Max. depth searched     = "  + str(stats["maxDepthSearched"])
+      if self.algorithm in ["wa*", "ara*"]:
+         print "Weight                  = "  + str(self.weight)
+         print "------------------------------"
+         for index, solution in enumerate(self.solutions):
+            print "%-23s = length %d, bound %.4f, weight %.4g, %.6f secs, %d tests" % \
+               ("Solution " + str(index + 1), solution["depth"], 
+                solution["bound"], solution["weight"], 
+                solution["wallTime"], solution["numTestDone"])
+      if self.algorithm == "hda*":
+         print "------------------------------"
+         for index, stats in enumerate(self.workerStats):
+            print "%-23s = %s tests, %s sent, %s received in %s batches" % \
+               ("Worker " + str(index), stats.get("numTestDone"), 
+                stats.get("numSent"), stats.get("numReceived"),
+                stats.get("numBatchesSent"))
+         print "Load balance            = "  + "%.4f" % self.loadBalance()
+      if self.algorithm == "pida*":
+         print "Subtrees per iteration  = "  + \
+               " ".join(map(str, self.iterationSizes))
+         print "------------------------------"
+         for index, stats in enumerate(self.workerStats):
+            print "%-23s = %s tests, %s subtrees" % \
+               ("Worker " + str(index), stats["numTestDone"], 
+                stats["numTasks"])
+         print "Load balance            = "  + "%.4f" % self.loadBalance()
+      if self.closedSetBytes is not None:
+         print "Closed set              = "  + self.closedSet + ", " + \
+               str(self.closedSetBytes) + " bytes"
+      if self.phaseTimes:
+         print "------------------------------"
+         for phase in sorted(self.phaseTimes):
+            print "%-23s = %f" % ("Time " + phase, self.phaseTimes[phase])
+      table = self.transpositionTable
+      if table is not None and self.algorithm in ["dls", "ids", "ida*"]:
+         print "------------------------------"
+         print "Transposition table     = "  + str(table.capacity) + \
+               " entries, " + table.policy
+         print "Table hits              = "  + str(table.numHits)
+         print "Table misses            = "  + str(table.numMisses)
+         print "Table replacements      = "  + str(table.numReplacements)
+         print "Table cutoffs           = "  + str(table.numCutoffs)
+      print "=============================="
+
+   # Load balance of the workers of hda* and pida*: the largest no. of tests done by
+   #  a worker over the mean, 1 if perfectly balanced
+   def loadBalance(self):
+      tests = [stats.get("numTestDone", 0) for stats in self.workerStats]
+      if not tests or not sum(tests):
+         return 1.0
+      return max(tests) * len(tests) / float(sum(tests))
+
+   # Time the phases of the searches that support it (bfs, greedy and a*):
+   #  generating the children, evaluating the heuristic, checking for 
+   #  duplicates and managing the queue. Off by default, as reading the 
+   #  clock around every step slows the search down.
+   def timePhases(self, enabled = True):
+      if enabled:
+         self.phaseTimes = {}
+      else:
+         self.phaseTimes = None
+   
+   # Record a snapshot of the progress of the search, called by the budget
+   #  every time it samples the clocks
+   def takeSnapshot(self):
+      memory = Budget.memoryUsed()
+      if memory > self.peakMemory:
+         self.peakMemory = memory
+      now = time.time()
+      if self.snapshotInterval is None or \
+         now - self.lastSnapshot < self.snapshotInterval:
+         return
+      self.lastSnapshot = now
+      snapshot = {"algorithm": self.algorithm, 
+                  "wallTime": now - self.budget.wallStart,
+                  "numTestDone": self.numTestDone,
+                  "numDuplicatesFound": self.numDuplicatesFound,
+                  "maxQueueLength": self.maxQueueLength,
+                  "maxDepthSearched": self.maxDepthSearched,
+                  "memory": memory}
+      self.snapshots.append(snapshot)
+      if self.progressFile is not None:
+         self.progressFile.write(json.dumps(snapshot, sort_keys = True) + 
+                                 "\n")
+         self.progressFile.flush()
+   
+   # Stats of the last search, as a dictionary that can be written as JSON
+   def getStats(self):
+      if self.heuristic is None:
+         heuristicName = None
+      else:
+         heuristicName = EightPuzzle.heuristicName(self.heuristic)
+      stats = {"algorithm": self.algorithm, "heuristic": heuristicName,
+               "timeTaken": self.timeTaken, 
+               "numTestDone": self.numTestDone,
+               "numDuplicatesFound": self.numDuplicatesFound,
+               "maxQueueLength": self.maxQueueLength,
+               "maxClosedSize": self.maxClosedSize,
+               "closedSet": self.closedSet, 
+               "closedSetBytes": self.closedSetBytes,
+               "maxDepthSearched": self.maxDepthSearched,
+               "goalFound": self.goalFounded, "goalDepth": self.goalDepth,
+               "stopReason": self.stopReason, 
+               "peakMemory": self.peakMemory}
+      if self.timeTaken > 0:
+         stats["testsPerSec"] = self.numTestDone / self.timeTaken
+      else:
+         stats["testsPerSec"] = None
+      if self.phaseTimes is not None:
+         stats["phaseTimes"] = self.phaseTimes
+      if self.snapshots:
+         stats["snapshots"] = self.snapshots
+      if self.algorithm == "ida*":
+         stats["maxRecursionDepth"] = self.maxRecursionDepth
+      if self.algorithm in ["bfs-layered", "bfs-external", "bfs-numpy"]:
+         stats["layerSizes"] = self.layerSizes
+      if self.algorithm == "hda*" or self.algorithm == "pida*":
+         stats["workers"] = self.workerStats
+         stats["loadBalance"] = self.loadBalance()
+      if self.algorithm == "pida*":
+         stats["iterationSizes"] = self.iterationSizes
+      if self.algorithm in ["wa*", "ara*"]:
+         stats["weight"] = self.weight
+         stats["solutions"] = self.solutions
+      if self.algorithm == "bfs-external":
+         stats["bytesRead"] = self.externalLayers.bytesRead
+         stats["bytesWritten"] = self.externalLayers.bytesWritten
+      if self.algorithm == "ids":
+         stats["iterationSizes"] = self.iterationSizes
+      if self.algorithm == "bibfs" or self.algorithm == "mm":
+         stats["directions"] = self.directionStats
+      table = self.transpositionTable
+      if table is not None and self.algorithm in ["dls", "ids", "ida*"]:
+         stats["transpositionTable"] = {
+            "capacity": table.capacity, "policy": table.policy,
+            "numHits": table.numHits, "numMisses": table.numMisses,
+            "numReplacements": table.numReplacements, 
+            "numCutoffs": table.numCutoffs}
+      return stats
+   
+   # Run the search given by the algorithm name, as given to -a
+   def search(self, algorithm, heuristicFunctionFlag = None, depthLimit = None):
+      self.stopReason = None
+      self.budget.start()
+      self.snapshots = []
+      self.lastSnapshot = self.budget.wallStart
+      self.maxClosedSize = 0
+      self.closedSetBytes = None
+      self.peakMemory = Budget.memoryUsed()
+      self.budget.onSample = self.takeSnapshot
+      if self.phaseTimes is not None:
+         self.phaseTimes = {}
+      self.solution = None
+      self.solutions = []
+      self.goalFounded = False
+      self.goalDepth = -1
+      if self.transpositionTable is not None:
+         self.transpositionTable.clear()
+      if algorithm == "bfs":
+         return self.bfs()
+      elif algorithm == "bfs-layered":
+         return self.bfsLayered()
+      elif algorithm == "bfs-external":
+         return self.externalBfs()
+      elif algorithm == "bfs-numpy":
+         return self.bfsNumpy()
+      elif algorithm == "bibfs":
+         return self.bidirectionalBfs()
+      elif algorithm == "dfs":
+         return self.dfs()
+      elif algorithm == "dls":
+         return self.dls(depthLimit)
+      elif algorithm == "ids":
+         return self.ids()
+      elif algorithm == "greedy":
+         return self.greedy(heuristicFunctionFlag)
+      elif algorithm == "a*":
+         return self.astar(heuristicFunctionFlag)
+      elif algorithm == "wa*":
+         return self.weightedAstar(heuristicFunctionFlag)
+      elif algorithm == "ara*":
+         return self.anytimeAstar(heuristicFunctionFlag)
+      elif algorithm == "ida*":
+         return self.idastar(heuristicFunctionFlag)
+      elif algorithm == "hda*":
+         return self.hdastar(heuristicFunctionFlag)
+      elif algorithm == "pida*":
+         return self.parallelIdastar(heuristicFunctionFlag)
+      elif algorithm == "mm":
+         return self.mm(heuristicFunctionFlag)
+      elif algorithm == "oracle":
+         return self.oracle()
+      raise ValueError("Unknown algorithm " + str(algorithm))
+
+   # Record the goal board found by the search and print the path to it
+   def foundGoal(self, board):
+      self.solution = board
+      if self.quiet:
+         self.pathLength = board.depth
+      else:
+         self.pathLength = board.printPath(self.verbose)
+      self.goalFounded = True
+      self.goalDepth = board.depth
+      return True
+
+   # Record a solution found by wa* or ara* with the given weight, proven to
+   #  be at most 'bound' times as long as a shortest path, and write it to 
+   #  self.solutionFile as a line of JSON, with its moves, if any
+   def recordSolution(self, board, bound, weight):
+      solution = {"depth": board.depth, "bound": bound, "weight": weight,
+                  "wallTime": time.time() - self.budget.wallStart,
+                  "numTestDone": self.numTestDone}
+      self.solutions.append(solution)
+      if self.solutionFile is not None:
+         moveCodes = board.getMoveCodes()
+         if self.moveMap is not None:
+            moveCodes = [self.moveMap[moveCode] for moveCode in moveCodes]
+         line = dict(solution)
+         line["algorithm"] = self.algorithm
+         line["moves"] = [MOVE_NAMES[moveCode] for moveCode in moveCodes]
+         self.solutionFile.write(json.dumps(line, sort_keys = True) + "\n")
+         self.solutionFile.flush()
+      if not self.quiet:
+         print "Solution of length %d found, at most %.4f times the " \
+               "shortest" % (board.depth, bound)
+
+   # Returns True once the search has used up self.budget, and says why the 
+   #  first time
+   def budgetExpired(self, numTestDone = None):
+      if numTestDone is None:
+         numTestDone = self.numTestDone
+      if not self.budget.expired(numTestDone):
+         return False
+      if not self.stopReason:
+         self.stopReason = self.budget.stopReason
+         if not self.quiet:
+            print Budget.messages[self.stopReason]
+      return True
+
+   # New RankedClosedSet for the search if self.closedSet asks for one, 
+   #  None otherwise
+   def rankedClosedSet(self, withDepths = False):
+      if self.closedSet != "ranked":
+         return None
+      ranked = RankedClosedSet(self.root, withDepths)
+      self.closedSetBytes = ranked.numBytes()
+      return ranked
+
+   # Breadth First Search
+   # Boards are marked as seen when they are generated, so every state is 
+   #  queued at most once.
+   def bfs(self):
+      self.algorithm = "bfs"
+      queue = collections.deque([self.root])
+      self.numTestDone = 0
+      self.maxQueueLength = 0
+      self.numDuplicatesFound = 0
+      self.maxDepthSearched = 0
+      self.pathLength = 0
+      
+      # Keeps track of the states that have been generated. If ranked, the
+      #  queued boards do not keep their parents, and the path is rebuilt 
+      #  from the closed set instead.
+      ranked = self.rankedClosedSet()
+      if ranked is not None:
+         seenBoards = ranked
+         ranked.close(ranked.rank(self.root.state))
+      else:
+         seenBoards = set([self.root.state])
+      phaseTimes = self.phaseTimes
+      if phaseTimes is not None:
+         clock = timeit.default_timer
+         for phase in ["generate", "duplicates"]:
+            phaseTimes[phase] = 0.0
+      
+      # While there are candidate boards in the queue
+      while queue:
+         if self.budgetExpired():
+            self.maxClosedSize = len(seenBoards)
+            return False
+         
+         # Keep track of the max queue length
+         if len(queue) > self.maxQueueLength:
+            self.maxQueueLength = len(queue)
+            
+         # Retrieve the next candidate, increment count of tests
+         candidate = queue.popleft()
+         self.numTestDone += 1
+         if self.maxDepthSearched < candidate.depth:
+            self.maxDepthSearched = candidate.depth
+         
+         # Test if this is the goal
+         if candidate == self.goal:
+            self.maxClosedSize = len(seenBoards)
+            if ranked is not None:
+               candidate = ranked.rebuild(candidate)
+            return self.foundGoal(candidate)
+         
+         # Detect duplicates among children, increment count, add only 
+         #  non-duplicates to queue
+         moves = candidate.possibleMoves
+         mask = 1
+         while mask != 16:
+            if moves & mask:
+               if phaseTimes is not None:
+                  start = clock()
+                  child = candidate.spawnChild(mask)
+                  middle = clock()
+                  phaseTimes["generate"] += middle - start
+               else:
+                  child = candidate.spawnChild(mask)
+               if ranked is not None:
+                  rank = ranked.rank(child.state)
+                  if ranked.isClosed(rank):
+                     self.numDuplicatesFound += 1
+                  else:
+                     ranked.close(rank)
+                     ranked.setMove(rank, mask)
+                     child.parent = None
+                     queue.append(child)
+               elif child.state in seenBoards:
+                  self.numDuplicatesFound += 1
+               else:
+                  seenBoards.add(child.state)
+                  queue.append(child)
+               if phaseTimes is not None:
+                  phaseTimes["duplicates"] += clock() - middle
+            mask <<= 1;
+      self.maxClosedSize = len(seenBoards)
+      return False
+
+   # Layer synchronous Breadth First Search
+   # Expands one whole depth at a time and records the size of every layer 
+   #  in self.layerSizes. Only the previous, current and next layers are 
+   #  needed for duplicate detection, since a move always changes the depth 
+   #  by exactly one.
+   def bfsLayered(self):
+      self.algorithm = "bfs-layered"
+      self.numTestDone = 0
+      self.maxQueueLength = 0
+      self.numDuplicatesFound = 0
+      self.maxDepthSearched = 0
+      self.pathLength = 0
+      self.layerSizes = []
+      
+      previousLayer = set()
+      layer = {self.root.state: self.root}
+      while layer:
+         if self.budgetExpired():
+            return False
+         
+         self.layerSizes.append(len(layer))
+         if len(layer) > self.maxQueueLength:
+            self.maxQueueLength = len(layer)
+         
+         nextLayer = {}
+         for candidate in layer.itervalues():
+            self.numTestDone += 1
+            if candidate == self.goal:
+               self.maxDepthSearched = candidate.depth
+               return self.foundGoal(candidate)
+            
+            moves = candidate.possibleMoves
+            mask = 1
+            while mask != 16:
+               if moves & mask:
+                  child = candidate.spawnChild(mask)
+                  if child.state in previousLayer or child.state in nextLayer:
+                     self.numDuplicatesFound += 1
+                  else:
+                     nextLayer[child.state] = child
+               mask <<= 1;
+         self.maxDepthSearched = len(self.layerSizes) - 1
+         previousLayer = layer
+         layer = nextLayer
+      return False
+
+   # External memory Breadth First Search
+   # Frontier search over the layers of ExternalLayers: the children of each
+   #  layer are written as sorted runs of self.externalBufferSize states, 
+   #  then merged into the next layer, dropping the states of the current 
+   #  and previous layers, which are the only ones a child can be a 
+   #  duplicate of. No closed set is kept in memory. The path to the goal is 
+   #  rebuilt by looking up a parent of each board in the layer before. 
+   #  Every layer is recorded in the directory as it completes, so a search
+   #  stopped by its budget can be resumed if self.externalResume.
+   def externalBfs(self):
+      self.algorithm = "bfs-external"
+      self.numTestDone = 0
+      self.maxQueueLength = 0
+      self.numDuplicatesFound = 0
+      self.maxDepthSearched = 0
+      self.pathLength = 0
+      self.layerSizes = []
+      geometry = self.root.geometry
+      if geometry.numCells * geometry.bits > 64:
+         raise ValueError("The external memory bfs is only available for "
+                          "boards of up to 4x4")
+      directory = self.externalDirectory
+      if directory is None:
+         directory = ExternalLayers.defaultDirectory(
+            [self.root.getTile(k) for k in range(geometry.numCells)],
+            [self.goal.getTile(k) for k in range(geometry.numCells)])
+      layers = ExternalLayers(directory, self.externalBufferSize)
+      self.externalLayers = layers
+      
+      progress = None
+      if self.externalResume:
+         progress = layers.loadProgress()
+      if progress is not None:
+         if progress["root"] != self.root.state or \
+            progress["goal"] != self.goal.state:
+            raise ValueError(directory + " holds the layers of another "
+                             "search")
+         layers.clear(keepLayers = True)
+         self.layerSizes = progress["layerSizes"]
+         self.numTestDone = progress["numTestDone"]
+         self.numDuplicatesFound = progress["numDuplicatesFound"]
+         layers.bytesRead = progress["bytesRead"]
+         layers.bytesWritten = progress["bytesWritten"]
+      else:
+         layers.clear()
+         layers.writeStates(layers.layerFile(0), [self.root.state])
+         self.layerSizes = [1]
+      self.maxQueueLength = max(self.layerSizes)
+      
+      moveTable = geometry.moveTable
+      bits = geometry.bits
+      mask = geometry.mask
+      goalState = self.goal.state
+      depth = len(self.layerSizes) - 1
+      while self.layerSizes[depth]:
+         self.maxDepthSearched = depth
+         runs = []
+         buffer = []
+         numChildren = 0
+         for state in layers.readStates(layers.layerFile(depth)):
+            if self.budgetExpired():
+               layers.clear(keepLayers = True)
+               return False
+            self.numTestDone += 1
+            if state == goalState:
+               board = self.rebuildLayeredPath(depth, layers.contains)
+               layers.remove()
+               return self.foundGoal(board)
+            
+            blank = 0
+            rest = state
+            while rest & mask:
+               rest >>= bits
+               blank += 1
+            for moveCode in MOVE_CODES:
+               if moveTable[blank][moveCode]:
+                  q, shift, weightDelta, possibleMoves = \
+                     moveTable[blank][moveCode]
+                  buffer.append(state + ((state >> shift) & mask) * weightDelta)
+            if len(buffer) >= layers.bufferSize:
+               numChildren += len(buffer)
+               runs.append(layers.writeRun(buffer))
+               buffer = []
+         if buffer:
+            numChildren += len(buffer)
+            runs.append(layers.writeRun(buffer))
+         
+         excludedLayers = [layers.layerFile(depth)]
+         if depth > 0:
+            excludedLayers.append(layers.layerFile(depth - 1))
+         layerSize = layers.mergeRuns(runs, layers.layerFile(depth + 1), 
+                                      excludedLayers)
+         self.numDuplicatesFound += numChildren - layerSize
+         self.layerSizes.append(layerSize)
+         if layerSize > self.maxQueueLength:
+            self.maxQueueLength = layerSize
+         depth += 1
+         layers.saveProgress({"root": self.root.state, 
+                              "goal": goalState,
+                              "layerSizes": self.layerSizes,
+                              "numTestDone": self.numTestDone,
+                              "numDuplicatesFound": self.numDuplicatesFound,
+                              "bytesRead": layers.bytesRead,
+                              "bytesWritten": layers.bytesWritten})
+      layers.remove()
+      return False
+   
+   # Rebuild the path from the root to the goal, found in the layer at 
+   #  depth, by looking up one parent of each board in the layer before, 
+   #  contains(depth, state) telling whether a layer holds a state
+   def rebuildLayeredPath(self, depth, contains):
+      geometry = self.root.geometry
+      moveTable = geometry.moveTable
+      mask = geometry.mask
+      state = self.goal.state
+      blank = self.goal.emptyTile
+      moveCodes = []
+      while depth > 0:
+         depth -= 1
+         for moveCode in MOVE_CODES:
+            if moveTable[blank][moveCode]:
+               q, shift, weightDelta, possibleMoves = moveTable[blank][moveCode]
+               parentState = state + ((state >> shift) & mask) * weightDelta
+               if contains(depth, parentState):
+                  moveCodes.append(OPPOSITE_MOVE[moveCode])
+                  state = parentState
+                  blank = q
+                  break
+      moveCodes.reverse()
+      board = self.root
+      for moveCode in moveCodes:
+         board = board.spawnChild(moveCode)
+      return board
+
+   # Breadth First Search over NumPy arrays
+   # Layer synchronous as bfsLayered, but every layer is a sorted array of
+   #  packed states, and the children of a whole layer are generated at once,
+   #  for each position of the empty tile and move, with shifts and masks. 
+   #  The duplicates are dropped by sorting the children and removing those 
+   #  of the current and previous layers. The layers are kept, to rebuild 
+   #  the path by looking up a parent of each board in the layer before.
+   #  Boards of up to 4x4 only, as the states are held in 64 bits.
+   def bfsNumpy(self):
+      self.algorithm = "bfs-numpy"
+      self.numTestDone = 0
+      self.maxQueueLength = 0
+      self.numDuplicatesFound = 0
+      self.maxDepthSearched = 0
+      self.pathLength = 0
+      self.layerSizes = []
+      geometry = self.root.geometry
+      if numpy is None:
+         raise ValueError("bfs-numpy needs NumPy")
+      if geometry.numCells * geometry.bits > 64:
+         raise ValueError("bfs-numpy is only available for boards of up to "
+                          "4x4")
+      uint64 = numpy.uint64
+      mask = uint64(geometry.mask)
+      cellShifts = [uint64(k * geometry.bits) 
+                    for k in range(geometry.numCells)]
+      goalState = uint64(self.goal.state)
+      
+      layers = [numpy.array([self.root.state], dtype = uint64)]
+      while len(layers[-1]):
+         layer = layers[-1]
+         # A single test per layer, so the clocks are read every time
+         self.budget.sample()
+         if self.budgetExpired():
+            return False
+         
+         self.layerSizes.append(len(layer))
+         if len(layer) > self.maxQueueLength:
+            self.maxQueueLength = len(layer)
+         self.maxDepthSearched = len(layers) - 1
+         index = int(numpy.searchsorted(layer, goalState))
+         if index < len(layer) and layer[index] == goalState:
+            self.numTestDone += index + 1
+            return self.foundGoal(self.rebuildLayeredPath(
+               len(layers) - 1, 
+               lambda depth, state: EightPuzzle.sortedContains(layers[depth], 
+                                                               state)))
+         self.numTestDone += len(layer)
+         
+         # Position of the empty tile in each state
+         blanks = numpy.zeros(len(layer), dtype = numpy.int8)
+         for k in range(geometry.numCells):
+            blanks[(layer >> cellShifts[k]) & mask == 0] = k
+         children = []
+         for p in range(geometry.numCells):
+            states = layer[blanks == p]
+            if not len(states):
+               continue
+            for moveCode in MOVE_CODES:
+               if geometry.possibleMoves[p] & moveCode:
+                  q, shift, weightDelta, possibleMoves = \
+                     geometry.moveTable[p][moveCode]
+                  tiles = (states >> uint64(shift)) & mask
+                  # The tile at q slides into p
+                  if weightDelta >= 0:
+                     children.append(states + tiles * uint64(weightDelta))
+                  else:
+                     children.append(states - tiles * uint64(-weightDelta))
+         children = numpy.concatenate(children)
+         nextLayer = numpy.unique(children)
+         nextLayer = nextLayer[~numpy.in1d(nextLayer, layer, 
+                                           assume_unique = True)]
+         if len(layers) > 1:
+            nextLayer = nextLayer[~numpy.in1d(nextLayer, layers[-2], 
+                                              assume_unique = True)]
+         self.numDuplicatesFound += len(children) - len(nextLayer)
+         layers.append(nextLayer)
+      return False
+   
+   # Whether the sorted array of states holds the state
+   @staticmethod
+   def sortedContains(states, state):
+      index = int(numpy.searchsorted(states, numpy.uint64(state)))
+      return index < len(states) and int(states[index]) == state
+
+   # Depth First Search
+   # If ranked (see self.closedSet), boards are checked against the closed
+   #  set when popped rather than when generated, as ranking a board costs
+   #  more than hashing it.
+   def dfs(self):
+      self.algorithm = "dfs"
+      stack = [self.root]
+      self.numTestDone = 0
+      self.maxQueueLength = 0
+      self.numDuplicatesFound = 0
+      self.maxDepthSearched = 0
+      self.pathLength = 0
+      
+      # Keeps track of the boards that have been visited
+      visitedBoards = set()
+      ranked = self.rankedClosedSet()
+      
+      # While there are candidate boards in the stack
+      while stack:
+         if self.budgetExpired():
+            return False
+         
+         # Keep track of the max stack length
+         if len(stack) > self.maxQueueLength:
+            self.maxQueueLength = len(stack)
+         
+         # Retrieve the next candidate, mark it was visited, increment count 
+         #  of tests
+         candidate = stack.pop()
+         if ranked is not None:
+            rank = ranked.rank(candidate.state)
+            if ranked.isClosed(rank):
+               self.numDuplicatesFound += 1
+               continue
+            ranked.close(rank)
+            ranked.setMove(rank, candidate.move)
+            candidate.parent = None
+         else:
+            visitedBoards.add(candidate)
+         self.numTestDone += 1
+         if self.maxDepthSearched < candidate.depth:
+            self.maxDepthSearched = candidate.depth
+         
+         # Test if this is the goal
+         if candidate == self.goal:
+            if ranked is not None:
+               candidate = ranked.rebuild(candidate)
+            return self.foundGoal(candidate)
+         
+         # Detect duplicates among children, increment count, add only 
+         #  non-duplicates to queue
+         moves = candidate.possibleMoves
+         mask = 1
+         while mask != 16:
+            if moves & mask:
+               child = candidate.spawnChild(mask)
+               if ranked is None and child in visitedBoards:
+                  self.numDuplicatesFound += 1
+               else:
+                  if child.depth <= self.hardDepthLimit:
+                     stack.append(child)
+            mask <<= 1;
+      return False
+
+   def dls(self, depthLimit):
+      self.algorithm = "dls"
+      table = self.transpositionTable
+      stack = [self.root]
+      self.numTestDone = 0
+      self.maxQueueLength = 0
+      self.numDuplicatesFound = 0
+      self.maxDepthSearched = 0
+      self.pathLength = 0
+      
+      # Keeps track of the boards that have been visited, unless the 
+      #  transposition table does
+      visitedBoards = set()
+      ranked = None
+      if table is None:
+         ranked = self.rankedClosedSet()
+      
+      # While there are candidate boards in the stack
+      while stack:
+         if self.budgetExpired():
+            return False
+         
+         # Keep track of the max stack length
+         if len(stack) > self.maxQueueLength:
+            self.maxQueueLength = len(stack)
+         
+         # Retrieve the next candidate, mark it was visited, increment count 
+         #  of tests
+         candidate = stack.pop()
+         #print candidate, str(candidate.depth)
+         if table is not None:
+            if table.probe(candidate.state, candidate.depth, depthLimit):
+               self.numDuplicatesFound += 1
+               continue
+         elif ranked is not None:
+            rank = ranked.rank(candidate.state)
+            if ranked.isClosed(rank):
+               self.numDuplicatesFound += 1
+               continue
+            ranked.close(rank)
+            ranked.setMove(rank, candidate.move)
+            candidate.parent = None
+         else:
+            visitedBoards.add(candidate)
+         self.numTestDone += 1
+         if self.maxDepthSearched < candidate.depth:
+            self.maxDepthSearched = candidate.depth
+         
+         # Test if this is the goal
+         if candidate == self.goal:
+            if ranked is not None:
+               candidate = ranked.rebuild(candidate)
+            return self.foundGoal(candidate)
+         
+         # Detect duplicates among children, increment count, add only 
+         #  non-duplicates to queue
+         moves = candidate.possibleMoves
+         mask = 1
+         while mask != 16:
+            if moves & mask:
+               child = candidate.spawnChild(mask)
+               if table is None and ranked is None and \
+                  child in visitedBoards:
+                  self.numDuplicatesFound += 1
+               else:
+                  if child.depth <= depthLimit:
+                     stack.append(child)
+            mask <<= 1;
+      return False
+
+   # Iterative Deepening Search
+   # Depth limited searches with the limit raised by one each time, keeping 
+   #  for every state the shallowest depth it was reached at in the current 
+   #  iteration, so that a state is only expanded again when reached at a 
+   #  strictly smaller depth. The transposition table, if any, takes the 
+   #  place of that map, to bound the memory used. The no. of tests done in 
+   #  each iteration is kept in self.iterationSizes. Without a table, stops 
+   #  as soon as an iteration reaches no new state, as then no state is left
+   #  to reach.
+   def ids(self):
+      self.algorithm = "ids"
+      table = self.transpositionTable
+      self.numTestDone = 0
+      self.maxQueueLength = 0
+      self.numDuplicatesFound = 0
+      self.maxDepthSearched = 0
+      self.pathLength = 0
+      self.iterationSizes = []
+      
+      numStates = 0
+      depthLimit = 0
+      while depthLimit <= self.hardDepthLimit:
+         # Shallowest depth of the states reached in this iteration
+         shallowest = {}
+         numTestDone = self.numTestDone
+         stack = [self.root]
+         # While there are candidate boards in the stack
+         while stack:
+            if self.budgetExpired():
+               self.iterationSizes.append(self.numTestDone - numTestDone)
+               return False
+            
+            # Keep track of the max stack length
+            if len(stack) > self.maxQueueLength:
+               self.maxQueueLength = len(stack)
+            
+            # Retrieve the next candidate, skip it if it was reached at a 
+            #  depth no greater in this iteration, increment count of tests
+            candidate = stack.pop()
+            if table is not None:
+               if table.probe(candidate.state, candidate.depth, depthLimit):
+                  self.numDuplicatesFound += 1
+                  continue
+            else:
+               if shallowest.get(candidate.state, depthLimit + 1) <= \
+                  candidate.depth:
+                  self.numDuplicatesFound += 1
+                  continue
+               shallowest[candidate.state] = candidate.depth
+            self.numTestDone += 1
+            if self.maxDepthSearched < candidate.depth:
+               self.maxDepthSearched = candidate.depth
+            
+            # Test if this is the goal
+            if candidate == self.goal:
+               self.iterationSizes.append(self.numTestDone - numTestDone)
+               return self.foundGoal(candidate)
+            
+            if candidate.depth == depthLimit:
+               continue
+            
+            # Add the children to the stack, but the one undoing the move 
+            #  that led to the candidate
+            moves = candidate.possibleMoves
+            if candidate.move in OPPOSITE_MOVE:
+               moves &= ~OPPOSITE_MOVE[candidate.move]
+            mask = 1
+            while mask != 16:
+               if moves & mask:
+                  stack.append(candidate.spawnChild(mask))
+               mask <<= 1;
+         
+         self.iterationSizes.append(self.numTestDone - numTestDone)
+         if table is None:
+            if len(shallowest) == numStates:
+               return False
+            numStates = len(shallowest)
+         depthLimit += 1
+      return False
+
+   # Name of the heuristic selected by heuristicFunctionFlag, as for 
+   #  getHeuristic
+   @staticmethod
+   def heuristicName(heuristicFunctionFlag):
+      if heuristicFunctionFlag is True:
+         return "h1"
+      elif heuristicFunctionFlag is False:
+         return "h2"
+      return heuristicFunctionFlag
+
+   # Return the heuristic selected by heuristicFunctionFlag, built for the 
+   #  goal board (True --> h1, False --> h2, otherwise the name of a 
+   #  registered heuristic, or of a max. of them, see heuristicComponents)
+   def getHeuristic(self, heuristicFunctionFlag):
+      name = EightPuzzle.heuristicName(heuristicFunctionFlag)
+      if name not in self.heuristics:
+         names = heuristicComponents(name)
+         if names is None:
+            raise ValueError("Unknown heuristic " + str(name))
+         if name.startswith("max:"):
+            self.heuristics[name] = MaxHeuristic(
+               self.goal, [self.getHeuristic(component) 
+                           for component in names])
+         elif name == "pdb":
+            self.heuristics[name] = PatternDatabase(self.goal, 
+                                                    self.patternDatabaseFile)
+         else:
+            self.heuristics[name] = HEURISTICS[name](self.goal)
+      return self.heuristics[name]
+
+   def h1(self, candidateBoard):
+      return self.getHeuristic(True).evaluate(candidateBoard)
+   
+   def h2(self, candidateBoard):
+      return self.getHeuristic(False).evaluate(candidateBoard)
+   
+   def estimatedCostH1(self, candidateBoard):
+      return candidateBoard.depth + self.h1(candidateBoard)
+
+   def estimatedCostH2(self, candidateBoard):
+      return candidateBoard.depth + self.h2(candidateBoard)
+
+   def greedy(self, heuristicFunctionFlag):
+      self.algorithm = "greedy"
+      return self.bestFirstSearch(heuristicFunctionFlag, 0)
+
+   def astar(self, heuristicFunctionFlag):
+      self.algorithm = "a*"
+      return self.bestFirstSearch(heuristicFunctionFlag, 1)
+
+   # Weighted a*: best first search over depth + self.weight * h, which 
+   #  finds a path at most self.weight times as long as a shortest one (with
+   #  a consistent heuristic, as no board is expanded twice), expanding far 
+   #  fewer boards than a* for weights over 1. The boards are ordered by 
+   #  depth / self.weight + h, in the same order.
+   def weightedAstar(self, heuristicFunctionFlag):
+      self.algorithm = "wa*"
+      if not self.bestFirstSearch(heuristicFunctionFlag, 1.0 / self.weight):
+         return False
+      self.recordSolution(self.solution, self.weight, self.weight)
+      return True
+
+   # Anytime Repairing A* (ARA*)
+   # A series of weighted a* searches, the first with self.weight, each 
+   #  next one with a weight lowered by self.weightStep (or to the bound of 
+   #  the last solution, if lower), down to 1. Each search reuses the depths
+   #  found by the previous ones, so only the boards whose depth improved 
+   #  are expanded again. A board whose depth improves once it has been 
+   #  expanded is kept aside (inconsistent) until the next search, so no 
+   #  board is expanded twice in a search. A search stops once no queued 
+   #  board has a lower depth + weight * h than the length of the best 
+   #  solution.
+   # After each search, the best solution is at most 'bound' times as long 
+   #  as a shortest path, the bound being its length over the lowest 
+   #  depth + h of the boards queued or kept aside, which is no more than 
+   #  the length of a shortest path. Every solution that improves the length
+   #  or the bound is recorded (see recordSolution). The searches go on 
+   #  until the bound reaches 1, or until the budget runs out, in which case
+   #  the best solution found so far is returned, with self.stopReason set.
+   def anytimeAstar(self, heuristicFunctionFlag):
+      self.algorithm = "ara*"
+      self.heuristic = heuristicFunctionFlag
+      self.numTestDone = 0
+      self.maxQueueLength = 0
+      self.numDuplicatesFound = 0
+      self.maxDepthSearched = 0
+      self.pathLength = 0
+      heuristic = self.getHeuristic(heuristicFunctionFlag)
+      hDelta = heuristic.delta
+      evaluate = heuristic.evaluate
+      update = heuristic.update
+      goalState = self.goal.state
+      self.root.h = evaluate(self.root)
+      self.root.keys = heuristic.keys(self.root.state)
+      weight = max(1.0, self.weight)
+      
+      order = 0
+      queue = [(weight * self.root.h, 0, order, self.root)]
+      # Board of the lowest depth found for each state, the queued boards 
+      #  that are not are stale
+      best = {self.root.state: self.root}
+      inconsistent = []
+      solution = None
+      if self.root.state == goalState:
+         solution = self.root
+      
+      while True:
+         # Keeps track of the states expanded by this search
+         visitedBoards = set()
+         while queue:
+            if self.budgetExpired():
+               self.maxClosedSize = len(best)
+               if solution is None:
+                  return False
+               return self.foundGoal(solution)
+            
+            # Keep track of the max queue length
+            if len(queue) > self.maxQueueLength:
+               self.maxQueueLength = len(queue)
+            
+            if solution is not None and queue[0][0] >= solution.depth:
+               break
+            candidate = heapq.heappop(queue)[3]
+            if best[candidate.state] is not candidate or \
+               candidate.state in visitedBoards:
+               continue
+            visitedBoards.add(candidate.state)
+            self.numTestDone += 1
+            if self.maxDepthSearched < candidate.depth:
+               self.maxDepthSearched = candidate.depth
+            
+            # Queue the children reached at a lower depth than before, or 
+            #  keep them aside if already expanded
+            moves = candidate.possibleMoves
+            mask = 1
+            while mask != 16:
+               if moves & mask:
+                  if hDelta is None:
+                     child = candidate.spawnChild(mask)
+                     if update:
+                        child.h, child.keys = update(candidate.h, 
+                                                     candidate.keys,
+                                                     candidate.state, 
+                                                     child.state, 
+                                                     child.emptyTile, 
+                                                     candidate.emptyTile)
+                     else:
+                        child.h = evaluate(child)
+                  else:
+                     child = candidate.spawnChild(mask, hDelta)
+                  previous = best.get(child.state)
+                  if previous is not None and previous.depth <= child.depth \
+                     or child.depth > self.hardDepthLimit:
+                     self.numDuplicatesFound += 1
+                  else:
+                     best[child.state] = child
+                     if child.state == goalState:
+                        solution = child
+                     if child.state in visitedBoards:
+                        inconsistent.append(child)
+                     else:
+                        order += 1
+                        heapq.heappush(queue, (child.depth + weight * child.h,
+                                               -child.depth, order, child))
+               mask <<= 1
+         
+         self.maxClosedSize = len(best)
+         if solution is None:
+            return False
+         
+         # Bound the best solution, and queue the boards left for the next 
+         #  search with the next weight
+         boards = [entry[3] for entry in queue 
+                   if best[entry[3].state] is entry[3]] + \
+                  [board for board in inconsistent 
+                   if best[board.state] is board]
+         lowerBound = solution.depth
+         for board in boards:
+            if board.depth + board.h < lowerBound:
+               lowerBound = board.depth + board.h
+         bound = 1.0
+         if lowerBound > 0:
+            bound = min(weight, float(solution.depth) / lowerBound)
+         if not self.solutions or \
+            solution.depth < self.solutions[-1]["depth"] or \
+            bound < self.solutions[-1]["bound"]:
+            self.recordSolution(solution, bound, weight)
+         if bound <= 1:
+            return self.foundGoal(solution)
+         
+         weight = max(1.0, min(weight - self.weightStep, bound))
+         queue = []
+         for board in boards:
+            order += 1
+            queue.append((board.depth + weight * board.h, -board.depth, 
+                          order, board))
+         heapq.heapify(queue)
+         inconsistent = []
+
+   # Best first search over a binary heap, shared by greedy, a* and wa*
+   # Boards are ordered by gWeight * depth + h, with h computed once when the
+   # board is queued. For a* ties are broken in favour of deeper boards; any
+   # remaining ties go to the board queued first, so the search is 
+   # deterministic.
+   # bestG holds the lowest depth at which each state has been queued, so a
+   # state already queued with an equal or better cost is not pushed again.
+   # If ranked (see self.closedSet), the depths and the expanded states are
+   # kept in a RankedClosedSet instead, and queued boards drop their parents.
+   def bestFirstSearch(self, heuristicFunctionFlag, gWeight):
+      self.heuristic = heuristicFunctionFlag
+      self.numTestDone = 0
+      self.maxQueueLength = 0
+      self.numDuplicatesFound = 0
+      self.maxDepthSearched = 0
+      self.pathLength = 0
+      heuristic = self.getHeuristic(heuristicFunctionFlag)
+      hDelta = heuristic.delta
+      evaluate = heuristic.evaluate
+      evaluateStates = heuristic.evaluateStates
+      update = heuristic.update
+      self.root.h = heuristic.evaluate(self.root)
+      self.root.keys = heuristic.keys(self.root.state)
+      
+      order = 0
+      queue = [(self.root.h, 0, order, self.root)]
+      bestG = {self.root.state: 0}
+      
+      # Keeps track of the states that have been expanded
+      visitedBoards = set()
+      ranked = self.rankedClosedSet(True)
+      if ranked is not None:
+         bestG = visitedBoards = ranked
+         ranked.depths[ranked.rank(self.root.state)] = 0
+      phaseTimes = self.phaseTimes
+      if phaseTimes is not None:
+         clock = timeit.default_timer
+         for phase in ["generate", "heuristic", "duplicates", "queue"]:
+            phaseTimes[phase] = 0.0
+      
+      while queue:
+         if self.budgetExpired():
+            self.maxClosedSize = len(bestG)
+            return False
+         
+         # Keep track of the max queue length
+         if len(queue) > self.maxQueueLength:
+            self.maxQueueLength = len(queue)
+         
+         # Retrieve the next candidate, skipping entries superseded by a 
+         #  cheaper path, mark it was visited, increment count of tests
+         if phaseTimes is not None:
+            start = clock()
+            candidate = heapq.heappop(queue)[3]
+            phaseTimes["queue"] += clock() - start
+         else:
+            candidate = heapq.heappop(queue)[3]
+         if ranked is not None:
+            rank = ranked.rank(candidate.state)
+            if ranked.isClosed(rank):
+               continue
+            ranked.close(rank)
+            ranked.setMove(rank, candidate.move)
+         elif candidate.state in visitedBoards:
+            continue
+         else:
+            visitedBoards.add(candidate.state)
+         self.numTestDone += 1
+         if self.maxDepthSearched < candidate.depth:
+            self.maxDepthSearched = candidate.depth
+         
+         # Test if this is the goal
+         if candidate == self.goal:
+            self.maxClosedSize = len(bestG)
+            if ranked is not None:
+               candidate = ranked.rebuild(candidate)
+            return self.foundGoal(candidate)
+         
+         # Without a delta table, the children are estimated by update, or
+         #  else together
+         moves = candidate.possibleMoves
+         if hDelta is None and phaseTimes is None:
+            children = [candidate.spawnChild(moveCode) 
+                        for moveCode in MOVE_CODES if moves & moveCode]
+            if update:
+               for child in children:
+                  child.h, child.keys = update(candidate.h, candidate.keys, 
+                                               candidate.state, child.state,
+                                               child.emptyTile, 
+                                               candidate.emptyTile)
+            else:
+               estimates = evaluateStates([child.state 
+                                           for child in children])
+               for i in range(len(children)):
+                  children[i].h = int(estimates[i])
+            children = iter(children)
+         
+         # Detect duplicates among children, increment count, add only 
+         #  non-duplicates to queue
+         mask = 1
+         while mask != 16:
+            if moves & mask:
+               if phaseTimes is not None:
+                  self.timedExpansion(candidate, mask, hDelta, evaluate, 
+                                      gWeight, queue, bestG, visitedBoards, 
+                                      order + 1, ranked)
+                  order += 1
+                  mask <<= 1;
+                  continue
+               if hDelta is None:
+                  child = next(children)
+               else:
+                  child = candidate.spawnChild(mask, hDelta)
+               if ranked is not None:
+                  rank = ranked.rank(child.state)
+                  if ranked.isClosed(rank) or \
+                     ranked.depths[rank] <= child.depth or \
+                     child.depth > self.hardDepthLimit:
+                     self.numDuplicatesFound += 1
+                  else:
+                     ranked.depths[rank] = child.depth
+                     child.parent = None
+                     order += 1
+                     heapq.heappush(queue, (gWeight * child.depth + child.h, 
+                                            -gWeight * child.depth, order, 
+                                            child))
+               elif child.state in visitedBoards or \
+                  bestG.get(child.state, self.hardDepthLimit + 1) <= child.depth:
+                  self.numDuplicatesFound += 1
+               else:
+                  bestG[child.state] = child.depth
+                  order += 1
+                  heapq.heappush(queue, (gWeight * child.depth + child.h, 
+                                         -gWeight * child.depth, order, child))
+            mask <<= 1;
+      self.maxClosedSize = len(bestG)
+      return False
+   
+   # One step of bestFirstSearch, generating the child of the candidate for
+   #  the move and queueing it unless a duplicate, with each phase timed
+   def timedExpansion(self, candidate, moveCode, hDelta, evaluate, gWeight,
+                      queue, bestG, visitedBoards, order, ranked = None):
+      phaseTimes = self.phaseTimes
+      clock = timeit.default_timer
+      start = clock()
+      child = candidate.spawnChild(moveCode, hDelta)
+      now = clock()
+      phaseTimes["generate"] += now - start
+      if hDelta is None:
+         start = now
+         child.h = evaluate(child)
+         now = clock()
+         phaseTimes["heuristic"] += now - start
+      start = now
+      if ranked is not None:
+         rank = ranked.rank(child.state)
+         duplicate = ranked.isClosed(rank) or \
+            ranked.depths[rank] <= child.depth or \
+            child.depth > self.hardDepthLimit
+      else:
+         duplicate = child.state in visitedBoards or \
+            bestG.get(child.state, self.hardDepthLimit + 1) <= child.depth
+      now = clock()
+      phaseTimes["duplicates"] += now - start
+      if duplicate:
+         self.numDuplicatesFound += 1
+         return
+      start = now
+      if ranked is not None:
+         ranked.depths[rank] = child.depth
+         child.parent = None
+      else:
+         bestG[child.state] = child.depth
+      heapq.heappush(queue, (gWeight * child.depth + child.h, 
+                             -gWeight * child.depth, order, child))
+      phaseTimes["queue"] += clock() - start
+
+   # Parallel Iterative Deepening A*
+   # For every bound, the tree is searched down to self.splitDepth in this 
+   #  process (see pidaSplit), and the boards reached at that depth, under
+   #  the bound, are the roots of subtrees searched by a pool of 
+   #  self.numWorkers processes (see idaSubtree). The subtrees outnumber the
+   #  workers, and are handed out one at a time as the workers finish the 
+   #  previous ones, so that no worker is idle long in unbalanced trees. 
+   #  The subtrees are numbered in the order ida* would search them: once a
+   #  goal is found in one, the workers give up the subtrees that come after
+   #  it, and the goal of the first subtree holding one is returned, so the
+   #  path found is the one ida* would find. The next bound is the lowest f
+   #  cut off by any subtree.
+   # The limits apply to each worker as to ida*, the node limit being also 
+   #  checked against the tests of all the workers as the subtrees finish.
+   def parallelIdastar(self, heuristicFunctionFlag):
+      self.algorithm = "pida*"
+      self.heuristic = heuristicFunctionFlag
+      self.numTestDone = 0
+      self.maxQueueLength = 0
+      self.numDuplicatesFound = 0
+      self.maxDepthSearched = 0
+      self.pathLength = 0
+      self.maxRecursionDepth = 0
+      self.iterationSizes = []
+      self.workerStats = []
+      heuristic = self.getHeuristic(heuristicFunctionFlag)
+      self.root.h = heuristic.evaluate(self.root)
+      bound = self.root.h
+      
+      # Index of the first subtree known to hold a goal
+      stopIndex = multiprocessing.Value("l", 0)
+      pool = multiprocessing.Pool(max(1, self.numWorkers), initPidaWorker, 
+                                  (self, heuristic, stopIndex))
+      statsByWorker = {}
+      try:
+         while True:
+            tasks, nextBound = self.parallelIdastarSplit(heuristic, bound)
+            self.iterationSizes.append(len(tasks))
+            if len(tasks) > self.maxQueueLength:
+               self.maxQueueLength = len(tasks)
+            found = {}
+            for index, task in enumerate(tasks):
+               if task[1] == self.goal.state:
+                  found[index] = []
+                  break
+            stopIndex.value = min(found.keys() + [len(tasks)])
+            
+            results = pool.imap_unordered(
+               pidaTask, [(index, task, bound) 
+                          for index, task in enumerate(tasks) 
+                          if index < stopIndex.value])
+            while True:
+               try:
+                  result = results.next(0.05)
+               except multiprocessing.TimeoutError:
+                  self.budget.sample()
+                  if self.budgetExpired():
+                     return False
+                  continue
+               except StopIteration:
+                  break
+               index, moves, taskBound, stats, stopReason = result
+               workerStats = statsByWorker.setdefault(
+                  stats["pid"], {"numTestDone": 0, "numTasks": 0})
+               workerStats["numTestDone"] += stats["numTestDone"]
+               workerStats["numTasks"] += 1
+               self.numTestDone += stats["numTestDone"]
+               self.numDuplicatesFound += stats["numDuplicatesFound"]
+               self.maxDepthSearched = max(self.maxDepthSearched, 
+                                           stats["maxDepth"])
+               if stopReason:
+                  self.budget.stopReason = stopReason
+               if self.budgetExpired(self.numTestDone):
+                  return False
+               if moves is not None:
+                  found[index] = moves
+               if taskBound is not None and \
+                  (nextBound is None or taskBound < nextBound):
+                  nextBound = taskBound
+            
+            if found:
+               index = min(found.keys())
+               solution = self.root.copyBoard()
+               solution.depth = 0
+               for moveCode in tasks[index][0] + found[index]:
+                  solution = solution.spawnChild(moveCode)
+               self.maxRecursionDepth = self.maxDepthSearched + 1
+               return self.foundGoal(solution)
+            if nextBound is None:
+               return False
+            bound = nextBound
+      finally:
+         pool.terminate()
+         pool.join()
+         self.workerStats = [statsByWorker[pid] 
+                             for pid in sorted(statsByWorker)]
+   
+   # The boards parallelIdastar hands out as subtrees for the bound: those
+   #  reached at self.splitDepth, and any goal reached on the way there, in
+   #  the order ida* reaches them, as tuples (moves from the root, state, 
+   #  empty tile, depth, h). Returns (boards, lowest f cut off, None if 
+   #  none).
+   def parallelIdastarSplit(self, heuristic, bound):
+      geometry = self.root.geometry
+      moveTable = geometry.moveTable
+      mask = geometry.mask
+      scratch = self.root.copyBoard()
+      goalState = self.goal.state
+      tasks = []
+      cutOff = [None]
+      
+      def expand(moves, state, blank, h, keys):
+         g = len(moves)
+         if state == goalState or g == self.splitDepth:
+            tasks.append((moves, state, blank, g, h))
+            return
+         for moveCode in MOVE_CODES:
+            if not geometry.possibleMoves[blank] & moveCode:
+               continue
+            if moves and moveCode == OPPOSITE_MOVE[moves[-1]]:
+               self.numDuplicatesFound += 1
+               continue
+            q, shift, weightDelta, possibleMoves = moveTable[blank][moveCode]
+            tile = (state >> shift) & mask
+            childState = state + tile * weightDelta
+            childKeys = None
+            if heuristic.delta:
+               childH = h + heuristic.delta[tile][q][blank]
+            elif heuristic.update:
+               childH, childKeys = heuristic.update(h, keys, state, 
+                                                    childState, q, blank)
+            else:
+               scratch.state = childState
+               scratch.emptyTile = q
+               childH = heuristic.evaluate(scratch)
+            f = g + 1 + childH
+            if f > bound:
+               if cutOff[0] is None or f < cutOff[0]:
+                  cutOff[0] = f
+               continue
+            self.numTestDone += 1
+            if self.maxDepthSearched < g + 1:
+               self.maxDepthSearched = g + 1
+            expand(moves + [moveCode], childState, q, childH, childKeys)
+      
+      expand([], self.root.state, self.root.emptyTile, self.root.h, 
+             heuristic.keys(self.root.state))
+      return tasks, cutOff[0]
+   
+   # Depth first search of the subtree of parallelIdastar under the board 
+   #  given as (moves from the root, state, empty tile, depth, h), cutting 
+   #  off the boards with f above the bound, made and unmade in place as by
+   #  idastar. Gives up once shouldStop(no. of tests done) returns True, 
+   #  asked every self.budget.checkInterval tests. Returns (moves from the 
+   #  subtree root to the goal, None if not found, lowest f cut off, None if
+   #  none, stats).
+   def idaSubtree(self, task, bound, heuristic, shouldStop):
+      moves, state, blank, g, h = task
+      hDelta = heuristic.delta
+      update = heuristic.update
+      scratch = self.root.copyBoard()
+      geometry = self.root.geometry
+      moveTable = geometry.moveTable
+      mask = geometry.mask
+      goalState = self.goal.state
+      stats = {"numTestDone": 0, "numDuplicatesFound": 0, "maxDepth": g}
+      
+      nextBound = None
+      lastMove = moves[-1] if moves else None
+      path = []
+      hs = [h]
+      ks = [heuristic.keys(state)]
+      untried = [geometry.possibleMoves[blank]]
+      countdown = self.budget.checkInterval
+      while untried:
+         countdown -= 1
+         if not countdown:
+            countdown = self.budget.checkInterval
+            if shouldStop(stats["numTestDone"]):
+               return None, None, stats
+         
+         remaining = untried[-1]
+         if not remaining:
+            untried.pop()
+            hs.pop()
+            if update:
+               ks.pop()
+            if not path:
+               break
+            moveCode = OPPOSITE_MOVE[path.pop()]
+            q, shift, weightDelta, possibleMoves = moveTable[blank][moveCode]
+            state += ((state >> shift) & mask) * weightDelta
+            blank = q
+            g -= 1
+            continue
+         
+         moveCode = remaining & -remaining
+         untried[-1] = remaining & ~moveCode
+         if path:
+            previousMove = path[-1]
+         else:
+            previousMove = lastMove
+         if previousMove is not None and \
+            moveCode == OPPOSITE_MOVE[previousMove]:
+            stats["numDuplicatesFound"] += 1
+            continue
+         
+         q, shift, weightDelta, possibleMoves = moveTable[blank][moveCode]
+         tile = (state >> shift) & mask
+         childState = state + tile * weightDelta
+         if hDelta:
+            childH = hs[-1] + hDelta[tile][q][blank]
+         elif update:
+            childH, childKeys = update(hs[-1], ks[-1], state, childState, q, 
+                                       blank)
+         else:
+            scratch.state = childState
+            scratch.emptyTile = q
+            childH = heuristic.evaluate(scratch)
+         f = g + 1 + childH
+         if f > bound:
+            if nextBound is None or f < nextBound:
+               nextBound = f
+            continue
+         
+         state = childState
+         blank = q
+         g += 1
+         path.append(moveCode)
+         hs.append(childH)
+         if update:
+            ks.append(childKeys)
+         untried.append(possibleMoves)
+         stats["numTestDone"] += 1
+         if stats["maxDepth"] < g:
+            stats["maxDepth"] = g
+         if state == goalState:
+            return path, nextBound, stats
+      return None, nextBound, stats
+
+   # Hash Distributed A*
+   # The states are split between self.numWorkers worker processes by a 
+   #  hash of the packed state (see hdaOwner). Every worker runs a* over the
+   #  states it owns, with its own open and closed lists, and sends the 
+   #  children it generates for other workers to their owners, in one batch
+   #  per owner after every self.hdaBatchSize expansions. As the states are 
+   #  not expanded in the order of a single a*, a state reached again with 
+   #  a smaller depth is reopened. Once a goal is found its depth bounds the
+   #  search, and the bound is sent to every worker, which then expand only
+   #  the boards with f below it. This process coordinates: it stops the 
+   #  workers once, twice in a row, all are idle and as many states were 
+   #  received as were sent, so no state is left to expand under the bound 
+   #  and the path found is optimal. The path is then rebuilt by asking the
+   #  owner of each board for its parent.
+   # The time and memory limits apply to each worker, the node limit to the
+   #  tests of all the workers.
+   def hdastar(self, heuristicFunctionFlag):
+      self.algorithm = "hda*"
+      self.heuristic = heuristicFunctionFlag
+      self.numTestDone = 0
+      self.maxQueueLength = 0
+      self.numDuplicatesFound = 0
+      self.maxDepthSearched = 0
+      self.pathLength = 0
+      self.workerStats = []
+      heuristic = self.getHeuristic(heuristicFunctionFlag)
+      self.root.h = heuristic.evaluate(self.root)
+      
+      numWorkers = max(1, self.numWorkers)
+      inboxes = [multiprocessing.Queue() for index in range(numWorkers)]
+      results = multiprocessing.Queue()
+      workers = [multiprocessing.Process(target = self.hdaWorker, 
+                                         args = (index, inboxes, results, 
+                                                 heuristic))
+                 for index in range(numWorkers)]
+      for worker in workers:
+         worker.daemon = True
+         worker.start()
+      
+      bound = None
+      finished = False
+      probeRound = 0
+      probing = False
+      replies = {}
+      lastCounts = None
+      numTestDone = [0] * numWorkers
+      terminated = False            # Whether the workers were terminated, 
+                                    #  without their stats
+      try:
+         while not finished:
+            self.budget.sample()
+            if self.budgetExpired(sum(numTestDone)):
+               break
+            try:
+               message = results.get(timeout = 0.01)
+            except Queue.Empty:
+               message = None
+            if message is None:
+               # Ask the workers for their state
+               if not probing:
+                  probeRound += 1
+                  probing = True
+                  replies = {}
+                  for inbox in inboxes:
+                     inbox.put(("probe", probeRound))
+            elif message[0] == "solution":
+               if bound is None or message[1] < bound:
+                  bound = message[1]
+                  for inbox in inboxes:
+                     inbox.put(("bound", bound))
+            elif message[0] == "stopped":
+               self.budget.stopReason = message[2]
+               self.budgetExpired()
+               break
+            elif message[0] == "status" and message[2] == probeRound:
+               index, probe, numSent, numReceived, idle, tests = message[1:]
+               numTestDone[index] = tests
+               replies[index] = (numSent, numReceived, idle)
+               if len(replies) == numWorkers:
+                  probing = False
+                  counts = (sum([reply[0] for reply in replies.values()]),
+                            sum([reply[1] for reply in replies.values()]))
+                  if all([reply[2] for reply in replies.values()]) and \
+                     counts[0] == counts[1]:
+                     finished = counts == lastCounts
+                     lastCounts = counts
+                  else:
+                     lastCounts = None
+         
+         if finished and bound is not None:
+            # Rebuild the path backwards from the goal
+            moveCodes = []
+            state = self.goal.state
+            while True:
+               inboxes[EightPuzzle.hdaOwner(state, numWorkers)].put(
+                  ("parent", state))
+               parent = self.hdaParent(state, results, workers, 
+                                       sum(numTestDone))
+               if parent is None:
+                  # The budget ran out first
+                  finished = False
+                  terminated = True
+                  for worker in workers:
+                     worker.terminate()
+                  break
+               g, state, moveCode = parent
+               if state is None:
+                  break
+               moveCodes.append(moveCode)
+            moveCodes.reverse()
+            board = self.root
+            for moveCode in moveCodes:
+               board = board.spawnChild(moveCode)
+      finally:
+         for inbox in inboxes:
+            inbox.put(("stop",))
+         statsByWorker = {}
+         deadline = time.time() + 5
+         while len(statsByWorker) < numWorkers and time.time() < deadline \
+               and not terminated:
+            try:
+               message = results.get(timeout = 0.1)
+            except Queue.Empty:
+               continue
+            if message[0] == "stats":
+               statsByWorker[message[1]] = message[2]
+         for worker in workers:
+            worker.join(1)
+            if worker.is_alive():
+               worker.terminate()
+      
+      self.workerStats = [statsByWorker.get(worker, {}) 
+                          for worker in range(numWorkers)]
+      for stats in self.workerStats:
+         self.numTestDone += stats.get("numTestDone", 0)
+         self.numDuplicatesFound += stats.get("numDuplicatesFound", 0)
+         self.maxQueueLength = max(self.maxQueueLength, 
+                                   stats.get("maxQueueLength", 0))
+         self.maxDepthSearched = max(self.maxDepthSearched, 
+                                     stats.get("maxDepthSearched", 0))
+      if finished and bound is not None:
+         return self.foundGoal(board)
+      return False
+   
+   # Wait for the reply of the worker of hdastar owning the state to the 
+   #  "parent" message about it, and return its (depth, parent state, move 
+   #  code). The results are polled with a timeout no longer than the time 
+   #  left in the budget, so that a worker that never replies does not hold
+   #  the search past it. Returns None once the budget is used up, and 
+   #  raises RuntimeError if a worker has died.
+   def hdaParent(self, state, results, workers, numTestDone):
+      while True:
+         self.budget.sample()
+         if self.budgetExpired(numTestDone):
+            return None
+         if not all([worker.is_alive() for worker in workers]):
+            raise RuntimeError("A worker process of hda* died")
+         timeout = 0.1
+         timeLeft = self.budget.timeLeft()
+         if timeLeft is not None:
+            timeout = max(0.001, min(timeout, timeLeft))
+         try:
+            message = results.get(timeout = timeout)
+         except Queue.Empty:
+            continue
+         if message[0] == "parent" and message[1] == state:
+            return message[2]
+   
+   # Worker process of hdastar, the index-th of len(inboxes). Receives the 
+   #  states it owns and the messages of the coordinator in its inbox, and
+   #  sends its replies to results.
+   def hdaWorker(self, index, inboxes, results, heuristic):
+      numWorkers = len(inboxes)
+      inbox = inboxes[index]
+      geometry = self.root.geometry
+      moveTable = geometry.moveTable
+      mask = geometry.mask
+      hDelta = heuristic.delta
+      update = heuristic.update
+      scratch = self.root.copyBoard()
+      goalState = self.goal.state
+      owner = EightPuzzle.hdaOwner
+      budget = Budget(self.budget.timeLimit, None, None, 
+                      self.budget.memoryLimit, self.budget.checkInterval)
+      # Only the boards with f below the bound are expanded
+      bound = self.hardDepthLimit + 1
+      stats = {"numTestDone": 0, "numDuplicatesFound": 0, "numSent": 0,
+               "numReceived": 0, "numBatchesSent": 0, "maxQueueLength": 0,
+               "maxDepthSearched": 0}
+      # Boards are (state, blank, g, h, parent state, move code, keys of the 
+      #  heuristic)
+      queue = []
+      bestG = {}
+      # Depth, parent state and move code of the states expanded
+      closed = {}
+      outgoing = [[] for k in range(numWorkers)]
+      order = 0
+      received = []
+      if owner(self.root.state, numWorkers) == index:
+         received.append((self.root.state, self.root.emptyTile, 0, 
+                          self.root.h, None, -1, 
+                          heuristic.keys(self.root.state)))
+      
+      while True:
+         # Queue the boards received, unless duplicates
+         for node in received:
+            state, blank, g, h = node[:4]
+            if g + h >= bound or closed.get(state, (bound,))[0] <= g or \
+               bestG.get(state, bound) <= g:
+               stats["numDuplicatesFound"] += 1
+            else:
+               bestG[state] = g
+               order += 1
+               heapq.heappush(queue, (g + h, -g, order, node))
+         received = []
+         if len(queue) > stats["maxQueueLength"]:
+            stats["maxQueueLength"] = len(queue)
+         
+         # Handle the messages waiting, or wait for one if there is no board
+         #  to expand
+         working = queue and queue[0][0] < bound
+         try:
+            if working:
+               message = inbox.get_nowait()
+            else:
+               message = inbox.get()
+         except Queue.Empty:
+            message = None
+         if message is None:
+            pass
+         elif message[0] == "states":
+            received = message[1]
+            stats["numReceived"] += len(received)
+            continue
+         elif message[0] == "bound":
+            bound = min(bound, message[1])
+            continue
+         elif message[0] == "probe":
+            results.put(("status", index, message[1], stats["numSent"], 
+                         stats["numReceived"], not working, 
+                         stats["numTestDone"]))
+            continue
+         elif message[0] == "parent":
+            results.put(("parent", message[1], closed[message[1]]))
+            continue
+         elif message[0] == "stop":
+            results.put(("stats", index, stats))
+            # The boards not yet delivered are no longer needed
+            for other in inboxes:
+               other.cancel_join_thread()
+            return
+         
+         # Expand a batch of boards
+         for k in range(self.hdaBatchSize):
+            if not queue or queue[0][0] >= bound:
+               break
+            node = heapq.heappop(queue)[3]
+            state, blank, g, h = node[:4]
+            if closed.get(state, (bound,))[0] <= g:
+               continue
+            closed[state] = (g, node[4], node[5])
+            stats["numTestDone"] += 1
+            if g > stats["maxDepthSearched"]:
+               stats["maxDepthSearched"] = g
+            if budget.expired(stats["numTestDone"]):
+               results.put(("stopped", index, budget.stopReason))
+               bound = 0
+               break
+            if state == goalState:
+               bound = g
+               results.put(("solution", g))
+               continue
+            
+            moves = geometry.possibleMoves[blank]
+            if node[5] in OPPOSITE_MOVE:
+               moves &= ~OPPOSITE_MOVE[node[5]]
+            for moveCode in MOVE_CODES:
+               if moves & moveCode:
+                  q, shift, weightDelta, possibleMoves = \
+                     moveTable[blank][moveCode]
+                  tile = (state >> shift) & mask
+                  childState = state + tile * weightDelta
+                  childKeys = None
+                  if hDelta:
+                     childH = h + hDelta[tile][q][blank]
+                  elif update:
+                     childH, childKeys = update(h, node[6], state, childState,
+                                                q, blank)
+                  else:
+                     scratch.state = childState
+                     scratch.emptyTile = q
+                     scratch.possibleMoves = possibleMoves
+                     childH = heuristic.evaluate(scratch)
+                  child = (childState, q, g + 1, childH, state, moveCode, 
+                           childKeys)
+                  childOwner = owner(childState, numWorkers)
+                  if childOwner == index:
+                     received.append(child)
+                  else:
+                     outgoing[childOwner].append(child)
+         
+         # Send the children to their owners
+         for childOwner in range(numWorkers):
+            if outgoing[childOwner]:
+               inboxes[childOwner].put(("states", outgoing[childOwner]))
+               stats["numSent"] += len(outgoing[childOwner])
+               stats["numBatchesSent"] += 1
+               outgoing[childOwner] = []
+   
+   # Owner of the state among numWorkers workers of hdastar, by a 
+   #  multiplicative hash, as the low bits of the packed state only depend
+   #  on the tile of the first cell
+   @staticmethod
+   def hdaOwner(state, numWorkers):
+      return (((state * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> 32) % \
+             numWorkers
+
+   # Iterative Deepening A*
+   # Keeps a single configuration, packed as in Board, and makes and unmakes
+   #  the moves in place, with an explicit stack of the moves made and of 
+   #  the moves left to try at each depth. Memory is proportional to the 
+   #  depth of the solution and no board is allocated during the search.
+   #  Cycles are pruned by never undoing the previous move, and 
+   #  transpositions by the transposition table, if any.
+   def idastar(self, heuristicFunctionFlag):
+      self.algorithm = "ida*"
+      self.heuristic = heuristicFunctionFlag
+      self.numTestDone = 0
+      self.maxQueueLength = 0
+      self.numDuplicatesFound = 0
+      self.maxDepthSearched = 0
+      self.pathLength = 0
+      self.maxRecursionDepth = 0
+      
+      heuristic = self.getHeuristic(heuristicFunctionFlag)
+      hDelta = heuristic.delta
+      update = heuristic.update
+      # Heuristics without a delta table nor update are evaluated on a 
+      #  scratch board
+      scratch = self.root.copyBoard()
+      geometry = self.root.geometry
+      moveTable = geometry.moveTable
+      mask = geometry.mask
+      goalState = self.goal.state
+      table = self.transpositionTable
+      
+      state = self.root.state
+      blank = self.root.emptyTile
+      rootH = heuristic.evaluate(self.root)
+      rootKeys = heuristic.keys(state)
+      bound = rootH
+      if state == goalState:
+         return self.foundGoal(self.root.copyBoard())
+      
+      while True:
+         nextBound = None
+         path = []                        # Move made at each depth
+         hs = [rootH]                     # Estimate at each depth
+         ks = [rootKeys]                  # Keys of the heuristic at each 
+                                          #  depth, if it has update
+         untried = [self.root.possibleMoves]
+                                          # Moves left to try at each depth
+         g = 0
+         if table is not None:
+            table.probe(state, 0, bound)
+         while untried:
+            if self.budgetExpired():
+               return False
+            
+            remaining = untried[-1]
+            if not remaining:
+               # Every move has been tried, unmake the move that led here
+               untried.pop()
+               hs.pop()
+               if update:
+                  ks.pop()
+               if not path:
+                  break
+               moveCode = OPPOSITE_MOVE[path.pop()]
+               q, shift, weightDelta, possibleMoves = moveTable[blank][moveCode]
+               state += ((state >> shift) & mask) * weightDelta
+               blank = q
+               g -= 1
+               continue
+            
+            moveCode = remaining & -remaining
+            untried[-1] = remaining & ~moveCode
+            if path and moveCode == OPPOSITE_MOVE[path[-1]]:
+               self.numDuplicatesFound += 1
+               continue
+            
+            q, shift, weightDelta, possibleMoves = moveTable[blank][moveCode]
+            tile = (state >> shift) & mask
+            childState = state + tile * weightDelta
+            if hDelta:
+               h = hs[-1] + hDelta[tile][q][blank]
+            elif update:
+               h, childKeys = update(hs[-1], ks[-1], state, childState, q, 
+                                     blank)
+            else:
+               scratch.state = childState
+               scratch.emptyTile = q
+               h = heuristic.evaluate(scratch)
+            f = g + 1 + h
+            if f > bound:
+               if nextBound is None or f < nextBound:
+                  nextBound = f
+               continue
+            if table is not None and table.probe(childState, g + 1, bound):
+               self.numDuplicatesFound += 1
+               continue
+            
+            # Make the move
+            state = childState
+            blank = q
+            g += 1
+            path.append(moveCode)
+            hs.append(h)
+            if update:
+               ks.append(childKeys)
+            untried.append(possibleMoves)
+            self.numTestDone += 1
+            if self.maxDepthSearched < g:
+               self.maxDepthSearched = g
+               self.maxRecursionDepth = g + 1
+            
+            if state == goalState:
+               solution = self.root.copyBoard()
+               solution.depth = 0
+               for moveCode in path:
+                  solution = solution.spawnChild(moveCode)
+               return self.foundGoal(solution)
+         
+         if nextBound is None:
+            return False
+         bound = nextBound
+
+   # Look the solution up in the distance oracle (boards of up to 3x3)
+   def oracle(self):
+      self.algorithm = "oracle"
+      self.numTestDone = 0
+      self.maxQueueLength = 0
+      self.numDuplicatesFound = 0
+      self.maxDepthSearched = 0
+      self.pathLength = 0
+      
+      distanceOracle = DistanceOracle(self.goal, self.oracleFile)
+      solution, self.numTestDone = distanceOracle.solve(self.root)
+      if not solution:
+         return False
+      self.maxDepthSearched = solution.depth
+      return self.foundGoal(solution)
+
+   # Join a board reached from the root with the board of the same 
+   #  configuration reached from the goal, by replaying the moves of the 
+   #  backward path in reverse. Returns the goal board, whose path leads back
+   #  to the root.
+   def joinPaths(self, forwardBoard, backwardBoard):
+      board = forwardBoard
+      while backwardBoard.parent:
+         board = board.spawnChild(OPPOSITE_MOVE[backwardBoard.move])
+         backwardBoard = backwardBoard.parent
+      return board
+
+   # Reset the stats kept separately for each direction of a bidirectional
+   #  search
+   def resetDirectionStats(self):
+      self.directionStats = {}
+      for direction in ["forward", "backward"]:
+         self.directionStats[direction] = {"numTestDone": 0, 
+                                           "maxQueueLength": 0,
+                                           "numDuplicatesFound": 0, 
+                                           "maxDepthSearched": 0}
+
+   # Bidirectional Breadth First Search
+   # Searches layer by layer from the root and from the goal, always 
+   #  expanding the smaller frontier. Once a layer produces a board already
+   #  seen from the other side, the rest of the layer is still expanded and 
+   #  the shortest of the joined paths is kept, which makes it optimal.
+   def bidirectionalBfs(self):
+      self.algorithm = "bibfs"
+      self.numTestDone = 0
+      self.maxQueueLength = 0
+      self.numDuplicatesFound = 0
+      self.maxDepthSearched = 0
+      self.pathLength = 0
+      self.resetDirectionStats()
+      
+      # Boards seen and current frontier of each direction, by state
+      seen = {"forward": {self.root.state: self.root}, 
+              "backward": {self.goal.state: self.goal}}
+      frontier = {"forward": [self.root], "backward": [self.goal]}
+      other = {"forward": "backward", "backward": "forward"}
+      meeting = None
+      if self.root == self.goal:
+         meeting = (self.root, self.goal)
+      
+      while not meeting and frontier["forward"] and frontier["backward"]:
+         if self.budgetExpired(numTestDone = 
+                               self.directionStats["forward"]["numTestDone"] + 
+                               self.directionStats["backward"]["numTestDone"]):
+            self.sumDirectionStats()
+            return False
+         
+         if len(frontier["forward"]) <= len(frontier["backward"]):
+            direction = "forward"
+         else:
+            direction = "backward"
+         stats = self.directionStats[direction]
+         stats["maxQueueLength"] = max(stats["maxQueueLength"], 
+                                       len(frontier[direction]))
+         mySeen = seen[direction]
+         otherSeen = seen[other[direction]]
+         nextLayer = []
+         best = None
+         for candidate in frontier[direction]:
+            stats["numTestDone"] += 1
+            moves = candidate.possibleMoves
+            mask = 1
+            while mask != 16:
+               if moves & mask:
+                  child = candidate.spawnChild(mask)
+                  if child.state in mySeen:
+                     stats["numDuplicatesFound"] += 1
+                  else:
+                     mySeen[child.state] = child
+                     nextLayer.append(child)
+                     if child.state in otherSeen:
+                        length = child.depth + otherSeen[child.state].depth
+                        if best is None or length < best[0]:
+                           best = (length, child, otherSeen[child.state])
+               mask <<= 1;
+         if nextLayer:
+            stats["maxDepthSearched"] = nextLayer[0].depth
+         frontier[direction] = nextLayer
+         if best:
+            if direction == "forward":
+               meeting = (best[1], best[2])
+            else:
+               meeting = (best[2], best[1])
+      
+      self.sumDirectionStats()
+      if not meeting:
+         return False
+      solution = self.joinPaths(meeting[0], meeting[1])
+      return self.foundGoal(solution)
+
+   # Add up the stats of both directions into the overall stats
+   def sumDirectionStats(self):
+      for stats in self.directionStats.values():
+         self.numTestDone += stats["numTestDone"]
+         self.maxQueueLength += stats["maxQueueLength"]
+         self.numDuplicatesFound += stats["numDuplicatesFound"]
+      self.maxDepthSearched = self.directionStats["forward"]["maxDepthSearched"] + \
+                              self.directionStats["backward"]["maxDepthSearched"]
+
+   # Bidirectional heuristic search (MM, Holte et al. 2016)
+   # Each direction keeps an open list ordered by the priority 
+   #  max(g + h, 2g + 1), with h estimating the distance to the goal going 
+   #  forward and to the root going backward, so the two searches meet in 
+   #  the middle. U is the length of the best path found through a board 
+   #  seen from both sides; the search stops as soon as U is no more than
+   #  the lower bound max(C, fminF, fminB, gminF + gminB + 1), where C is the
+   #  smallest priority on either open list, which proves U optimal.
+   def mm(self, heuristicFunctionFlag):
+      self.algorithm = "mm"
+      self.heuristic = heuristicFunctionFlag
+      self.numTestDone = 0
+      self.maxQueueLength = 0
+      self.numDuplicatesFound = 0
+      self.maxDepthSearched = 0
+      self.pathLength = 0
+      self.resetDirectionStats()
+      
+      forwardHeuristic = self.getHeuristic(heuristicFunctionFlag)
+      if forwardHeuristic.delta is None:
+         raise ValueError("The " + forwardHeuristic.name + " heuristic can "
+                          "not be used for a bidirectional search")
+      backwardHeuristic = forwardHeuristic.__class__(self.root)
+      heuristics = {"forward": forwardHeuristic, "backward": backwardHeuristic}
+      other = {"forward": "backward", "backward": "forward"}
+      
+      # For each direction the open and closed boards, by state, and three 
+      #  heaps over the open boards, keyed by priority, f and g. Heap entries
+      #  are dropped lazily once their board has left the open list.
+      openBoards = {}
+      closedBoards = {}
+      heaps = {}
+      order = 0
+      for direction, start in [("forward", self.root), 
+                               ("backward", self.goal)]:
+         start = start.copyBoard()
+         start.depth = 0
+         start.h = heuristics[direction].evaluate(start)
+         openBoards[direction] = {start.state: start}
+         closedBoards[direction] = {}
+         heaps[direction] = []
+         for key in [max(start.h, 1), start.h, 0]:
+            heaps[direction].append([(key, order, start)])
+      
+      # Smallest key of a heap, after dropping the stale entries
+      def minimum(direction, i):
+         heap = heaps[direction][i]
+         while heap and openBoards[direction].get(heap[0][2].state) is not heap[0][2]:
+            heapq.heappop(heap)
+         if heap:
+            return heap[0][0]
+         return None
+      
+      bestLength = None
+      meeting = None
+      if self.root == self.goal:
+         bestLength = 0
+         meeting = (self.root, self.goal)
+      
+      while openBoards["forward"] and openBoards["backward"]:
+         if self.budgetExpired(numTestDone = 
+                               self.directionStats["forward"]["numTestDone"] + 
+                               self.directionStats["backward"]["numTestDone"]):
+            self.sumDirectionStats()
+            return False
+         
+         priorityF = minimum("forward", 0)
+         priorityB = minimum("backward", 0)
+         if bestLength is not None:
+            bound = max(min(priorityF, priorityB), 
+                        minimum("forward", 1), minimum("backward", 1), 
+                        minimum("forward", 2) + minimum("backward", 2) + 1)
+            if bestLength <= bound:
+               break
+         
+         if priorityF <= priorityB:
+            direction = "forward"
+         else:
+            direction = "backward"
+         stats = self.directionStats[direction]
+         myOpen = openBoards[direction]
+         myClosed = closedBoards[direction]
+         otherOpen = openBoards[other[direction]]
+         otherClosed = closedBoards[other[direction]]
+         hDelta = heuristics[direction].delta
+         stats["maxQueueLength"] = max(stats["maxQueueLength"], len(myOpen))
+         
+         candidate = heapq.heappop(heaps[direction][0])[2]
+         del myOpen[candidate.state]
+         myClosed[candidate.state] = candidate
+         stats["numTestDone"] += 1
+         if stats["maxDepthSearched"] < candidate.depth:
+            stats["maxDepthSearched"] = candidate.depth
+         
+         moves = candidate.possibleMoves
+         mask = 1
+         while mask != 16:
+            if moves & mask:
+               child = candidate.spawnChild(mask, hDelta)
+               previous = myOpen.get(child.state) or myClosed.get(child.state)
+               if previous and previous.depth <= child.depth:
+                  stats["numDuplicatesFound"] += 1
+               else:
+                  if previous:
+                     myClosed.pop(child.state, None)
+                  myOpen[child.state] = child
+                  order += 1
+                  f = child.depth + child.h
+                  for i, key in enumerate([max(f, 2 * child.depth + 1), f, 
+                                           child.depth]):
+                     heapq.heappush(heaps[direction][i], (key, order, child))
+                  match = otherOpen.get(child.state) or \
+                          otherClosed.get(child.state)
+                  if match and (bestLength is None or 
+                                child.depth + match.depth < bestLength):
+                     bestLength = child.depth + match.depth
+                     if direction == "forward":
+                        meeting = (child, match)
+                     else:
+                        meeting = (match, child)
+            mask <<= 1;
+      
+      self.sumDirectionStats()
+      if not meeting:
+         return False
+      solution = self.joinPaths(meeting[0], meeting[1])
+      return self.foundGoal(solution)
+
+# Context of a worker process of parallelIdastar, set by initPidaWorker
+pidaContext = {}
+
+# Set up a worker process of parallelIdastar, forked from the process 
+#  searching the puzzle. Every worker gets a budget of its own.
+def initPidaWorker(puzzle, heuristic, stopIndex):
+   sys.stdout = open(os.devnull, "w")
+   budget = puzzle.budget
+   pidaContext.update({"puzzle": puzzle, "heuristic": heuristic, 
+                       "stopIndex": stopIndex, "numTestDone": 0,
+                       "budget": Budget(budget.timeLimit, None, 
+                                        budget.nodeLimit, budget.memoryLimit,
+                                        1)})
+
+# Search one subtree of parallelIdastar, given as (index, board, bound), in
+#  a worker process. Returns (index, moves to the goal or None, lowest f 
+#  cut off, stats, why the worker's budget expired or None).
+def pidaTask(arguments):
+   index, task, bound = arguments
+   puzzle = pidaContext["puzzle"]
+   stopIndex = pidaContext["stopIndex"]
+   budget = pidaContext["budget"]
+   # Stop once a goal is found in a subtree searched before this one
+   def shouldStop(numTestDone):
+      return stopIndex.value < index or \
+             budget.expired(pidaContext["numTestDone"] + numTestDone)
+   moves, nextBound, stats = puzzle.idaSubtree(task, bound, 
+                                               pidaContext["heuristic"], 
+                                               shouldStop)
+   pidaContext["numTestDone"] += stats["numTestDone"]
+   if moves is not None:
+      with stopIndex.get_lock():
+         if index < stopIndex.value:
+            stopIndex.value = index
+   stats["pid"] = os.getpid()
+   return index, moves, nextBound, stats, budget.stopReason
+
+# Class to time each search operation
+class Timer:
+   """Class to time function calls - Counts the CPU time used"""
+   # Start the timer
+   def __init__(self, string, limit = 100, numBars = 100):
+      self.string = string
+      self.beginning = time.clock()
+      self.time  = 0.0
+      self.numBars = numBars
+      self.oneBar = 0
+      self.numBarsWritten = 0
+      self.limit = limit
+      self.progress = 0
+      if self.numBars:
+         #print self.string
+         self.oneBar = int(math.ceil(limit/numBars))
+         sys.stdout.write("[%s]" % (" " * numBars))
+         sys.stdout.flush()
+         sys.stdout.write("\b" * (numBars + 1))
+   
+   def start(self, string, limit = 100, numBars = 100):
+      self.__init__(string, limit, numBars)
+      
+   def getTime(self):
+      if self.beginning:
+         return time.clock() - self.beginning + self.time
+      else:
+         return self.time
+
+   def stop(self):
+      """"Print the CPU secs used"""
+      #if self.progress <= self.limit:
+      #   sys.stdout.write('\x1b[2K')
+      #   sys.stdout.write("\b" * (self.numBarsWritten + 2))
+      #   self.progress = self.limit
+      if self.beginning:
+         timetaken = time.clock() - self.beginning + self.time
+      else:
+         timetaken = self.time
+      #print "\033[92mTime taken for (%s) = %f\033[0m" % (self.string, time)
+      self.string = None
+      self.beginning = None
+      self.time = None
+      self.limit = 0
+      self.progress = 0
+      self.numBars = 0
+      self.oneBar = 0
+      return timetaken
+      
+   def tick(self):
+      if self.beginning and self.progress < self.limit:
+         self.progress += 1
+         if self.oneBar and self.progress % self.oneBar == 0:
+            if self.numBarsWritten < self.numBars:
+               if (self.numBarsWritten + 1) % 10 == 0:
+                  sys.stdout.write("|")
+               else:
+                  sys.stdout.write("-")
+               sys.stdout.flush()
+               self.numBarsWritten += 1
+            else:
+               self.progress = self.limit
+               self.numBarsWritten = self.numBars
+         #if self.progress == self.limit:
+         #   sys.stdout.write('\x1b[2K')
+         #   sys.stdout.write("\b" * (self.numBars + 2))
+   
+   def pause(self):
+      if self.beginning:
+         self.time += time.clock() - self.beginning
+         self.beginning = None
+   def unpause(self):
+      if not self.beginning:
+         self.beginning = time.clock()
+
+# Result of a call to solve
+class SolveResult(object):
+   def __init__(self, puzzle, algorithm, heuristic, wallTime):
+      self.algorithm = algorithm           # Algorithm used
+      self.heuristic = heuristic           # Name of the heuristic used, None
+                                           #  for the uninformed searches
+      self.root = puzzle.root.getModel()   # Root and goal boards, as lists 
+      self.goal = puzzle.goal.getModel()   #  of tiles
+      self.goalFound = puzzle.goalFounded  # Whether a path was found
+      self.solution = puzzle.solution      # Goal board found, its parents 
+                                           #  lead back to the root
+      self.moves = None                    # Names of the moves of the empty
+                                           #  tile from the root to the goal
+      self.pathLength = -1                 # No. of moves, -1 if not found
+      if self.solution:
+         self.moves = self.solution.getMoves()
+         self.pathLength = len(self.moves)
+      self.numTestDone = puzzle.numTestDone
+                                           # No. of boards expanded
+      self.numDuplicatesFound = puzzle.numDuplicatesFound
+      self.maxQueueLength = puzzle.maxQueueLength
+                                           # Peak size of the frontier
+      self.maxDepthSearched = puzzle.maxDepthSearched
+      self.timeTaken = puzzle.timeTaken    # CPU time, in secs
+      self.wallTime = wallTime             # Elapsed time, in secs
+      self.stopReason = puzzle.stopReason  # Why the budget stopped the 
+                                           #  search (see Budget.messages), 
+                                           #  None if it did not
+      self.puzzle = puzzle                 # The search itself, for the stats
+                                           #  specific to an algorithm
+      self.stats = puzzle.getStats()       # Stats of the search, see 
+                                           #  EightPuzzle.getStats
+      self.cached = False                  # Whether the path came from the
+                                           #  solution cache, unsearched
+
+   # Express the result, found for the canonical problem, in terms of the 
+   #  original root board and goal (see canonicalize)
+   def mapBack(self, root, goalModel, moveMap):
+      self.root = root.getModel()
+      self.goal = list(goalModel)
+      if self.solution:
+         board = root.copyBoard()
+         board.depth = 0
+         for moveCode in self.solution.getMoveCodes():
+            board = board.spawnChild(moveMap[moveCode])
+         self.solution = board
+         self.moves = board.getMoves()
+
+   # Return the result as a dictionary that can be written as JSON
+   def toDict(self):
+      return {"algorithm": self.algorithm, "heuristic": self.heuristic,
+              "root": self.root, "goal": self.goal, 
+              "goalFound": self.goalFound, "moves": self.moves, 
+              "pathLength": self.pathLength, 
+              "numTestDone": self.numTestDone,
+              "numDuplicatesFound": self.numDuplicatesFound,
+              "maxQueueLength": self.maxQueueLength,
+              "maxDepthSearched": self.maxDepthSearched,
+              "timeTaken": self.timeTaken, "wallTime": self.wallTime,
+              "stopReason": self.stopReason, "stats": self.stats,
+              "cached": self.cached}
+
+# Call function with the arguments under cProfile and return its result
+# The profile is written to fileName, to be read by pstats, or the functions
+#  that took the most time are printed if fileName is "-".
+def profileCall(fileName, function, *arguments):
+   profiler = cProfile.Profile()
+   try:
+      return profiler.runcall(function, *arguments)
+   finally:
+      if fileName == "-":
+         pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+      else:
+         profiler.dump_stats(fileName)
+
+# Canonical goal of the boards of the geometry with the empty tile at the 
+#  given cell: the tiles 1 .. numCells - 1 in order, around the empty cell
+def canonicalGoalModel(geometry, blank):
+   model = range(1, geometry.numCells)
+   model.insert(blank, 0)
+   return model
+
+# Map the problem of going from rootModel to goalModel onto an equivalent one
+#  whose goal is canonical, so that the tables and caches built for the few
+#  canonical goals serve every goal.
+# The boards are first turned by the symmetry of the square taking the empty
+#  tile of the goal to the highest cell it can reach, which leaves one 
+#  canonical goal per class of cells (corner, edge and centre for the 3x3 
+#  board), then the tiles are renamed after their cells in the canonical 
+#  goal. The renaming does not change the moves of the empty tile, so a 
+#  path of the canonical problem maps back to one of the same length.
+# Returns (canonicalRootModel, canonicalGoalModel, moveMap), moveMap being 
+#  the move of the original problem for each move of the canonical one.
+def canonicalize(rootModel, goalModel):
+   geometry = BoardGeometry.forCells(len(goalModel))
+   blank = goalModel.index(0)
+   cellMap, moveMap = max(geometry.symmetries, 
+                          key = lambda symmetry: symmetry[0][blank])
+   turnedRoot = [0] * geometry.numCells
+   turnedGoal = [0] * geometry.numCells
+   for p in range(geometry.numCells):
+      turnedRoot[cellMap[p]] = rootModel[p]
+      turnedGoal[cellMap[p]] = goalModel[p]
+   goal = canonicalGoalModel(geometry, cellMap[blank])
+   label = [0] * geometry.numCells
+   for k in range(geometry.numCells):
+      label[turnedGoal[k]] = goal[k]
+   root = [label[tile] for tile in turnedRoot]
+   backMap = [0] * 9
+   for moveCode in MOVE_CODES:
+      backMap[moveMap[moveCode]] = moveCode
+   return root, goal, backMap
+
+# Parse a board given either as a Board, a list of tiles or a string of tiles
+#  separated by spaces, and return it as a list of tiles
+def parseModel(model):
+   if isinstance(model, Board):
+      return model.getModel()
+   if isinstance(model, basestring):
+      model = model.split()
+   return [int(tile) for tile in model]
+
+# Algorithms that always return a shortest path, when they find one
+OPTIMAL_ALGORITHMS = ["bfs", "bfs-layered", "bfs-external", "bfs-numpy", 
+                      "bibfs", "ids", "a*", "ida*", "hda*", "pida*", "mm", 
+                      "oracle"]
+
+# Cache of the paths found by solve, in front of the searches
+# Paths are kept in memory, the least recently used being dropped beyond 
+#  'capacity' entries, and also in a file (a shelve), if given, so that they
+#  survive restarts. An entry is keyed by the board size, the goal, the root
+#  and the class of the algorithm: the paths of every optimal algorithm are
+#  shared, as any of them would find a path just as short, while the other
+#  algorithms each have their own, per heuristic, per weight for wa* and 
+#  ara*, which are only bounded suboptimal, and per closed set and 
+#  transposition table, which change the path they find. The value is the 
+#  tuple of move codes from the root to the goal, or None if the search 
+#  proved there is no path.
+# Every board along a shortest path has the rest of that path as a shortest 
+#  path of its own, so it is stored for each of them, and a later search 
+#  from any of those boards is a hit too.
+class SolutionCache(object):
+   def __init__(self, capacity = 10000, fileName = None):
+      if capacity < 1:
+         raise ValueError("A solution cache needs at least 1 entry")
+      self.capacity = capacity
+      self.entries = collections.OrderedDict()
+      self.store = None
+      if fileName:
+         self.store = shelve.open(fileName)
+      self.numHits = 0              # Lookups answered from memory
+      self.numDiskHits = 0          # Lookups answered from the file
+      self.numMisses = 0            # Lookups not answered
+      self.numEvictions = 0         # Entries dropped from memory
+   
+   # Class of the algorithm, as part of the key of its entries
+   # closedSet is the closed set of the search (see EightPuzzle.closedSet) 
+   #  and transpositionTable its TranspositionTable, if any
+   @staticmethod
+   def algorithmClass(algorithm, heuristic, depthLimit, weight = None,
+                      closedSet = "set", transpositionTable = None):
+      if algorithm in OPTIMAL_ALGORITHMS:
+         return "optimal"
+      if algorithm == "dls":
+         algorithmClass = "dls/" + str(depthLimit)
+      elif algorithm in ["wa*", "ara*"]:
+         algorithmClass = algorithm + "/" + str(heuristic) + "/" + str(weight)
+      elif heuristic is None:
+         algorithmClass = algorithm
+      else:
+         algorithmClass = algorithm + "/" + str(heuristic)
+      algorithmClass += "/" + closedSet
+      if transpositionTable is not None and algorithm == "dls":
+         algorithmClass += "/tt:%s:%d" % (transpositionTable.policy, 
+                                          transpositionTable.capacity)
+      return algorithmClass
+   
+   # Key of the entry of the boards, for the file
+   @staticmethod
+   def fileKey(key):
+      return "%d:%x:%x:%s" % key
+   
+   # Fraction of the lookups answered, from memory or from the file
+   def hitRate(self):
+      numLookups = self.numHits + self.numDiskHits + self.numMisses
+      if not numLookups:
+         return 0.0
+      return float(self.numHits + self.numDiskHits) / numLookups
+   
+   # Returns (True, moves) if the path from root to goal for the class of 
+   #  algorithm is known, moves being None if there is none, and 
+   #  (False, None) otherwise
+   def lookup(self, root, goal, algorithmClass):
+      key = (root.geometry.numCells, goal.state, root.state, algorithmClass)
+      if key in self.entries:
+         moves = self.entries.pop(key)
+         self.entries[key] = moves
+         self.numHits += 1
+         return True, moves
+      if self.store is not None:
+         fileKey = SolutionCache.fileKey(key)
+         if fileKey in self.store:
+            moves = self.store[fileKey]
+            self.remember(key, moves)
+            self.numDiskHits += 1
+            return True, moves
+      self.numMisses += 1
+      return False, None
+   
+   # Keep the moves in memory, dropping the least recently used entry if 
+   #  full
+   def remember(self, key, moves):
+      if key in self.entries:
+         del self.entries[key]
+      elif len(self.entries) >= self.capacity:
+         self.entries.popitem(last = False)
+         self.numEvictions += 1
+      self.entries[key] = moves
+   
+   # Store the path from root to goal found for the class of algorithm, 
+   #  given as the tuple of its move codes, or None if there is none
+   def add(self, root, goal, algorithmClass, moves):
+      keys = [(root.geometry.numCells, goal.state, root.state, 
+               algorithmClass)]
+      suffixes = [moves]
+      if moves and algorithmClass == "optimal":
+         board = root.copyBoard()
+         for i in range(len(moves) - 1):
+            board.moveTile(moves[i])
+            keys.append((root.geometry.numCells, goal.state, board.state, 
+                         algorithmClass))
+            suffixes.append(moves[i + 1:])
+      # The root is remembered last, so that the entries of its suffixes do
+      #  not evict it, and only as many of the boards nearest to it as fit 
+      #  in memory are remembered (every board goes to the file)
+      for i in reversed(range(len(keys))):
+         if i < self.capacity:
+            self.remember(keys[i], suffixes[i])
+         if self.store is not None:
+            self.store[SolutionCache.fileKey(keys[i])] = suffixes[i]
+      if self.store is not None:
+         self.store.sync()
+   
+   # Close the file, if any
+   def close(self):
+      if self.store is not None:
+         self.store.close()
+         self.store = None
+
+# Solve the puzzle from root to goal and return a SolveResult
+# root and goal are given as for parseModel; goal defaults to the default 
+#  goal for the size of root. algorithm is one of the names accepted by -a 
+#  (but "all") and heuristic one of the names accepted by -f, used by the 
+#  informed searches only. limits may hold "depthLimit" (for dls, 25 by 
+#  default) and the limits of a Budget: "timeLimit" (CPU secs, 300 by 
+#  default), "wallTimeLimit" (secs), "nodeLimit" (no. of tests), 
+#  "memoryLimit" (megabytes) and "checkInterval". A Budget may be given 
+#  instead as budget, to cancel the search from another thread. heuristics
+#  may be a dictionary shared between calls, to reuse the heuristics built 
+#  for each goal. transpositionTable is an optional TranspositionTable for 
+#  ida*, dls and ids, cleared before the search. telemetry may hold 
+#  "phaseTimes" (True to time the phases of the search), "snapshotInterval"
+#  (secs between two progress snapshots), "progressFile" (a file to write 
+#  the snapshots to as they are taken), "solutionFile" (a file to write 
+#  the solutions of wa* and ara* to as they are found, see 
+#  EightPuzzle.recordSolution) and "profile" (a file to write a cProfile 
+#  profile of the search to, "-" to print it). cache is an 
+#  optional SolutionCache looked up before searching, and given the path 
+#  found by a search that was not stopped by its budget. If canonical is 
+#  True, the problem is mapped onto one with a canonical goal before 
+#  anything else (see canonicalize), so the heuristics, the cache and the 
+#  transposition table work on the canonical boards, and the path found is 
+#  mapped back. closedSet is the closed set of bfs, dfs, dls, greedy and a*,
+#  "set" or "ranked" (see EightPuzzle.closedSet). external may hold the 
+#  options of bfs-external: "directory" (of its layers), "bufferSize" (no. 
+#  of states per buffer) and "resume" (True to resume the search recorded 
+#  in the directory). numWorkers is the no. of worker processes of hda* 
+#  and pida*, the no. of CPUs by default, and splitDepth the depth of the 
+#  subtrees of pida*. weight is the weight of h in wa* and the first 
+#  weight of ara*, 2 by default, and weightStep the amount ara* lowers it 
+#  by after each search, 0.5 by default; to answer within a latency 
+#  budget, give ara* a "wallTimeLimit" and read its best solution.
+# Nothing is printed. Raises ValueError for invalid boards or options.
+def solve(root, goal = None, algorithm = "a*", heuristic = "h2", limits = None,
+          patternDatabaseFile = None, oracleFile = None, heuristics = None,
+          transpositionTable = None, budget = None, telemetry = None,
+          cache = None, canonical = False, closedSet = "set", 
+          external = None, numWorkers = None, splitDepth = None,
+          weight = None, weightStep = None):
+   limits = limits or {}
+   if closedSet not in EightPuzzle.closedSets:
+      raise ValueError("Unknown closed set " + str(closedSet))
+   if weight is not None and weight < 1:
+      raise ValueError("The weight of wa* and ara* must be at least 1")
+   if weightStep is not None and weightStep <= 0:
+      raise ValueError("The weight step of ara* must be positive")
+   if budget is None:
+      budget = Budget.fromLimits(limits)
+   rootModel = parseModel(root)
+   geometry = BoardGeometry.forCells(len(rootModel))
+   if goal is None:
+      goalModel = geometry.defaultGoalModel()
+   else:
+      goalModel = parseModel(goal)
+   for model in [rootModel, goalModel]:
+      if sorted(model) != range(geometry.numCells):
+         raise ValueError("The root and goal boards must have the tiles 0 to " + 
+                          str(geometry.numCells - 1) + " exactly once")
+   if algorithm not in ["greedy", "a*", "wa*", "ara*", "ida*", "hda*", "pida*", 
+                        "mm"]:
+      heuristic = None
+   elif heuristicComponents(heuristic) is None:
+      raise ValueError("Unknown heuristic " + str(heuristic))
+   
+   moveMap = None
+   if canonical:
+      originalRoot = Board()
+      originalRoot.constructBoard(rootModel)
+      originalGoalModel = goalModel
+      rootModel, goalModel, moveMap = canonicalize(rootModel, goalModel)
+   rootBoard = Board()
+   rootBoard.constructBoard(rootModel)
+   goalBoard = Board()
+   goalBoard.constructBoard(goalModel)
+   wallStart = time.time()
+   timerSearch = Timer("Search algorithm", 0, 0)
+   puzzle = EightPuzzle(rootBoard, goalBoard, False, timerSearch)
+   puzzle.quiet = True
+   puzzle.patternDatabaseFile = patternDatabaseFile
+   puzzle.oracleFile = oracleFile
+   puzzle.transpositionTable = transpositionTable
+   puzzle.closedSet = closedSet
+   external = external or {}
+   puzzle.externalDirectory = external.get("directory")
+   puzzle.externalBufferSize = external.get("bufferSize", 
+                                            puzzle.externalBufferSize)
+   puzzle.externalResume = external.get("resume", False)
+   if numWorkers is not None:
+      puzzle.numWorkers = numWorkers
+   if splitDepth is not None:
+      puzzle.splitDepth = splitDepth
+   if weight is not None:
+      puzzle.weight = float(weight)
+   if weightStep is not None:
+      puzzle.weightStep = float(weightStep)
+   puzzle.moveMap = moveMap
+   if heuristics is not None:
+      puzzle.heuristics = heuristics.setdefault(
+         (tuple(goalModel), patternDatabaseFile), {})
+   puzzle.budget = budget
+   telemetry = telemetry or {}
+   puzzle.timePhases(telemetry.get("phaseTimes", False))
+   puzzle.snapshotInterval = telemetry.get("snapshotInterval")
+   puzzle.progressFile = telemetry.get("progressFile")
+   puzzle.solutionFile = telemetry.get("solutionFile")
+   cached = False
+   if cache is not None:
+      algorithmClass = SolutionCache.algorithmClass(
+         algorithm, heuristic, limits.get("depthLimit", 25), puzzle.weight,
+         closedSet, transpositionTable)
+      cached, moves = cache.lookup(rootBoard, goalBoard, algorithmClass)
+   if cached:
+      puzzle.algorithm = algorithm
+      puzzle.heuristic = heuristic
+      if moves is not None:
+         board = rootBoard.copyBoard()
+         board.depth = 0
+         for moveCode in moves:
+            board = board.spawnChild(moveCode)
+         puzzle.foundGoal(board)
+      puzzle.timeTaken = timerSearch.stop()
+   else:
+      try:
+         if telemetry.get("profile"):
+            profileCall(telemetry["profile"], puzzle.search, algorithm, 
+                        heuristic, limits.get("depthLimit", 25))
+         else:
+            puzzle.search(algorithm, heuristic, limits.get("depthLimit", 25))
+      finally:
+         puzzle.timeTaken = timerSearch.stop()
+      if cache is not None and puzzle.stopReason is None:
+         moves = None
+         if puzzle.solution:
+            moves = tuple(puzzle.solution.getMoveCodes())
+         cache.add(rootBoard, goalBoard, algorithmClass, moves)
+   result = SolveResult(puzzle, algorithm, heuristic, time.time() - wallStart)
+   result.cached = cached
+   if moveMap is not None:
+      result.mapBack(originalRoot, originalGoalModel, moveMap)
+   return result
+
+# Limits of solve that can be given on the command line and by the tasks of
+#  a batch run
+LIMIT_NAMES = ["depthLimit", "timeLimit", "wallTimeLimit", "nodeLimit", 
+               "memoryLimit", "checkInterval"]
+
+# Options of the batch run that apply to every task, set in each worker 
+#  process by initBatchWorker
+batchDefaults = {}
+# Heuristics built by a worker process, see solve
+batchHeuristics = {}
+# Transposition table of a worker process, None for none
+batchTranspositionTable = None
+
+# Set up a worker process of a batch run
+# The paths and stats the searches print are discarded, the results are 
+#  returned to the parent process instead.
+def initBatchWorker(defaults):
+   global batchTranspositionTable
+   sys.stdout = open(os.devnull, "w")
+   batchDefaults.update(defaults)
+   if defaults["ttMemory"]:
+      batchTranspositionTable = TranspositionTable.forMemory(
+         defaults["ttMemory"], defaults["ttPolicy"])
+
+# Solve one task of a batch run, given as a line of JSON, in a worker process
+# A task has the fields "root", and optionally "id", "goal", "algorithm", 
+#  "heuristic", "canonical", "closedSet", "weight" and the limits of solve,
+#  which default to the options of the batch run. Returns the result as a 
+#  line of JSON.
+def solveBatchTask(arguments):
+   index, line = arguments
+   result = {"index": index}
+   try:
+      task = json.loads(line)
+      if "id" in task:
+         result["id"] = task["id"]
+      limits = {}
+      for key in LIMIT_NAMES:
+         limits[key] = task.get(key, batchDefaults[key])
+      solveResult = solve(task["root"], task.get("goal"), 
+                          task.get("algorithm", batchDefaults["algorithm"]), 
+                          task.get("heuristic", batchDefaults["heuristic"]),
+                          limits, batchDefaults["patternDatabaseFile"], 
+                          batchDefaults["oracleFile"], batchHeuristics,
+                          batchTranspositionTable, 
+                          canonical = task.get("canonical", 
+                                               batchDefaults["canonical"]),
+                          closedSet = task.get("closedSet", 
+                                               batchDefaults["closedSet"]),
+                          weight = task.get("weight", 
+                                            batchDefaults["weight"]),
+                          weightStep = batchDefaults["weightStep"])
+      result.update(solveResult.toDict())
+   except Exception, error:
+      result["error"] = str(error)
+   return json.dumps(result, sort_keys = True)
+
+# Algorithm and heuristic pairs run by a benchmark, the heuristic being None
+#  for the uninformed searches (mm needs a heuristic with a delta table, so 
+#  only h1 and h2, and bfs-numpy needs NumPy). wa* runs with its default 
+#  weight, its Opt. column showing how often it still finds a shortest path
+BENCHMARK_PAIRS = [("bfs", None), ("bfs-layered", None), ("bibfs", None), 
+                   ("dfs", None), ("dls", None), ("ids", None)] + \
+                  [(algorithm, heuristic) 
+                   for algorithm in ["greedy", "a*", "wa*", "ida*", "mm"] 
+                   for heuristic in ["h1", "h2", "pdb", "lc", "wd"]
+                   if algorithm != "mm" or heuristic in ["h1", "h2"]] + \
+                  [("oracle", None)]
+if numpy is not None:
+   BENCHMARK_PAIRS.append(("bfs-numpy", None))
+
+# Boards of the 3x3 board at each of the given optimal depths from the goal, 
+#  numInstances of them per depth (fewer if there are not so many), drawn 
+#  with the given seed. Returns a list of (depth, model) pairs.
+# The boards are found by a breadth first search from the goal over the 
+#  whole state space, so the same seed always gives the same boards.
+def benchmarkInstances(goalModel, depths, numInstances, seed):
+   goal = Board()
+   goal.constructBoard(goalModel)
+   if goal.geometry.numCells > 9:
+      raise ValueError("Benchmark instances are only available for boards of "
+                       "up to 3x3")
+   layers = [[goal]]
+   seen = set([goal.state])
+   while layers[-1] and len(layers) <= max(depths):
+      nextLayer = []
+      for board in layers[-1]:
+         moves = board.possibleMoves
+         mask = 1
+         while mask != 16:
+            if moves & mask:
+               child = board.spawnChild(mask)
+               if child.state not in seen:
+                  seen.add(child.state)
+                  child.parent = None
+                  nextLayer.append(child)
+            mask <<= 1;
+      layers.append(nextLayer)
+   
+   generator = random.Random(seed)
+   instances = []
+   for depth in depths:
+      if depth >= len(layers):
+         continue
+      layer = sorted(board.state for board in layers[depth])
+      for state in generator.sample(layer, min(numInstances, len(layer))):
+         board = Board(state, geometry = goal.geometry)
+         instances.append((depth, board.getModel()))
+   return instances
+
+# Run one benchmark instance with one algorithm, in a worker process of its 
+#  own so that the peak memory is that of this instance only
+# arguments is (algorithm, heuristic, depth, rootModel, goalModel, 
+#  numRepeats, limits, patternDatabaseFile, oracleFile). A first, untimed 
+#  run loads the heuristic. Returns the stats of each of the timed runs.
+def runBenchmarkTask(arguments):
+   algorithm, heuristic, depth, rootModel, goalModel, numRepeats, limits, \
+      patternDatabaseFile, oracleFile = arguments
+   sys.stdout = open(os.devnull, "w")
+   heuristics = {}
+   warmUpLimits = dict(limits)
+   warmUpLimits["nodeLimit"] = 1
+   solve(rootModel, goalModel, algorithm, heuristic, warmUpLimits, 
+         patternDatabaseFile, oracleFile, heuristics)
+   runs = []
+   for i in range(numRepeats):
+      gc.collect()
+      result = solve(rootModel, goalModel, algorithm, heuristic, limits, 
+                     patternDatabaseFile, oracleFile, heuristics)
+      runs.append({"timeTaken": result.timeTaken, 
+                   "wallTime": result.wallTime,
+                   "numTestDone": result.numTestDone,
+                   "peakMemory": result.stats["peakMemory"],
+                   "goalFound": result.goalFound,
+                   "pathLength": result.pathLength,
+                   "optimal": result.pathLength == depth,
+                   "stopReason": result.stopReason})
+   return algorithm, heuristic, depth, runs
+
+# Value below which the given fraction of the sorted values lie (nearest 
+#  rank)
+def percentile(sortedValues, fraction):
+   if not sortedValues:
+      return None
+   rank = int(math.ceil(fraction * len(sortedValues))) - 1
+   return sortedValues[max(0, min(rank, len(sortedValues) - 1))]
+
+# Summarise the runs of one algorithm, heuristic and depth
+def summariseBenchmark(runs):
+   times = sorted(run["timeTaken"] for run in runs)
+   tests = sorted(run["numTestDone"] for run in runs)
+   rates = sorted(run["numTestDone"] / run["timeTaken"] 
+                  for run in runs if run["timeTaken"] > 0)
+   return {"numRuns": len(runs),
+           "numSolved": len([run for run in runs if run["goalFound"]]),
+           "numOptimal": len([run for run in runs if run["optimal"]]),
+           "medianTime": percentile(times, 0.5), 
+           "p95Time": percentile(times, 0.95),
+           "medianTests": percentile(tests, 0.5),
+           "medianTestsPerSec": percentile(rates, 0.5),
+           "peakMemory": max(run["peakMemory"] for run in runs)}
+
+# Key of an algorithm, heuristic and depth in the summary of a benchmark
+def benchmarkKey(algorithm, heuristic, depth):
+   return "%s/%s/%d" % (algorithm, heuristic or "-", depth)
+
+# Compare the summary of a benchmark with a baseline. Returns a list of the 
+#  regressions, as strings: a median time or no. of tests grown by more than
+#  the threshold (a fraction), or fewer boards solved. Times under 
+#  minTime secs in both are too short to compare.
+def compareBenchmark(summary, baseline, threshold, minTime = 0.001):
+   regressions = []
+   for key in sorted(summary):
+      if key not in baseline:
+         continue
+      new = summary[key]
+      old = baseline[key]
+      if new["numSolved"] < old["numSolved"]:
+         regressions.append("%s: solved %d of %d, was %d" % 
+                            (key, new["numSolved"], new["numRuns"], 
+                             old["numSolved"]))
+      if max(new["medianTime"], old["medianTime"]) >= minTime and \
+         new["medianTime"] > old["medianTime"] * (1 + threshold):
+         regressions.append("%s: median time %.6f, was %.6f" % 
+                            (key, new["medianTime"], old["medianTime"]))
+      if new["medianTests"] > old["medianTests"] * (1 + threshold):
+         regressions.append("%s: median tests %d, was %d" % 
+                            (key, new["medianTests"], old["medianTests"]))
+   return regressions
+
+class Main:
+   def parseCommandLine(self):
+      parser = argparse.ArgumentParser(prog = "python tile.py", description='8-Puzzle Program', formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+      parser.add_argument('--version', action='version', version='8-Puzzle 1.0')
+      parser.add_argument('-a', metavar='<algorithm>', type = str, nargs = 1, required = False,
+                         choices = ["bfs", "bfs-layered", "bfs-external", "bfs-numpy", "bibfs", "dfs", "dls", "ids", "greedy", "a*", "wa*", "ara*", "ida*", "hda*", "pida*", "mm", "oracle", "all"],
+                         help = 'Search algorithm to be used, could be one of "bfs", "bfs-layered", "bfs-external" (bfs keeping its layers on disk, up to 4x4), "bfs-numpy" (bfs over NumPy arrays, up to 4x4), "bibfs" (bidirectional bfs), "dfs", "dls", "ids", "greedy", "a*", "wa*" (weighted a*, at most --weight times the shortest path), "ara*" (anytime a*, improving its solution until the time limit), "ida*", "hda*" (a* over --workers processes), "pida*" (ida* over --workers processes), "mm" (bidirectional heuristic search) or "oracle" (lookup in the distance oracle, 3x3 only)')
+      parser.add_argument('-r', metavar='<tile>', type = str, nargs = '+', required = False, 
+                         help = 'Root board to be used, of 9, 16 or 25 tiles for the 3x3, 4x4 or 5x5 boards. Do not use commas or quotes Eg. "0 1 2 3 4 5 6 7 8"')
+      parser.add_argument('-g', metavar='<tile>', type = str, nargs = '+', required = False, 
+                         help = 'Goal board to be used. Do not use commas or quotes Eg. "0 1 2 3 4 5 6 7 8". Defaults to "1 2 3 8 0 4 7 6 5" for the 3x3 board and to the tiles in order, followed by 0, for the larger boards')
+      parser.add_argument('-d', metavar='<depth limit>', type = int, nargs = 1, required = False, 
+                         default=[25], 
+                         help='Depth upto which to be searched. Required for dls, ida*. If not provided, default value of 25 would be used')
+      parser.add_argument('-f', metavar='<heuristic function>', type = str, nargs = 1, required = False,
+                         help='Heuristic function to be used. Should be within quotes. Eg. "h1" (misplaced tiles), "h2" (Manhattan distance), "pdb" (pattern database), "lc" (Manhattan distance with linear conflicts), "wd" (walking distance, up to 4x4), or the max. of several, eg. "max:lc,wd"')
+      parser.add_argument('-v', action='store_true', help='Prints verbose output')
+      parser.add_argument('--pdb', metavar='<file>', type = str, required = False,
+                         help='Pattern database file used by "-f pdb". Defaults to eight-<goal>.pdb, built if missing')
+      parser.add_argument('--build-pdb', action='store_true', help='Builds the pattern database for the goal board and exits')
+      parser.add_argument('--check-pdb', action='store_true', help='Checks the pattern database for the goal board is admissible and consistent and exits')
+      parser.add_argument('--check-states', metavar='<states>', type = int, required = False,
+                         help='No. of states checked by --check-pdb, the nearest the goal first. Defaults to every state of the 3x3 board, and to ' + str(PatternDatabase.defaultCheckStates) + ' states of the larger boards')
+      parser.add_argument('--oracle', metavar='<file>', type = str, required = False,
+                         help='Distance oracle file used by "-a oracle". Defaults to eight-<goal>.oracle, built if missing')
+      parser.add_argument('--build-oracle', action='store_true', help='Builds the distance oracle for the goal board (3x3 only) and exits')
+      parser.add_argument('--time-limit', metavar='<secs>', type = float, required = False, default = DEFAULT_TIME_LIMIT,
+                         help='Limit on the CPU time of each search')
+      parser.add_argument('--wall-time-limit', metavar='<secs>', type = float, required = False,
+                         help='Limit on the elapsed time of each search')
+      parser.add_argument('--node-limit', metavar='<tests>', type = int, required = False,
+                         help='Limit on the no. of tests done by each search')
+      parser.add_argument('--memory-limit', metavar='<MB>', type = float, required = False,
+                         help='Limit on the memory of the process, in megabytes, checked during each search')
+      parser.add_argument('--check-interval', metavar='<tests>', type = int, required = False, default = DEFAULT_CHECK_INTERVAL,
+                         help='No. of tests between two checks of the time and memory limits')
+      parser.add_argument('--tt-memory', metavar='<MB>', type = float, required = False,
+                         help='Memory given to a transposition table for ida*, dls and ids, in megabytes. No table is used if not provided')
+      parser.add_argument('--tt-policy', metavar='<policy>', type = str, required = False, default = "two-tier",
+                         choices = TranspositionTable.policies,
+                         help='Replacement policy of the transposition table, could be one of "depth" (depth-preferred), "always" (always replace) or "two-tier"')
+      parser.add_argument('--closed-set', metavar='<kind>', type = str, required = False, default = "set",
+                         choices = EightPuzzle.closedSets,
+                         help='Closed set of bfs, dfs, dls, greedy, a* and wa*, could be one of "set" (a set of the states) or "ranked" (a bit per state indexed by its rank, with 2 bits for the move leading to it, for boards of up to 3x3: less memory, more time)')
+      parser.add_argument('--external-dir', metavar='<dir>', type = str, required = False,
+                         help='Directory bfs-external keeps its layers in, named after the goal and root boards by default')
+      parser.add_argument('--external-buffer', metavar='<states>', type = int, required = False, default = 1 << 18,
+                         help='No. of states bfs-external keeps in memory per file read or written')
+      parser.add_argument('--resume', action='store_true', help='Resumes the bfs-external search recorded in its directory, if stopped by a limit')
+      parser.add_argument('--phase-times', action='store_true', help='Times the phases of bfs, greedy, a* and wa* (generating the children, evaluating the heuristic, checking for duplicates, managing the queue)')
+      parser.add_argument('--progress', metavar='<secs>', type = float, required = False,
+                         help='Writes a snapshot of the progress of the search to stderr, as a line of JSON, every so many secs')
+      parser.add_argument('--stats-json', metavar='<file>', type = str, required = False,
+                         help='Writes the stats of the search to the file ("-" for stdout) as JSON')
+      parser.add_argument('--profile', metavar='<file>', type = str, required = False,
+                         help='Runs the search under cProfile and writes the profile to the file, or prints the functions that took the most time for "-"')
+      parser.add_argument('--canonical', action='store_true', help='Maps the root and goal boards onto a problem with one of a few canonical goals before searching, so that the pattern databases, distance oracles and cached paths of the canonical goals serve every goal, and maps the path found back')
+      parser.add_argument('--cache', metavar='<file>', type = str, required = False,
+                         help='Keeps the paths found in the file, and looks them up before searching. Paths found by an optimal algorithm serve every optimal algorithm, and every board along them')
+      parser.add_argument('--cache-size', metavar='<entries>', type = int, required = False, default = 10000,
+                         help='No. of paths of the cache kept in memory')
+      parser.add_argument('--benchmark', action='store_true', help='Runs every algorithm and heuristic (or those given by -a and -f) over boards of the 3x3 board drawn at the given optimal depths, and reports the median and 95th percentile CPU time, the tests per sec, the tests done and the peak memory')
+      parser.add_argument('--benchmark-depths', metavar='<depth>', type = int, nargs = '+', required = False, default = [5, 10, 15, 20, 25, 30],
+                         help='Optimal depths of the boards of --benchmark')
+      parser.add_argument('--benchmark-instances', metavar='<count>', type = int, required = False, default = 3,
+                         help='No. of boards of --benchmark at each depth')
+      parser.add_argument('--benchmark-repeats', metavar='<count>', type = int, required = False, default = 3,
+                         help='No. of timed runs of --benchmark for each board')
+      parser.add_argument('--benchmark-time-limit', metavar='<secs>', type = float, required = False, default = 10.0,
+                         help='Limit on the CPU time of each run of --benchmark')
+      parser.add_argument('--seed', metavar='<seed>', type = int, required = False, default = 1,
+                         help='Seed of the random choice of the boards of --benchmark')
+      parser.add_argument('--save-baseline', metavar='<file>', type = str, required = False,
+                         help='Saves the summary of --benchmark to the file as JSON')
+      parser.add_argument('--compare-baseline', metavar='<file>', type = str, required = False,
+                         help='Compares the summary of --benchmark with the one saved in the file, and exits with status 1 on a regression')
+      parser.add_argument('--regression-threshold', metavar='<fraction>', type = float, required = False, default = 0.1,
+                         help='Growth of a median time or no. of tests over the baseline reported as a regression by --compare-baseline')
+      parser.add_argument('--batch', metavar='<file>', type = str, required = False,
+                         help='Solves the tasks given in the file ("-" for stdin) as lines of JSON, eg. {"id": 1, "root": "1 3 4 8 6 2 7 0 5", "algorithm": "a*", "heuristic": "h2"}. The fields "goal", "algorithm", "heuristic", "canonical", "closedSet", "weight", "depthLimit", "timeLimit", "wallTimeLimit", "nodeLimit", "memoryLimit" and "checkInterval" are optional and default to -g, -a, -f, --canonical, --closed-set, --weight, -d and the limits given on the command line. Results are written as lines of JSON as they finish')
+      parser.add_argument('--workers', metavar='<count>', type = int, required = False, default = multiprocessing.cpu_count(),
+                         help='No. of worker processes for --batch, hda* and pida*')
+      parser.add_argument('--split-depth', metavar='<depth>', type = int, required = False, default = 6,
+                         help='Depth of the roots of the subtrees pida* hands out to its workers')
+      parser.add_argument('--weight', metavar='<weight>', type = float, required = False, default = 2.0,
+                         help='Weight of the heuristic in wa*, and first weight of ara*. The path found is at most so many times as long as a shortest one')
+      parser.add_argument('--weight-step', metavar='<step>', type = float, required = False, default = 0.5,
+                         help='Amount ara* lowers its weight by after each solution')
+      parser.add_argument('--solutions', metavar='<file>', type = str, required = False,
+                         help='Writes each solution found by wa* and ara* to the file ("-" for stdout) as a line of JSON as soon as it is found, with its moves and the bound on its length over that of a shortest path')
+      parser.add_argument('--ordered', action='store_true', help='Writes the results of --batch in the order of the tasks')
+
+      args = parser.parse_args(sys.argv[1:])
+      self.patternDatabaseFile = args.pdb
+      self.checkStates = args.check_states
+      if self.checkStates is not None and self.checkStates < 1:
+         parser.error("argument --check-states must be at least 1")
+      self.oracleFile = args.oracle
+      self.buildOracle = args.build_oracle
+      self.timeLimit = args.time_limit
+      self.wallTimeLimit = args.wall_time_limit
+      self.nodeLimit = args.node_limit
+      self.memoryLimit = args.memory_limit
+      self.checkInterval = args.check_interval
+      if self.checkInterval < 1:
+         parser.error("argument --check-interval must be at least 1")
+      self.ttMemory = args.tt_memory
+      self.phaseTimes = args.phase_times
+      self.snapshotInterval = args.progress
+      self.statsFile = args.stats_json
+      self.profileFile = args.profile
+      self.ttPolicy = args.tt_policy
+      self.closedSet = args.closed_set
+      self.external = {"directory": args.external_dir, 
+                       "bufferSize": args.external_buffer, 
+                       "resume": args.resume}
+      if args.external_buffer < 1:
+         parser.error("argument --external-buffer must be at least 1")
+      if self.ttMemory is not None and self.ttMemory <= 0:
+         parser.error("argument --tt-memory must be positive")
+      self.batchFile = args.batch
+      self.canonical = args.canonical
+      self.cacheFile = args.cache
+      self.cacheSize = args.cache_size
+      if self.cacheSize < 1:
+         parser.error("argument --cache-size must be at least 1")
+      if self.cacheFile and self.batchFile:
+         parser.error("argument --cache can not be used with --batch, as the "
+                      "file can not be written by several processes")
+      self.cache = None
+      self.benchmark = args.benchmark
+      self.benchmarkDepths = args.benchmark_depths
+      self.benchmarkInstances = args.benchmark_instances
+      self.benchmarkRepeats = args.benchmark_repeats
+      self.benchmarkTimeLimit = args.benchmark_time_limit
+      self.seed = args.seed
+      self.saveBaseline = args.save_baseline
+      self.compareBaseline = args.compare_baseline
+      self.regressionThreshold = args.regression_threshold
+      self.heuristicName = args.f and args.f[0]
+      if self.heuristicName and \
+         heuristicComponents(self.heuristicName) is None:
+         parser.error("argument -f: invalid choice: '" + self.heuristicName + 
+                      "' (choose from " + 
+                      ", ".join(["'" + name + "'" 
+                                 for name in sorted(HEURISTICS)]) + 
+                      " or 'max:<name>,<name>...')")
+      self.numWorkers = args.workers
+      self.splitDepth = args.split_depth
+      if self.splitDepth < 0:
+         parser.error("argument --split-depth must not be negative")
+      self.weight = args.weight
+      if self.weight < 1:
+         parser.error("argument --weight must be at least 1")
+      self.weightStep = args.weight_step
+      if self.weightStep <= 0:
+         parser.error("argument --weight-step must be positive")
+      self.solutionsFile = args.solutions
+      self.ordered = args.ordered
+      if args.build_pdb:
+         self.patternDatabaseAction = "build"
+      elif args.check_pdb:
+         self.patternDatabaseAction = "check"
+      else:
+         self.patternDatabaseAction = None
+         if not self.buildOracle and not self.batchFile and \
+            not self.benchmark and (not args.a or not args.r):
+            parser.error("arguments -a and -r are required")
+      
+      if args.a:
+         self.algorithm = args.a[0]
+      else:
+         self.algorithm = None
+      
+      self.rootModel = []
+      for string in args.r or []:
+         self.rootModel.append(int(string))
+      
+      if args.g:
+         self.goalModel = []
+         for string in args.g:
+            self.goalModel.append(int(string))         
+      else:
+         self.goalModel = None
+      
+      for model in [self.rootModel, self.goalModel]:
+         if model:
+            try:
+               geometry = BoardGeometry.forCells(len(model))
+            except ValueError, error:
+               parser.error(str(error))
+            if sorted(model) != range(geometry.numCells):
+               parser.error("a board must have the tiles 0 to " + 
+                            str(geometry.numCells - 1) + " exactly once")
+      if self.rootModel and self.goalModel and \
+         len(self.rootModel) != len(self.goalModel):
+         parser.error("the root and goal boards must be of the same size")
+      
+      if self.algorithm == "dls":
+         if args.d:
+            self.depthLimit = args.d[0]
+         else:
+            print "Depth limit is required if algorithm is dls"
+            return False
+      else:
+         self.depthLimit = None
+      if self.algorithm in ["greedy", "a*", "wa*", "ara*", "ida*", "hda*", 
+                            "pida*", "mm"] and not self.benchmark:
+         if not args.f:
+            print "Heuristic function required if using one of the informed search algorithms (greedy, a*, wa*, ara*, ida*, hda*, pida*, mm)"
+            return False
+      if args.v:
+         self.verbose = True
+      else:
+         self.verbose = False
+      return True
+
+   # Limits of solve given on the command line
+   def getLimits(self):
+      return {"depthLimit": self.depthLimit, "timeLimit": self.timeLimit, 
+              "wallTimeLimit": self.wallTimeLimit, 
+              "nodeLimit": self.nodeLimit, "memoryLimit": self.memoryLimit,
+              "checkInterval": self.checkInterval}
+      
+   def doSearch(self):
+      root = Board()
+      root.constructBoard(self.rootModel)
+      goal = Board()
+      goal.constructBoard(self.goalModel)
+      
+      if self.verbose:
+         print "Root"
+         print root
+         print "Goal"
+         print goal
+         print "------------------------------"
+      limits = self.getLimits()
+      transpositionTable = None
+      if self.ttMemory:
+         transpositionTable = TranspositionTable.forMemory(self.ttMemory, 
+                                                           self.ttPolicy)
+      telemetry = {"phaseTimes": self.phaseTimes, 
+                   "snapshotInterval": self.snapshotInterval, 
+                   "profile": self.profileFile}
+      if self.snapshotInterval is not None:
+         telemetry["progressFile"] = sys.stderr
+      solutionsFile = None
+      if self.solutionsFile == "-":
+         telemetry["solutionFile"] = sys.stdout
+      elif self.solutionsFile:
+         solutionsFile = telemetry["solutionFile"] = \
+            open(self.solutionsFile, "w")
+      try:
+         result = solve(self.rootModel, self.goalModel, self.algorithm, 
+                        self.heuristicName, limits, self.patternDatabaseFile, 
+                        self.oracleFile, None, transpositionTable, None, 
+                        telemetry, self.cache, self.canonical, self.closedSet,
+                        self.external, self.numWorkers, self.splitDepth,
+                        self.weight, self.weightStep)
+      except ValueError, error:
+         print error
+         return
+      finally:
+         if solutionsFile is not None:
+            solutionsFile.close()
+      if result.solution:
+         result.solution.printPath(self.verbose)
+      if result.cached:
+         print "Result found in the cache"
+      if result.stopReason:
+         print Budget.messages[result.stopReason]
+      result.puzzle.printStats()
+      if self.cache is not None:
+         print "Cache hits              = "  + str(self.cache.numHits)
+         print "Cache hits from file    = "  + str(self.cache.numDiskHits)
+         print "Cache misses            = "  + str(self.cache.numMisses)
+         print "Cache hit rate          = "  + "%.4f" % self.cache.hitRate()
+      if self.statsFile:
+         if self.statsFile == "-":
+            outputFile = sys.stdout
+         else:
+            outputFile = open(self.statsFile, "w")
+         try:
+            json.dump(result.stats, outputFile, sort_keys = True, indent = 1)
+            outputFile.write("\n")
+         finally:
+            if outputFile is not sys.stdout:
+               outputFile.close()
+      
+   # Build or check the pattern database for the goal board
+   def doPatternDatabase(self):
+      fileName = self.patternDatabaseFile
+      if not fileName:
+         fileName = PatternDatabase.defaultFileName(self.goalModel)
+      goal = Board()
+      goal.constructBoard(self.goalModel)
+      if self.patternDatabaseAction == "build":
+         timerBuild = Timer("Pattern database", 0, 0)
+         PatternDatabase.build(self.goalModel, 
+                               PatternDatabase.defaultGroups(goal.geometry), 
+                               fileName)
+         print "Pattern database written to " + fileName + " in " + \
+               str(timerBuild.stop()) + " secs"
+      else:
+         patternDatabase = PatternDatabase(goal, fileName)
+         maxStates = self.checkStates
+         if maxStates is None and goal.geometry.numCells > 9:
+            maxStates = PatternDatabase.defaultCheckStates
+         numChecked, violations = patternDatabase.check(maxStates)
+         for violation in violations[:20]:
+            print violation
+         print "Checked " + str(numChecked) + " states of " + fileName + \
+               ", " + str(len(violations)) + " violations found"
+         if numChecked == maxStates:
+            print "Only the " + str(maxStates) + " states nearest the " + \
+                  "goal were checked (see --check-states)"
+
+   # Build the distance oracle for the goal board
+   def doBuildOracle(self):
+      fileName = self.oracleFile
+      if not fileName:
+         fileName = DistanceOracle.defaultFileName(self.goalModel)
+      if len(self.goalModel) > 9:
+         print "The distance oracle is only available for boards of up to 3x3"
+         return
+      timerBuild = Timer("Distance oracle", 0, 0)
+      DistanceOracle.build(self.goalModel, fileName)
+      print "Distance oracle written to " + fileName + " in " + \
+            str(timerBuild.stop()) + " secs"
+
+   # Solve the tasks of self.batchFile over a pool of worker processes, 
+   #  writing the results as they finish
+   def doBatch(self):
+      if self.batchFile == "-":
+         inputFile = sys.stdin
+      else:
+         inputFile = open(self.batchFile)
+      defaults = {"algorithm": self.algorithm or "a*", 
+                  "heuristic": self.heuristicName or "h2",
+                  "patternDatabaseFile": self.patternDatabaseFile,
+                  "oracleFile": self.oracleFile,
+                  "ttMemory": self.ttMemory,
+                  "ttPolicy": self.ttPolicy,
+                  "canonical": self.canonical,
+                  "closedSet": self.closedSet,
+                  "weight": self.weight,
+                  "weightStep": self.weightStep}
+      defaults.update(self.getLimits())
+      defaults["depthLimit"] = self.depthLimit or 25
+      # Tasks are read as the workers need them
+      tasks = ((index, line) for index, line in 
+               enumerate(iter(inputFile.readline, "")) if line.strip())
+      pool = multiprocessing.Pool(max(1, self.numWorkers), initBatchWorker, 
+                                  (defaults,))
+      try:
+         if self.ordered:
+            results = pool.imap(solveBatchTask, tasks)
+         else:
+            results = pool.imap_unordered(solveBatchTask, tasks)
+         for result in results:
+            sys.stdout.write(result + "\n")
+            sys.stdout.flush()
+         pool.close()
+      finally:
+         pool.terminate()
+         pool.join()
+         if inputFile is not sys.stdin:
+            inputFile.close()
+
+   # Run the benchmark and print its summary, then save it or compare it 
+   #  with a baseline
+   def doBenchmark(self):
+      pairs = [(algorithm, heuristic) 
+               for algorithm, heuristic in BENCHMARK_PAIRS
+               if self.algorithm in [None, "all", algorithm] and 
+                  (heuristic is None or 
+                   self.heuristicName in [None, heuristic])]
+      try:
+         instances = benchmarkInstances(self.goalModel, self.benchmarkDepths,
+                                        self.benchmarkInstances, self.seed)
+      except ValueError, error:
+         print error
+         return
+      tasks = []
+      for algorithm, heuristic in pairs:
+         for depth, rootModel in instances:
+            limits = self.getLimits()
+            limits["timeLimit"] = self.benchmarkTimeLimit
+            limits["depthLimit"] = depth
+            tasks.append((algorithm, heuristic, depth, rootModel, 
+                          self.goalModel, self.benchmarkRepeats, limits, 
+                          self.patternDatabaseFile, self.oracleFile))
+      
+      # One run at a time, each instance in a fresh process
+      runs = collections.defaultdict(list)
+      pool = multiprocessing.Pool(1, maxtasksperchild = 1)
+      try:
+         for algorithm, heuristic, depth, taskRuns in \
+             pool.imap(runBenchmarkTask, tasks):
+            runs[benchmarkKey(algorithm, heuristic, depth)].extend(taskRuns)
+         pool.close()
+      finally:
+         pool.terminate()
+         pool.join()
+      
+      summary = {}
+      print "%-20s %6s %6s %10s %10s %10s %12s %8s" % \
+            ("Algorithm/h/depth", "Solved", "Opt.", "Median s", "P95 s", 
+             "Tests", "Tests/sec", "Peak MB")
+      for algorithm, heuristic in pairs:
+         for depth in self.benchmarkDepths:
+            key = benchmarkKey(algorithm, heuristic, depth)
+            if key not in runs:
+               continue
+            summary[key] = stats = summariseBenchmark(runs[key])
+            print "%-20s %3d/%-2d %6d %10.6f %10.6f %10d %12.0f %8.1f" % \
+                  (key, stats["numSolved"], stats["numRuns"], 
+                   stats["numOptimal"], stats["medianTime"], 
+                   stats["p95Time"], stats["medianTests"], 
+                   stats["medianTestsPerSec"] or 0, 
+                   stats["peakMemory"] / 1048576.0)
+      
+      configuration = {"goal": self.goalModel, "seed": self.seed,
+                       "depths": self.benchmarkDepths, 
+                       "numInstances": self.benchmarkInstances,
+                       "numRepeats": self.benchmarkRepeats,
+                       "timeLimit": self.benchmarkTimeLimit}
+      if self.saveBaseline:
+         outputFile = open(self.saveBaseline, "w")
+         try:
+            json.dump({"configuration": configuration, "summary": summary}, 
+                      outputFile, sort_keys = True, indent = 1)
+            outputFile.write("\n")
+         finally:
+            outputFile.close()
+         print "Baseline saved to " + self.saveBaseline
+      if self.compareBaseline:
+         inputFile = open(self.compareBaseline)
+         try:
+            baseline = json.load(inputFile)
+         finally:
+            inputFile.close()
+         if baseline["configuration"] != configuration:
+            print "Warning: the baseline was run with a different " + \
+                  "configuration " + json.dumps(baseline["configuration"], 
+                                                sort_keys = True)
+         regressions = compareBenchmark(summary, baseline["summary"], 
+                                        self.regressionThreshold)
+         for regression in regressions:
+            print "Regression: " + regression
+         print str(len(regressions)) + " regressions against " + \
+               self.compareBaseline
+         if regressions:
+            sys.exit(1)
+
+   def main(self):
+      gc.enable()
+      if not self.parseCommandLine():
+         return
+      
+      if not self.goalModel:
+         if self.rootModel:
+            geometry = BoardGeometry.forCells(len(self.rootModel))
+         else:
+            geometry = BOARD_3
+         self.goalModel = geometry.defaultGoalModel()
+      if self.cacheFile:
+         self.cache = SolutionCache(self.cacheSize, self.cacheFile)
+      try:
+         self.run()
+      finally:
+         if self.cache is not None:
+            self.cache.close()
+   
+   # Run what the command line asks for
+   def run(self):
+      if self.patternDatabaseAction:
+         self.doPatternDatabase()
+      elif self.buildOracle:
+         self.doBuildOracle()
+      elif self.batchFile:
+         self.doBatch()
+      elif self.benchmark:
+         self.doBenchmark()
+      elif self.algorithm != "all":
+         self.doSearch()
+      else:
+         rootModels = [[1, 3, 4, 8, 6, 2, 7, 0, 5], [2, 8, 1, 0, 4, 3, 7, 6, 5], [5, 6, 7, 4, 0, 8, 3, 2, 1]]
+         #rootModels = [[1, 3, 4, 8, 6, 2, 7, 0, 5], [2, 8, 1, 0, 4, 3, 7, 6, 5]]
+         #rootModels = [[5, 6, 7, 4, 0, 8, 3, 2, 1]]
+         algorithms = ["bfs", "bfs-layered", "bibfs", "dfs", "dls", "ids", "greedy", "a*", "ida*", "mm"]
+         heuristicNames = ["h1", "h2"]
+         self.goalModel = [1, 2, 3, 8, 0, 4, 7, 6, 5]
+         self.depthLimit = 25
+         self.verbose = False
+         for rootModel in rootModels:
+            self.rootModel = rootModel
+            print "Goal: " + str(rootModel)
+            for algorithm in algorithms:
+               self.algorithm = algorithm
+               if self.algorithm in ["greedy", "a*", "ida*", "mm"]:
+                  for heuristic in heuristicNames:
+                     self.heuristicName = heuristic
+                     self.doSearch()
+               else:
+                  self.doSearch()
+          
+if __name__ == "__main__":
+   run = Main()
+   run.main()
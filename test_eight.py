@@ -0,0 +1,407 @@
+import StringIO
+import json
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+import pytest
+
+import eight
+from eight import (HEURISTICS, MOVE_CODES, MOVE_NAMES, Board, 
+                   BoardGeometry, DistanceOracle, MaxHeuristic, 
+                   PatternDatabase, SolutionCache, TranspositionTable, 
+                   canonicalize, heuristicComponents, solve)
+
+# Default goal of the 3x3 board
+GOAL = BoardGeometry.get(3).defaultGoalModel()
+
+# Directory of the tables built for the tests, and the distance oracle of
+#  GOAL, built once for all of them by setUpModule
+tableDirectory = None
+oracle = None
+
+def setUpModule():
+   global tableDirectory, oracle
+   tableDirectory = tempfile.mkdtemp()
+   oracle = DistanceOracle(makeBoard(GOAL),
+                           os.path.join(tableDirectory, "eight.oracle"))
+
+def tearDownModule():
+   oracle.table.close()
+   shutil.rmtree(tableDirectory)
+
+# Board of the list of tiles
+def makeBoard(model):
+   board = Board()
+   board.constructBoard(model)
+   return board
+
+# Random 3x3 roots, at any distance from GOAL, that can reach it
+def randomRoots(count, seed):
+   generator = random.Random(seed)
+   goalParity = makeBoard(GOAL).parity()
+   roots = []
+   while len(roots) < count:
+      model = range(9)
+      generator.shuffle(model)
+      if makeBoard(model).parity() == goalParity:
+         roots.append(model)
+   return roots
+
+# Roots reached from the goal by scrambleCount random moves, near enough to
+#  it for the uninformed searches
+def scrambledRoots(goalModel, count, scrambleCount, seed):
+   random.seed(seed)
+   roots = []
+   for i in range(count):
+      board = makeBoard(goalModel)
+      board.scrambleBoard(scrambleCount)
+      roots.append(board.getModel())
+   return roots
+
+# Tiles of the board reached by making the moves (names, as in
+#  SolveResult.moves) from the root. Raises AssertionError on a move that is
+#  not allowed.
+def playMoves(rootModel, moves):
+   moveCodes = dict([(name, moveCode)
+                     for moveCode, name in MOVE_NAMES.items()])
+   board = makeBoard(rootModel)
+   for move in moves:
+      if not board.possibleMoves & moveCodes[move]:
+         raise AssertionError("Move " + move + " not allowed from " +
+                              str(board.getModel()))
+      board.moveTile(moveCodes[move])
+   return board.getModel()
+
+
+class SolutionCacheTest(unittest.TestCase):
+   # A path longer than the capacity must not evict the entry of its root
+   def testPathLongerThanCapacity(self):
+      cache = SolutionCache(10)
+      root = "5 6 7 4 0 8 3 2 1"
+      first = solve(root, cache = cache)
+      self.assertEqual(first.pathLength, 30)
+      self.assertFalse(first.cached)
+      second = solve(root, cache = cache)
+      self.assertTrue(second.cached)
+      self.assertEqual(second.moves, first.moves)
+      self.assertEqual(cache.numHits, 1)
+      self.assertEqual(cache.numMisses, 1)
+      self.assertEqual(len(cache.entries), 10)
+      self.assertEqual(cache.numEvictions, 0)
+   
+   # dfs and dls find other paths with another closed set or transposition 
+   #  table, so those must not share their entries
+   def testClosedSetAndTableInKey(self):
+      cache = SolutionCache()
+      root = scrambledRoots(GOAL, 1, 20, 4)[0]
+      configurations = [("dfs", {"closedSet": "set"}), 
+                        ("dfs", {"closedSet": "ranked"}),
+                        ("dls", {}), 
+                        ("dls", {"transpositionTable": 
+                                 TranspositionTable(1000, "always")}),
+                        ("dls", {"transpositionTable": 
+                                 TranspositionTable(1000, "depth")})]
+      for algorithm, options in configurations:
+         result = solve(root, algorithm = algorithm, cache = cache, 
+                        **options)
+         self.assertFalse(result.cached)
+         self.assertTrue(solve(root, algorithm = algorithm, cache = cache,
+                               **options).cached)
+      self.assertEqual(cache.numMisses, len(configurations))
+
+class PatternDatabaseTest(unittest.TestCase):
+   # The estimates never exceed the distance, so ida* finds shortest paths
+   def testAdmissible(self):
+      fileName = os.path.join(tableDirectory, "eight.pdb")
+      pdb = PatternDatabase(makeBoard(GOAL), fileName)
+      for root in randomRoots(500, 1):
+         board = makeBoard(root)
+         self.assertLessEqual(pdb.evaluate(board), oracle.distance(board))
+      for root in randomRoots(5, 2):
+         result = solve(root, algorithm = "ida*", heuristic = "pdb",
+                        patternDatabaseFile = fileName)
+         self.assertEqual(result.pathLength,
+                          oracle.distance(makeBoard(root)))
+         self.assertEqual(playMoves(root, result.moves), GOAL)
+
+class HeuristicTest(unittest.TestCase):
+   # lc, wd and their max. never exceed the distance (admissible) and change
+   #  by at most 1 across a move (consistent). The estimates carried from 
+   #  board to board by update are those evaluated from scratch.
+   def testAdmissibleAndConsistent(self):
+      goal = makeBoard(GOAL)
+      heuristics = [HEURISTICS["lc"](goal), HEURISTICS["wd"](goal)]
+      heuristics.append(MaxHeuristic(goal, list(heuristics)))
+      heuristics.append(MaxHeuristic(goal, [HEURISTICS["h1"](goal), 
+                                            HEURISTICS["h2"](goal),
+                                            HEURISTICS["wd"](goal)]))
+      for root in randomRoots(300, 9):
+         board = makeBoard(root)
+         distance = oracle.distance(board)
+         for heuristic in heuristics:
+            h = heuristic.evaluate(board)
+            self.assertLessEqual(h, distance, heuristic.name)
+            for moveCode in MOVE_CODES:
+               if not board.possibleMoves & moveCode:
+                  continue
+               child = board.spawnChild(moveCode)
+               childH = heuristic.evaluate(child)
+               self.assertLessEqual(abs(h - childH), 1, heuristic.name)
+               if heuristic.update:
+                  self.assertEqual(
+                     heuristic.update(h, heuristic.keys(board.state), 
+                                      board.state, child.state, 
+                                      child.emptyTile, board.emptyTile),
+                     (childH, heuristic.keys(child.state)))
+   
+   # The max. is carried from board to board only when every component 
+   #  can be, and leads the searches just as its components would
+   def testIncrementalMax(self):
+      goal = makeBoard(GOAL)
+      fileName = os.path.join(tableDirectory, "eight.pdb")
+      self.assertTrue(MaxHeuristic(goal, [HEURISTICS["h1"](goal), 
+                                          HEURISTICS["lc"](goal)]).update)
+      self.assertEqual(MaxHeuristic(goal, [HEURISTICS["h2"](goal), 
+                                           PatternDatabase(goal, fileName)])
+                       .update, None)
+      for root in randomRoots(3, 12):
+         for algorithm in ["a*", "ida*"]:
+            h2 = solve(root, algorithm = algorithm, heuristic = "h2")
+            maxH1H2 = solve(root, algorithm = algorithm, 
+                            heuristic = "max:h1,h2")
+            self.assertEqual(maxH1H2.moves, h2.moves)
+            self.assertEqual(maxH1H2.numTestDone, h2.numTestDone)
+   
+   # Names that are not registered, alone or in a max., are rejected
+   def testUnknownNames(self):
+      self.assertEqual(heuristicComponents("max:lc,wd"), ["lc", "wd"])
+      for name in ["h3", "max:lc,h3", "max:", None]:
+         self.assertEqual(heuristicComponents(name), None)
+         self.assertRaises(ValueError, solve, GOAL, heuristic = name)
+
+class TranspositionTableTest(unittest.TestCase):
+   # A table far too small for the states searched, so that they keep 
+   #  taking each other's slots (or, with the depth policy, are turned 
+   #  down), must not cost ids and ida* their shortest paths
+   def testShortestPathsWithEvictions(self):
+      roots = [root for root in randomRoots(1000, 3) 
+               if oracle.distance(makeBoard(root)) <= 14][:3]
+      for policy in TranspositionTable.policies:
+         table = TranspositionTable(5, policy)
+         for root in roots:
+            distance = oracle.distance(makeBoard(root))
+            for algorithm in ["ids", "ida*"]:
+               result = solve(root, algorithm = algorithm,
+                              transpositionTable = table)
+               self.assertEqual(result.pathLength, distance,
+                                "%s with the %s policy" % 
+                                (algorithm, policy))
+               self.assertEqual(playMoves(root, result.moves), GOAL)
+               self.assertTrue(table.numMisses > table.capacity)
+   
+   # The two-tier policy needs two buckets of two slots
+   def testTwoTierCapacity(self):
+      self.assertRaises(ValueError, TranspositionTable, 3, "two-tier")
+      self.assertEqual(TranspositionTable(3, "always").numBuckets, 3)
+
+class HdastarTest(unittest.TestCase):
+   # hda* finds shortest paths, whatever worker owns the states on them
+   def testShortestPaths(self):
+      for root in randomRoots(3, 7):
+         result = solve(root, algorithm = "hda*", numWorkers = 2,
+                        limits = {"wallTimeLimit": 60})
+         self.assertEqual(result.stopReason, None)
+         self.assertEqual(result.pathLength, 
+                          oracle.distance(makeBoard(root)))
+         self.assertEqual(playMoves(root, result.moves), GOAL)
+
+class NumpyTest(unittest.TestCase):
+   # bfs-numpy reaches the same layers as bfs-layered, and finds paths as 
+   #  short as bfs
+   def testBfsNumpy(self):
+      pytest.importorskip("numpy")
+      for root in scrambledRoots(GOAL, 3, 30, 8):
+         result = solve(root, algorithm = "bfs-numpy")
+         self.assertEqual(result.stats["layerSizes"], 
+                          solve(root, algorithm = "bfs-layered")
+                          .stats["layerSizes"])
+         self.assertEqual(result.pathLength, 
+                          solve(root, algorithm = "bfs").pathLength)
+         self.assertEqual(playMoves(root, result.moves), GOAL)
+   
+   # The estimates of many boards looked up together are those of the 
+   #  boards evaluated one at a time
+   def testEvaluateStates(self):
+      pytest.importorskip("numpy")
+      for size in [3, 4]:
+         goalModel = BoardGeometry.get(size).defaultGoalModel()
+         states = [makeBoard(root).state 
+                   for root in scrambledRoots(goalModel, 200, 40, size)]
+         for name in ["h1", "h2"]:
+            heuristic = HEURISTICS[name](makeBoard(goalModel))
+            self.assertEqual(list(heuristic.evaluateStates(states)), 
+                             heuristic.evaluateEach(states))
+   
+   # The searches estimating the children of a board together find the 
+   #  same paths, with the same no. of tests, with and without NumPy
+   def testSameSearchWithoutNumpy(self):
+      pytest.importorskip("numpy")
+      fileName = os.path.join(tableDirectory, "eight.pdb")
+      root = "5 6 7 4 0 8 3 2 1"
+      for heuristic in ["max:h1,h2", "max:h2,pdb"]:
+         withNumpy = solve(root, heuristic = heuristic, 
+                           patternDatabaseFile = fileName)
+         numpy = eight.numpy
+         eight.numpy = None
+         try:
+            withoutNumpy = solve(root, heuristic = heuristic, 
+                                 patternDatabaseFile = fileName)
+         finally:
+            eight.numpy = numpy
+         self.assertEqual(withNumpy.moves, withoutNumpy.moves)
+         self.assertEqual(withNumpy.numTestDone, withoutNumpy.numTestDone)
+         self.assertEqual(withNumpy.pathLength, 30)
+
+class BidirectionalTest(unittest.TestCase):
+   # bibfs and mm stop with a shortest path, also at the goal itself and one
+   #  move from it
+   def testShortestPaths(self):
+      roots = [GOAL] + scrambledRoots(GOAL, 1, 1, 16) + randomRoots(3, 17)
+      for root in roots:
+         distance = oracle.distance(makeBoard(root))
+         for algorithm in ["bibfs", "mm"]:
+            result = solve(root, algorithm = algorithm)
+            self.assertEqual(result.pathLength, distance, algorithm)
+            self.assertEqual(playMoves(root, result.moves), GOAL)
+   
+   # From a root of the other parity, the searches run out of boards 
+   #  rather than stopping with a path
+   def testUnsolvable(self):
+      root = list(GOAL)
+      root[0], root[1] = root[1], root[0]
+      for algorithm in ["bibfs", "mm"]:
+         result = solve(root, algorithm = algorithm)
+         self.assertFalse(result.goalFound)
+         self.assertEqual(result.moves, None)
+         self.assertEqual(result.stopReason, None)
+
+class ExternalBfsTest(unittest.TestCase):
+   # A search stopped by its budget resumes from the layers and 
+   #  progress.json it left, and ends with a shortest path, having reached 
+   #  the same layers as bfs-layered. The small buffers make every layer 
+   #  past the first few a merge of several sorted runs.
+   def testResume(self):
+      root = [root for root in randomRoots(300, 18) 
+              if oracle.distance(makeBoard(root)) == 16][0]
+      directory = os.path.join(tableDirectory, "layers")
+      external = {"directory": directory, "bufferSize": 64}
+      stopped = solve(root, algorithm = "bfs-external", external = external,
+                      limits = {"nodeLimit": 3000})
+      self.assertEqual(stopped.stopReason, "nodes")
+      self.assertFalse(stopped.goalFound)
+      self.assertTrue(os.path.exists(os.path.join(directory, 
+                                                  "progress.json")))
+      
+      external["resume"] = True
+      resumed = solve(root, algorithm = "bfs-external", external = external)
+      self.assertEqual(resumed.pathLength, oracle.distance(makeBoard(root)))
+      self.assertEqual(playMoves(root, resumed.moves), GOAL)
+      layerSizes = resumed.stats["layerSizes"]
+      self.assertEqual(layerSizes[:len(stopped.stats["layerSizes"])], 
+                       stopped.stats["layerSizes"])
+      self.assertEqual(layerSizes, 
+                       solve(root, algorithm = "bfs-layered")
+                       .stats["layerSizes"])
+      self.assertFalse(os.path.exists(directory))
+
+class PidaTest(unittest.TestCase):
+   # pida* with 2 workers finds the shortest path ida* finds, also for 
+   #  roots nearer to the goal than the depth the subtrees are split at
+   def testSameAsIdastar(self):
+      roots = randomRoots(5, 14) + [GOAL] + scrambledRoots(GOAL, 3, 3, 15)
+      for root in roots:
+         result = solve(root, algorithm = "pida*", numWorkers = 2)
+         self.assertEqual(result.pathLength, 
+                          oracle.distance(makeBoard(root)))
+         self.assertEqual(result.moves, 
+                          solve(root, algorithm = "ida*").moves)
+         self.assertEqual(playMoves(root, result.moves), GOAL)
+
+class RankedClosedSetTest(unittest.TestCase):
+   # The paths rebuilt from the moves kept by the ranked closed set are made
+   #  of allowed moves and reach the goal, and bfs still finds shortest ones
+   def testRebuiltPaths(self):
+      for root in scrambledRoots(GOAL, 3, 30, 6):
+         for algorithm in ["dfs", "dls", "bfs"]:
+            result = solve(root, algorithm = algorithm, closedSet = "ranked")
+            self.assertTrue(result.goalFound)
+            self.assertEqual(result.pathLength, len(result.moves))
+            self.assertEqual(playMoves(root, result.moves), GOAL)
+         self.assertEqual(result.pathLength, 
+                          solve(root, algorithm = "bfs").pathLength)
+
+class BoundedSuboptimalTest(unittest.TestCase):
+   # The paths of wa* are at most weight times as long as the shortest
+   def testWeightedAstar(self):
+      for root in randomRoots(10, 10):
+         distance = oracle.distance(makeBoard(root))
+         for weight in [1, 1.5, 2, 5]:
+            result = solve(root, algorithm = "wa*", weight = weight)
+            self.assertLessEqual(result.pathLength, weight * distance)
+            self.assertEqual(playMoves(root, result.moves), GOAL)
+   
+   # The solutions ara* streams never get longer nor looser, and the last 
+   #  one, found with nothing left of the budget to stop it, is a shortest
+   #  path
+   def testAnytimeAstar(self):
+      for root in randomRoots(10, 11):
+         distance = oracle.distance(makeBoard(root))
+         solutionFile = StringIO.StringIO()
+         result = solve(root, algorithm = "ara*", weight = 5, 
+                        weightStep = 1, 
+                        telemetry = {"solutionFile": solutionFile})
+         solutions = [json.loads(line) 
+                      for line in solutionFile.getvalue().splitlines()]
+         self.assertEqual(len(solutions), len(result.stats["solutions"]))
+         for previous, solution in zip(solutions, solutions[1:]):
+            self.assertLessEqual(solution["depth"], previous["depth"])
+            self.assertLessEqual(solution["bound"], previous["bound"])
+         for solution in solutions:
+            self.assertLessEqual(solution["depth"], 
+                                 solution["bound"] * distance + 1e-9)
+            self.assertEqual(playMoves(root, solution["moves"]), GOAL)
+         self.assertEqual(solutions[-1]["depth"], distance)
+         self.assertEqual(result.pathLength, distance)
+
+class CanonicalizeTest(unittest.TestCase):
+   # The path of the canonical problem, mapped back, leads from the 
+   #  original root to the original goal, and is a shortest path too
+   def testRoundTrip(self):
+      generator = random.Random(5)
+      for size, scrambleCount in [(3, 40), (4, 30)]:
+         numCells = size * size
+         for i in range(8):
+            goal = range(numCells)
+            generator.shuffle(goal)
+            root = scrambledRoots(goal, 1, scrambleCount, i)[0]
+            canonicalRoot, canonicalGoal, moveMap = canonicalize(root, goal)
+            self.assertEqual([tile for tile in canonicalGoal if tile],
+                             range(1, numCells))
+            self.assertEqual(sorted(moveMap[moveCode] 
+                                    for moveCode in MOVE_CODES), 
+                             list(MOVE_CODES))
+            canonical = solve(canonicalRoot, canonicalGoal)
+            moves = [MOVE_NAMES[moveMap[moveCode]] 
+                     for moveCode in canonical.solution.getMoveCodes()]
+            self.assertEqual(playMoves(root, moves), goal)
+            self.assertEqual(len(moves), solve(root, goal).pathLength)
+            mapped = solve(root, goal, canonical = True)
+            self.assertEqual(mapped.moves, moves)
+            self.assertEqual(mapped.root, root)
+            self.assertEqual(mapped.goal, goal)
+
+if __name__ == "__main__":
+   unittest.main()